@@ -1,20 +1,82 @@
-from flask import Flask, request, jsonify
+import os
+from flask import Flask, Response, request, jsonify, stream_with_context
 from src.ai.services.styleMatchingService import StyleMatchingService
 from src.ai.services.designGenerationService import DesignGenerationService
+from src.ai.services.warmup import Warmup
 from src.backend.utils.logger import logger
-from src.ai.config import MODEL_PATH_STYLE_MATCHER, MODEL_PATH_DESIGN_GENERATOR
+from src.ai.utils.metrics import metrics
+from src.ai.utils.microBatcher import MicroBatcher
+from src.ai.utils.recommendationCache import recommendation_cache
+from src.ai.utils.streaming import negotiate_stream_format, encode_stream, stream_mimetype
+from src.ai.utils.imageEncoding import encode_image, encode_image_base64, decode_image_base64, image_mimetype
+from src.ai.utils.imageTransport import (
+    read_request_image, request_param, request_list_param, request_image_encoding, wants_binary_image,
+    image_response, multipart_image_response
+)
+from src.ai.config import (
+    MODEL_PATH_STYLE_MATCHER, MODEL_PATH_DESIGN_GENERATOR, STYLE_MATCHER_ENGINE, STYLE_RECOMMENDATIONS_DEFAULT_COUNT,
+    STYLE_MATCH_BATCHING_ENABLED, STYLE_MATCH_MAX_BATCH_SIZE, STYLE_MATCH_MAX_WAIT_MS, STYLE_MATCH_BATCH_CHUNK_SIZE,
+    DESIGN_STREAM_CHUNK_SIZE, DESIGN_WARM_POOL_ENABLED, DESIGN_GENERATOR_BATCH_BUCKETS, WARMUP_ENABLED,
+    STYLE_MATCH_WARMUP_BATCH_SIZES, DESIGN_GENERATOR_ENGINE, STYLE_MATCH_CACHE_ENABLED, WARMUP_MAX_ATTEMPTS,
+    WARMUP_RETRY_DELAY_SECONDS, WARMUP_EXIT_ON_FAILURE
+)
 
 app = Flask(__name__)
 
-style_matching_service = StyleMatchingService(MODEL_PATH_STYLE_MATCHER)
-design_generation_service = DesignGenerationService(MODEL_PATH_DESIGN_GENERATOR)
+# Models (and TensorFlow) are loaded by the background warmup below, or on first use when
+# warmup is disabled, so importing the app and spawning a worker stays fast
+style_matching_service = StyleMatchingService(
+    MODEL_PATH_STYLE_MATCHER, engine=STYLE_MATCHER_ENGINE, load_model=False,
+    result_cache=recommendation_cache if STYLE_MATCH_CACHE_ENABLED else None
+)
+design_generation_service = DesignGenerationService(
+    MODEL_PATH_DESIGN_GENERATOR, warm_pool=DESIGN_WARM_POOL_ENABLED, load_model=False, engine=DESIGN_GENERATOR_ENGINE
+)
+
+# Optional micro-batching: concurrent /match-style requests share one forward pass
+style_match_batcher = None
+if STYLE_MATCH_BATCHING_ENABLED:
+    style_match_batcher = MicroBatcher(
+        style_matching_service.predict_style_probabilities_batch,
+        max_batch_size=STYLE_MATCH_MAX_BATCH_SIZE,
+        max_wait_ms=STYLE_MATCH_MAX_WAIT_MS,
+        name='style_match'
+    )
+
+def _exit_after_failed_warmup():
+    # Called on the warmup thread, where sys.exit would only end the thread; the server restarts the worker
+    logger.error("Warmup failed, exiting so the worker is restarted")
+    os._exit(1)
+
+# Warm both services at every served batch size in the background; /ready reports 503
+# until this finishes so the load balancer never routes traffic to a cold worker
+warmup = Warmup(
+    {
+        'style_matching': lambda: style_matching_service.warmup(STYLE_MATCH_WARMUP_BATCH_SIZES),
+        'design_generation': lambda: design_generation_service.warmup(DESIGN_GENERATOR_BATCH_BUCKETS)
+    } if WARMUP_ENABLED else {},
+    max_attempts=WARMUP_MAX_ATTEMPTS, retry_delay_seconds=WARMUP_RETRY_DELAY_SECONDS,
+    on_failure=_exit_after_failed_warmup if WARMUP_EXIT_ON_FAILURE else None
+)
+warmup.start()
 
 @app.route('/match-style', methods=['POST'])
 def match_style():
     try:
         user_preferences = request.json.get('user_preferences')
-        matched_style = style_matching_service.match_style(user_preferences)
-        recommendations = style_matching_service.get_style_recommendations(user_preferences)
+        num_recommendations = request.json.get('num_recommendations', STYLE_RECOMMENDATIONS_DEFAULT_COUNT)
+        if style_match_batcher is not None:
+            # Cache hits skip the batcher; misses join the next batch
+            style_probabilities = style_matching_service.style_probabilities(
+                user_preferences, predict=style_match_batcher.submit
+            )
+            matched_style, recommendations = style_matching_service.styles_from_probabilities(
+                style_probabilities, num_recommendations
+            )
+        else:
+            matched_style, recommendations = style_matching_service.match_style_with_recommendations(
+                user_preferences, num_recommendations
+            )
         return jsonify({
             'matched_style': matched_style,
             'recommendations': recommendations
@@ -23,13 +85,30 @@ def match_style():
         logger.error(f"Error in match_style: {str(e)}")
         return jsonify({'error': 'An error occurred while matching style'}), 500
 
+@app.route('/match-style/batch', methods=['POST'])
+def match_style_batch():
+    try:
+        user_preferences = request.json.get('user_preferences')
+        num_recommendations = request.json.get('num_recommendations', STYLE_RECOMMENDATIONS_DEFAULT_COUNT)
+        results = style_matching_service.match_styles_batch(
+            user_preferences, num_recommendations, chunk_size=STYLE_MATCH_BATCH_CHUNK_SIZE
+        )
+        return jsonify({'results': results}), 200
+    except Exception as e:
+        logger.error(f"Error in match_style_batch: {str(e)}")
+        return jsonify({'error': 'An error occurred while matching styles in batch'}), 500
+
 @app.route('/generate-design', methods=['POST'])
 def generate_design():
     try:
         user_input = request.json.get('user_input')
         style_line = request.json.get('style_line')
-        generated_design = design_generation_service.generate_design(user_input, style_line)
-        return jsonify({'generated_design': generated_design}), 200
+        seed = request.json.get('seed')
+        image_format, image_quality = request_image_encoding(request)
+        generated_design = design_generation_service.generate_design(
+            user_input, style_line, seed=seed, image_format=image_format, image_quality=image_quality
+        )
+        return jsonify({'generated_design': generated_design, 'seed': seed}), 200
     except Exception as e:
         logger.error(f"Error in generate_design: {str(e)}")
         return jsonify({'error': 'An error occurred while generating design'}), 500
@@ -37,28 +116,132 @@ def generate_design():
 @app.route('/apply-design', methods=['POST'])
 def apply_design_to_product():
     try:
-        design_base64 = request.json.get('design_base64')
-        product_image_path = request.json.get('product_image_path')
-        applied_design = design_generation_service.apply_design_to_product(design_base64, product_image_path)
-        return jsonify({'applied_design': applied_design}), 200
+        # The design may arrive as a multipart upload or raw body instead of base64 JSON
+        design_image = read_request_image(request, 'design')
+        product_image_path = request_param(request, 'product_image_path')
+        image_format, image_quality = request_image_encoding(request)
+        binary_response = wants_binary_image(request)
+
+        if design_image is None and not binary_response:
+            applied_design = design_generation_service.apply_design_to_product(
+                request.json.get('design_base64'), product_image_path,
+                image_format=image_format, image_quality=image_quality
+            )
+            return jsonify({'applied_design': applied_design}), 200
+
+        if design_image is None:
+            design_image = decode_image_base64(request.json.get('design_base64'))
+        applied_design = design_generation_service.apply_design_to_product_image(design_image, product_image_path)
+
+        if binary_response:
+            return image_response(encode_image(applied_design, image_format, image_quality), image_mimetype(image_format))
+        return jsonify({'applied_design': encode_image_base64(applied_design, image_format, image_quality)}), 200
     except Exception as e:
         logger.error(f"Error in apply_design_to_product: {str(e)}")
         return jsonify({'error': 'An error occurred while applying design to product'}), 500
 
+@app.route('/apply-design/bulk', methods=['POST'])
+def apply_design_to_products():
+    try:
+        design_image = read_request_image(request, 'design')
+        if design_image is None:
+            design_image = decode_image_base64(request.json.get('design_base64'))
+        product_image_paths = request_list_param(request, 'product_image_paths')
+        image_format, image_quality = request_image_encoding(request)
+
+        # Results arrive in completion order, each tagged with its index in product_image_paths
+        if wants_binary_image(request):
+            return multipart_image_response(
+                design_generation_service.apply_design_to_products(
+                    design_image, product_image_paths, binary=True, image_format=image_format, image_quality=image_quality
+                ),
+                image_mimetype(image_format)
+            )
+
+        applied_designs = design_generation_service.apply_design_to_products(
+            design_image, product_image_paths, image_format=image_format, image_quality=image_quality
+        )
+        stream_format = negotiate_stream_format(request)
+        if stream_format is not None:
+            events = (
+                {'index': index, 'product_image_path': product_image_paths[index], 'applied_design': applied_design}
+                for index, applied_design in applied_designs
+            )
+            return Response(
+                stream_with_context(encode_stream(
+                    events, stream_format, event_name='applied_design',
+                    error_message='An error occurred while applying design to products'
+                )),
+                mimetype=stream_mimetype(stream_format)
+            )
+
+        results = [None] * len(product_image_paths)
+        for index, applied_design in applied_designs:
+            results[index] = applied_design
+        return jsonify({'applied_designs': results}), 200
+    except Exception as e:
+        logger.error(f"Error in apply_design_to_products: {str(e)}")
+        return jsonify({'error': 'An error occurred while applying design to products'}), 500
+
 @app.route('/design-variations', methods=['POST'])
 def generate_design_variations():
     try:
-        initial_design_base64 = request.json.get('initial_design_base64')
-        num_variations = request.json.get('num_variations')
-        variations = design_generation_service.generate_design_variations(initial_design_base64, num_variations)
-        return jsonify({'variations': variations}), 200
+        initial_design = read_request_image(request, 'initial_design')
+        if initial_design is None:
+            initial_design = decode_image_base64(request.json.get('initial_design_base64'))
+        try:
+            num_variations = request_param(request, 'num_variations', cast=int)
+        except (TypeError, ValueError):
+            num_variations = None
+        if num_variations is None or num_variations < 1:
+            return jsonify({'error': 'num_variations must be at least 1'}), 400
+        image_format, image_quality = request_image_encoding(request)
+
+        # Raw image parts in one multipart/mixed response, each sent as soon as it is encoded
+        if wants_binary_image(request):
+            variations = design_generation_service.iter_design_variations_from_image(
+                initial_design, num_variations, chunk_size=DESIGN_STREAM_CHUNK_SIZE, binary=True,
+                image_format=image_format, image_quality=image_quality
+            )
+            return multipart_image_response(variations, image_mimetype(image_format))
+
+        # Stream each variation as soon as it is encoded when NDJSON or SSE is requested
+        stream_format = negotiate_stream_format(request)
+        if stream_format is not None:
+            variations = design_generation_service.iter_design_variations_from_image(
+                initial_design, num_variations, chunk_size=DESIGN_STREAM_CHUNK_SIZE,
+                image_format=image_format, image_quality=image_quality
+            )
+            events = ({'index': index, 'variation': variation} for index, variation in variations)
+            return Response(
+                stream_with_context(encode_stream(
+                    events, stream_format, event_name='variation',
+                    error_message='An error occurred while generating design variations'
+                )),
+                mimetype=stream_mimetype(stream_format)
+            )
+
+        variations = design_generation_service.iter_design_variations_from_image(
+            initial_design, num_variations, image_format=image_format, image_quality=image_quality
+        )
+        return jsonify({'variations': [variation for _, variation in variations]}), 200
     except Exception as e:
         logger.error(f"Error in generate_design_variations: {str(e)}")
         return jsonify({'error': 'An error occurred while generating design variations'}), 500
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'healthy'}), 200
+    # Liveness only: the process is up, whether or not it has warmed up
+    return jsonify({'status': 'healthy', 'ready': warmup.ready}), 200
+
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    status = warmup.status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return jsonify(metrics.snapshot()), 200
 
 if __name__ == '__main__':
     app.run(debug=False)
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Compares per-call latency of the eager Keras generator with the bucketed tf.function
+serving path, with and without XLA, across batch sizes.
+
+Usage:
+    python -m src.ai.benchmarks.designGeneratorBenchmark --batch-sizes 1 3 8 20 --repeats 50
+"""
+import argparse
+import time
+import numpy as np
+from src.ai.models.designGeneratorModel import DesignGeneratorModel
+from src.ai.models.compiledDesignGenerator import CompiledDesignGenerator
+
+
+def time_calls(generate, labels: np.ndarray, noise: np.ndarray, repeats: int) -> tuple:
+    generate(labels, noise)
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        generate(labels, noise)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def build_backends(model: DesignGeneratorModel) -> dict:
+    backends = {'eager': model.generate_designs}
+    for name, jit_compile in (('graph', False), ('xla', True)):
+        compiled = CompiledDesignGenerator(model, jit_compile=jit_compile)
+        start = time.perf_counter()
+        compiled.warmup()
+        print(f"{name} warmup: {time.perf_counter() - start:.2f}s")
+        backends[name] = compiled.generate_designs
+    return backends
+
+
+def run_benchmark(backends: dict, latent_dim: int, batch_sizes: list, repeats: int, seed: int) -> list:
+    """
+    Runs every backend on the same inputs.
+
+    Returns:
+        list: One dict per (backend, batch size) with p50/p99 latency in milliseconds and
+        the max absolute difference from the eager output.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for batch_size in batch_sizes:
+        noise = rng.standard_normal((batch_size, latent_dim)).astype(np.float32)
+        labels = rng.integers(0, 6, batch_size)
+        reference = backends['eager'](labels, noise)
+        for name, generate in backends.items():
+            p50, p99 = time_calls(generate, labels, noise, repeats)
+            rows.append({
+                'backend': name,
+                'batch_size': batch_size,
+                'p50_ms': p50,
+                'p99_ms': p99,
+                'max_abs_diff': float(np.abs(generate(labels, noise) - reference).max())
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency of the eager vs compiled design generator")
+    parser.add_argument('--latent-dim', type=int, default=100)
+    parser.add_argument('--num-classes', type=int, default=6)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 3, 8, 20, 64])
+    parser.add_argument('--repeats', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    model = DesignGeneratorModel(args.latent_dim, args.num_classes)
+    rows = run_benchmark(build_backends(model), args.latent_dim, args.batch_sizes, args.repeats, args.seed)
+
+    print(f"{'backend':<10}{'batch':>7}{'p50 ms':>10}{'p99 ms':>10}{'max diff':>12}")
+    for row in rows:
+        print(f"{row['backend']:<10}{row['batch_size']:>7}{row['p50_ms']:>10.2f}{row['p99_ms']:>10.2f}{row['max_abs_diff']:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compares encode time and output size of the image formats served by the design
+endpoints, on a generated-design-like image and a product-preview-like image.
+
+Usage:
+    python -m src.ai.benchmarks.imageEncodingBenchmark --size 1024 --repeats 20
+"""
+import argparse
+import time
+import numpy as np
+from PIL import Image
+from src.ai.utils.imageEncoding import IMAGE_FORMATS, encode_image
+
+
+def generate_design_image(size: int, rng: np.random.Generator) -> Image.Image:
+    # Generator output upscaled for display: smooth colour fields with fine noise
+    small = rng.random((28, 28, 3)).astype(np.float32)
+    image = Image.fromarray((small * 255).astype(np.uint8)).resize((size, size), Image.BICUBIC)
+    pixels = np.asarray(image, dtype=np.float32) + rng.normal(0, 4, (size, size, 3))
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def generate_product_image(size: int, rng: np.random.Generator) -> Image.Image:
+    # Flat studio background with a shaded product silhouette, as in catalog photos
+    y, x = np.mgrid[0:size, 0:size].astype(np.float32) / size
+    shade = 1.0 - 0.5 * np.hypot(x - 0.5, y - 0.5)
+    product = ((x - 0.5) ** 2 / 0.09 + (y - 0.55) ** 2 / 0.16) < 1.0
+    pixels = np.full((size, size, 3), 235.0, dtype=np.float32)
+    pixels[product] = (np.array([60.0, 90.0, 150.0]) * shade[product, np.newaxis])
+    pixels += rng.normal(0, 1.5, pixels.shape)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def run_benchmark(size: int, repeats: int, seed: int, qualities: list) -> list:
+    """
+    Encodes each test image in every format and quality setting.
+
+    Returns:
+        list: One dict per (image, format, quality) with mean encode milliseconds and bytes.
+    """
+    rng = np.random.default_rng(seed)
+    images = {
+        'design': generate_design_image(size, rng),
+        'product': generate_product_image(size, rng)
+    }
+
+    rows = []
+    for image_name, image in images.items():
+        for image_format in IMAGE_FORMATS:
+            for quality in [None] + qualities.get(image_format, []):
+                encode_image(image, image_format, quality)  # warm up codec state
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    buffer = encode_image(image, image_format, quality)
+                elapsed_ms = (time.perf_counter() - start) * 1000.0 / repeats
+                rows.append({
+                    'image': image_name,
+                    'format': image_format,
+                    'quality': 'default' if quality is None else quality,
+                    'encode_ms': elapsed_ms,
+                    'bytes': buffer.getbuffer().nbytes
+                })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode time and size of the design image formats")
+    parser.add_argument('--size', type=int, default=1024)
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--png-levels', type=int, nargs='*', default=[0, 9])
+    parser.add_argument('--lossy-qualities', type=int, nargs='*', default=[60, 95])
+    args = parser.parse_args()
+
+    qualities = {'png': args.png_levels, 'webp': args.lossy_qualities, 'jpeg': args.lossy_qualities}
+    rows = run_benchmark(args.size, args.repeats, args.seed, qualities)
+
+    print(f"{args.size}x{args.size} RGB, mean of {args.repeats} encodes")
+    print(f"{'image':<10}{'format':<10}{'quality':>9}{'encode ms':>12}{'KiB':>10}")
+    for row in rows:
+        print(f"{row['image']:<10}{row['format']:<10}{str(row['quality']):>9}{row['encode_ms']:>12.2f}{row['bytes'] / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Compares the float32 design generator with its post-training quantized TFLite exports:
+model size, per-call latency at small batch sizes and output error against float32.
+
+Usage:
+    python -m src.ai.benchmarks.quantizedGeneratorBenchmark --batch-sizes 1 8 --repeats 50
+    python -m src.ai.benchmarks.quantizedGeneratorBenchmark --generator-path models/design_generator/generator
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from src.ai.models.designGeneratorModel import DesignGeneratorModel
+from src.ai.models.compiledDesignGenerator import CompiledDesignGenerator
+from src.ai.models.quantizedDesignGenerator import (
+    QUANTIZATION_MODES, QuantizedDesignGenerator, compare_generators, export_quantized_generator
+)
+from src.ai.utils.modelRegistry import estimate_model_size
+
+
+def time_calls(generate, labels: np.ndarray, noise: np.ndarray, repeats: int) -> float:
+    generate(labels, noise)
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        generate(labels, noise)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return float(np.percentile(latencies, 50))
+
+
+def run_benchmark(model: DesignGeneratorModel, modes: list, batch_sizes: list, repeats: int,
+                  num_threads: int, seed: int) -> list:
+    """
+    Exports the generator in every mode and measures each against the float32 graph.
+
+    Returns:
+        list: One dict per backend with its size in bytes, p50 latency per batch size
+        in milliseconds and, for quantized backends, MAE and PSNR against float32.
+    """
+    compiled = CompiledDesignGenerator(model, batch_buckets=batch_sizes)
+    compiled.warmup()
+    backends = [('float32', compiled, estimate_model_size(model.generator))]
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in modes:
+            path = os.path.join(directory, f"generator_{mode}.tflite")
+            export_quantized_generator(model.generator, path, mode, seed=seed)
+            quantized = QuantizedDesignGenerator(path, batch_buckets=batch_sizes, num_threads=num_threads)
+            quantized.warmup()
+            backends.append((mode, quantized, quantized.nbytes))
+
+        rng = np.random.default_rng(seed)
+        rows = []
+        for name, generator, nbytes in backends:
+            row = {'backend': name, 'bytes': nbytes, 'p50_ms': {}}
+            for batch_size in batch_sizes:
+                noise = rng.standard_normal((batch_size, model.latent_dim)).astype(np.float32)
+                labels = rng.integers(0, model.num_classes, batch_size)
+                row['p50_ms'][batch_size] = time_calls(generator.generate_designs, labels, noise, repeats)
+            if generator is not compiled:
+                row.update(compare_generators(compiled, generator, seed=seed))
+            rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Size, latency and error of the quantized design generator")
+    parser.add_argument('--generator-path', help="Saved Keras generator; defaults to a freshly initialised one")
+    parser.add_argument('--latent-dim', type=int, default=100)
+    parser.add_argument('--num-classes', type=int, default=6)
+    parser.add_argument('--modes', nargs='+', choices=QUANTIZATION_MODES, default=list(QUANTIZATION_MODES))
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--repeats', type=int, default=30)
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    model = DesignGeneratorModel(args.latent_dim, args.num_classes)
+    if args.generator_path:
+        import tensorflow as tf
+        model.generator = tf.keras.models.load_model(args.generator_path)
+
+    rows = run_benchmark(model, args.modes, args.batch_sizes, args.repeats, args.threads, args.seed)
+    float_bytes = rows[0]['bytes']
+
+    latency_header = ''.join(f"{f'p50@{size} ms':>13}" for size in args.batch_sizes)
+    print(f"{'backend':<10}{'MiB':>8}{'vs f32':>8}{latency_header}{'MAE':>10}{'PSNR dB':>9}")
+    for row in rows:
+        latencies = ''.join(f"{row['p50_ms'][size]:>13.2f}" for size in args.batch_sizes)
+        error = f"{row['mae']:>10.2e}{row['psnr_db']:>9.1f}" if 'mae' in row else f"{'-':>10}{'-':>9}"
+        print(f"{row['backend']:<10}{row['bytes'] / 2 ** 20:>8.2f}{row['bytes'] / float_bytes:>8.2f}{latencies}{error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmarks the IVF approximate index against the exact catalog scoring path used by
+styleMatcherInference.get_top_style_recommendations, reporting recall@N and latency.
+
+Usage:
+    python -m src.ai.benchmarks.styleAnnBenchmark --num-products 200000 --probes 1 4 16 64
+"""
+import argparse
+import time
+import numpy as np
+from src.ai.inference.styleAnnIndex import StyleAnnIndex
+from src.ai.inference.styleCatalogIndex import StyleCatalogIndex
+from src.ai.models.styleMatcherEngine import STYLE_LINE_NAMES
+
+
+def generate_catalog(num_products: int, rng: np.random.Generator) -> list:
+    # Products lean towards one or two style lines, like a real catalog
+    weights = rng.dirichlet(np.full(len(STYLE_LINE_NAMES), 0.3), size=num_products).astype(np.float32)
+    return [
+        {'id': f"sku-{i}", 'style_attributes': dict(zip(STYLE_LINE_NAMES, row.tolist()))}
+        for i, row in enumerate(weights)
+    ]
+
+
+def generate_queries(num_queries: int, rng: np.random.Generator) -> np.ndarray:
+    # User style vectors are StyleMatcherModel softmax outputs, i.e. distributions over StyleLines
+    return rng.dirichlet(np.ones(len(STYLE_LINE_NAMES)), size=num_queries).astype(np.float32)
+
+
+def time_queries(search, queries: np.ndarray) -> tuple:
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return results, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def run_benchmark(num_products: int, num_queries: int, top_n: int, num_lists: int, probes: list, seed: int) -> list:
+    """
+    Runs the exact and approximate paths over the same catalog and queries.
+
+    Returns:
+        list: One dict per configuration with recall@N, p50/p99 latency in milliseconds and,
+            for the IVF rows, the index build time in seconds.
+    """
+    rng = np.random.default_rng(seed)
+    catalog_index = StyleCatalogIndex.build(generate_catalog(num_products, rng), catalog_version='benchmark')
+    queries = generate_queries(num_queries, rng)
+
+    exact_results, exact_p50, exact_p99 = time_queries(lambda q: catalog_index.top_n(q, top_n), queries)
+    exact_ids = [{product_id for product_id, _, _ in result} for result in exact_results]
+    rows = [{'method': 'exact', 'recall': 1.0, 'p50_ms': exact_p50, 'p99_ms': exact_p99}]
+
+    start = time.perf_counter()
+    product_ids, product_matrix = catalog_index.product_matrix()
+    ann_index = StyleAnnIndex(num_lists=num_lists, seed=seed).build(product_ids, product_matrix)
+    build_seconds = time.perf_counter() - start
+
+    for num_probes in probes:
+        ann_results, p50, p99 = time_queries(lambda q: ann_index.search(q, top_n, num_probes=num_probes), queries)
+        recall = np.mean([
+            len(expected & {product_id for product_id, _ in result}) / max(len(expected), 1)
+            for expected, result in zip(exact_ids, ann_results)
+        ])
+        rows.append({
+            'method': f"ivf lists={num_lists} probes={num_probes}",
+            'recall': float(recall),
+            'p50_ms': p50,
+            'p99_ms': p99,
+            'build_s': build_seconds
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall@N and latency of the style ANN index vs exact scoring")
+    parser.add_argument('--num-products', type=int, default=200000)
+    parser.add_argument('--num-queries', type=int, default=200)
+    parser.add_argument('--top-n', type=int, default=20)
+    parser.add_argument('--num-lists', type=int, default=256)
+    parser.add_argument('--probes', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.num_products, args.num_queries, args.top_n, args.num_lists, args.probes, args.seed)
+
+    print(f"{args.num_products} products, {args.num_queries} queries, recall@{args.top_n}")
+    print(f"{'method':<32}{'recall':>8}{'p50 ms':>10}{'p99 ms':>10}{'build s':>10}")
+    for row in rows:
+        build = f"{row['build_s']:>10.2f}" if 'build_s' in row else f"{'-':>10}"
+        print(f"{row['method']:<32}{row['recall']:>8.3f}{row['p50_ms']:>10.3f}{row['p99_ms']:>10.3f}{build}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import os
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _env_int(name: str, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+# Model artifacts
+MODEL_PATH = os.environ.get('MODEL_PATH', 'models')
+MODEL_PATH_STYLE_MATCHER = os.environ.get('MODEL_PATH_STYLE_MATCHER', os.path.join(MODEL_PATH, 'style_matcher'))
+MODEL_PATH_DESIGN_GENERATOR = os.environ.get('MODEL_PATH_DESIGN_GENERATOR', os.path.join(MODEL_PATH, 'design_generator'))
+
+# Memory budget of the process-wide model registry
+MODEL_REGISTRY_MAX_BYTES = int(os.environ.get('MODEL_REGISTRY_MAX_BYTES', 2 * 1024 ** 3))
+
+# Multi-process serving (src/ai/serving.py): SERVING_WORKERS processes share one listening
+# socket. Per-worker thread pools default to the worker's share of the cores so workers
+# do not oversubscribe them; SERVING_PIN_CPUS also pins each worker to its own cores.
+SERVING_WORKERS = int(os.environ.get('SERVING_WORKERS', 1))
+SERVING_HOST = os.environ.get('SERVING_HOST', '127.0.0.1')
+SERVING_PORT = int(os.environ.get('SERVING_PORT', 5000))
+SERVING_PIN_CPUS = _env_bool('SERVING_PIN_CPUS', False)
+WORKER_CPU_COUNT = max(1, (os.cpu_count() or 4) // SERVING_WORKERS)
+
+# TensorFlow thread pools; unset keeps TensorFlow's defaults in single-process serving
+TF_INTRA_OP_THREADS = _env_int('TF_INTRA_OP_THREADS', WORKER_CPU_COUNT if SERVING_WORKERS > 1 else None)
+TF_INTER_OP_THREADS = _env_int('TF_INTER_OP_THREADS', 1 if SERVING_WORKERS > 1 else None)
+
+# Style matching: 'keras' serves the TensorFlow model, 'numpy' the exported StyleMatcherEngine
+STYLE_MATCHER_ENGINE = os.environ.get('STYLE_MATCHER_ENGINE', 'keras')
+STYLE_RECOMMENDATIONS_DEFAULT_COUNT = int(os.environ.get('STYLE_RECOMMENDATIONS_DEFAULT_COUNT', 3))
+
+# Micro-batching of concurrent /match-style requests
+STYLE_MATCH_BATCHING_ENABLED = _env_bool('STYLE_MATCH_BATCHING_ENABLED', False)
+STYLE_MATCH_MAX_BATCH_SIZE = int(os.environ.get('STYLE_MATCH_MAX_BATCH_SIZE', 64))
+STYLE_MATCH_MAX_WAIT_MS = float(os.environ.get('STYLE_MATCH_MAX_WAIT_MS', 5))
+
+# Bulk /match-style/batch requests are scored in chunks of this many rows
+STYLE_MATCH_BATCH_CHUNK_SIZE = int(os.environ.get('STYLE_MATCH_BATCH_CHUNK_SIZE', 4096))
+
+# Cache of /match-style results keyed by the vectorized preferences and the model
+# version: LRU within the memory budget, entries expire after the TTL
+STYLE_MATCH_CACHE_ENABLED = _env_bool('STYLE_MATCH_CACHE_ENABLED', True)
+STYLE_MATCH_CACHE_MAX_BYTES = int(os.environ.get('STYLE_MATCH_CACHE_MAX_BYTES', 32 * 1024 ** 2))
+STYLE_MATCH_CACHE_TTL_SECONDS = float(os.environ.get('STYLE_MATCH_CACHE_TTL_SECONDS', 3600))
+
+# Incremental style matcher updates (StyleMatchingService.fine_tune_user_preferences): a few
+# epochs from the current weights in a background worker, hot-swapped in only if accuracy on
+# the held-out validation rows drops by no more than STYLE_MATCH_FINE_TUNE_MAX_ACCURACY_DROP
+STYLE_MATCH_FINE_TUNE_EPOCHS = int(os.environ.get('STYLE_MATCH_FINE_TUNE_EPOCHS', 5))
+STYLE_MATCH_FINE_TUNE_LEARNING_RATE = float(os.environ.get('STYLE_MATCH_FINE_TUNE_LEARNING_RATE', 1e-4))
+STYLE_MATCH_FINE_TUNE_VALIDATION_SPLIT = float(os.environ.get('STYLE_MATCH_FINE_TUNE_VALIDATION_SPLIT', 0.2))
+STYLE_MATCH_FINE_TUNE_MAX_ACCURACY_DROP = float(os.environ.get('STYLE_MATCH_FINE_TUNE_MAX_ACCURACY_DROP', 0.0))
+
+# Memory budget for precomputed product catalog matrices (one per catalog version)
+CATALOG_INDEX_MAX_BYTES = int(os.environ.get('CATALOG_INDEX_MAX_BYTES', 512 * 1024 ** 2))
+
+# Approximate nearest-neighbour (IVF) search over the catalog: more lists is faster,
+# more probes is higher recall. Indexes are persisted to STYLE_ANN_INDEX_DIR when set.
+STYLE_ANN_NUM_LISTS = int(os.environ.get('STYLE_ANN_NUM_LISTS', 256))
+STYLE_ANN_NUM_PROBES = int(os.environ.get('STYLE_ANN_NUM_PROBES', 16))
+STYLE_ANN_INDEX_DIR = os.environ.get('STYLE_ANN_INDEX_DIR')
+
+# Design generation: threads used to post-process and encode generated images
+DESIGN_ENCODE_WORKERS = int(os.environ.get('DESIGN_ENCODE_WORKERS', WORKER_CPU_COUNT))
+
+# Streaming /design-variations: variations generated per generator call, which also
+# caps how many raw and encoded images the server holds at once
+DESIGN_STREAM_CHUNK_SIZE = int(os.environ.get('DESIGN_STREAM_CHUNK_SIZE', 4))
+
+# Decoded product images and their placement metadata, bounded by decoded size
+PRODUCT_IMAGE_CACHE_MAX_BYTES = int(os.environ.get('PRODUCT_IMAGE_CACHE_MAX_BYTES', 256 * 1024 ** 2))
+
+# Design box used for products without a placement file, as (left, top, right, bottom)
+# fractions of the product image size
+PRODUCT_DESIGN_BOX_DEFAULT = tuple(
+    float(value) for value in os.environ.get('PRODUCT_DESIGN_BOX_DEFAULT', '0.3,0.25,0.7,0.6').split(',')
+)
+
+# Optional warm pool of pre-generated designs per style line, served to requests without
+# user input; the background producer refills a pool from below the low watermark up to
+# the high watermark, refill_batch_size designs per generator call
+DESIGN_WARM_POOL_ENABLED = _env_bool('DESIGN_WARM_POOL_ENABLED', False)
+DESIGN_WARM_POOL_LOW_WATERMARK = int(os.environ.get('DESIGN_WARM_POOL_LOW_WATERMARK', 8))
+DESIGN_WARM_POOL_HIGH_WATERMARK = int(os.environ.get('DESIGN_WARM_POOL_HIGH_WATERMARK', 32))
+DESIGN_WARM_POOL_REFILL_BATCH_SIZE = int(os.environ.get('DESIGN_WARM_POOL_REFILL_BATCH_SIZE', 8))
+
+# Seeded designs are cached in memory and, when DESIGN_CACHE_DIR is set, in a
+# content-addressed store on disk shared by all workers
+DESIGN_CACHE_MAX_BYTES = int(os.environ.get('DESIGN_CACHE_MAX_BYTES', 128 * 1024 ** 2))
+DESIGN_CACHE_DIR = os.environ.get('DESIGN_CACHE_DIR')
+
+# Identical concurrent seeded generations and design applications share one computation;
+# callers waiting on another request's computation give up after this many seconds
+DESIGN_SINGLE_FLIGHT_TIMEOUT_SECONDS = float(os.environ.get('DESIGN_SINGLE_FLIGHT_TIMEOUT_SECONDS', 30))
+
+# Default encoding of generated and composited images ('png', 'png-fast', 'webp' or
+# 'jpeg') and its quality knob: zlib level 0-9 for PNG, 1-100 for WebP and JPEG.
+# The quality only applies to that default format; other formats keep their own.
+# Requests can override both with 'image_format' and 'image_quality'.
+DESIGN_IMAGE_FORMAT = os.environ.get('DESIGN_IMAGE_FORMAT', 'png')
+DESIGN_IMAGE_QUALITY = _env_int('DESIGN_IMAGE_QUALITY', None)
+
+# Design generation: 'keras' serves the TensorFlow generator, 'numpy' the memory-mapped
+# DesignGeneratorEngine artifact exported next to it (see models/designGeneratorEngine.py).
+# The engines label an uploaded design differently for /design-variations: Keras scores
+# it with the conditional discriminator, while the NumPy engine, which has no
+# discriminator, picks the closest per-style prototype design. The same upload can
+# therefore get variations of a different style line depending on the engine.
+DESIGN_GENERATOR_ENGINE = os.environ.get('DESIGN_GENERATOR_ENGINE', 'keras')
+
+# Serve the design generator through bucketed tf.functions instead of eager Keras calls;
+# requests are padded up to the nearest batch bucket, and XLA compilation is optional
+DESIGN_GENERATOR_COMPILED = _env_bool('DESIGN_GENERATOR_COMPILED', True)
+DESIGN_GENERATOR_BATCH_BUCKETS = tuple(
+    int(bucket) for bucket in os.environ.get('DESIGN_GENERATOR_BATCH_BUCKETS', '1,2,4,8,12,16,24,32,48,64').split(',')
+)
+DESIGN_GENERATOR_JIT_COMPILE = _env_bool('DESIGN_GENERATOR_JIT_COMPILE', False)
+
+# Serve a quantized TFLite generator (see models/quantizedDesignGenerator.py) instead of
+# the float Keras one; the float model is still loaded for extract_features
+DESIGN_GENERATOR_QUANTIZED_PATH = os.environ.get('DESIGN_GENERATOR_QUANTIZED_PATH')
+DESIGN_GENERATOR_TFLITE_THREADS = _env_int('DESIGN_GENERATOR_TFLITE_THREADS', WORKER_CPU_COUNT if SERVING_WORKERS > 1 else None)
+
+# Startup warmup: representative dummy inferences at every served batch size run before
+# /ready reports the worker ready, so no request pays for lazy tracing and allocation
+WARMUP_ENABLED = _env_bool('WARMUP_ENABLED', True)
+# A failing warmup step is retried; if it keeps failing the worker exits so the server
+# restarts it, instead of staying up and reporting 503 on /ready forever
+WARMUP_MAX_ATTEMPTS = _env_int('WARMUP_MAX_ATTEMPTS', 3)
+WARMUP_RETRY_DELAY_SECONDS = float(os.environ.get('WARMUP_RETRY_DELAY_SECONDS', 5))
+WARMUP_EXIT_ON_FAILURE = _env_bool('WARMUP_EXIT_ON_FAILURE', True)
+STYLE_MATCH_WARMUP_BATCH_SIZES = tuple(
+    int(size) for size in os.environ.get('STYLE_MATCH_WARMUP_BATCH_SIZES', '1,2,4,8,16,32,64').split(',')
+)
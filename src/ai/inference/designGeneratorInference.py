@@ -2,6 +2,7 @@ import tensorflow as tf
 import numpy as np
 from PIL import Image
 from src.ai.models.designGeneratorModel import DesignGeneratorModel
+from src.ai.utils.modelRegistry import model_registry
 from src.shared.utils.formatters import format_design_output
 from src.shared.constants import DESIGN_GENERATION_CONFIG
 from src.backend.services.designService import save_generated_design
@@ -16,11 +17,14 @@ def load_model():
         DesignGeneratorModel: Loaded TensorFlow model for design generation
     """
     try:
-        model = tf.keras.models.load_model(MODEL_PATH, custom_objects={'DesignGeneratorModel': DesignGeneratorModel})
-        return model
+        # Loaded once per process and shared through the model registry
+        return model_registry.get(MODEL_PATH, _load_keras_model)
     except Exception as e:
         raise Exception(f"Failed to load model: {str(e)}")
 
+def _load_keras_model(model_path):
+    return tf.keras.models.load_model(model_path, custom_objects={'DesignGeneratorModel': DesignGeneratorModel})
+
 def preprocess_input(user_input):
     """
     Preprocesses user input for the design generator model
@@ -97,7 +101,7 @@ def generate_and_save_design(user_input, user_id):
         str: URL of the saved design
     """
     try:
-        # Load the design generator model
+        # Get the design generator model from the shared registry
         model = load_model()
         
         # Generate a design using the model and user input
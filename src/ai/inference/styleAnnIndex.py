@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import numpy as np
+from typing import List, Any, Tuple
+from src.ai.config import STYLE_ANN_NUM_LISTS, STYLE_ANN_NUM_PROBES, STYLE_ANN_INDEX_DIR, CATALOG_INDEX_MAX_BYTES
+from src.ai.utils.lruCache import LRUCache
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _augment_for_inner_product(matrix: np.ndarray) -> np.ndarray:
+    # Append sqrt(M^2 - |x|^2) so every row has norm M: inner-product ranking against a
+    # query padded with 0 then equals cosine ranking, which k-means partitions well
+    norms_squared = np.einsum('ij,ij->i', matrix, matrix)
+    extra = np.sqrt(np.maximum(norms_squared.max() - norms_squared, 0.0))
+    return _normalize_rows(np.hstack([matrix, extra[:, np.newaxis]]))
+
+
+class StyleAnnIndex:
+    def __init__(self, num_lists: int = 64, num_probes: int = 8, num_iterations: int = 10, seed: int = 0):
+        """
+        Inverted-file (IVF) index for approximate maximum inner-product search over
+        product style vectors.
+
+        Product vectors are augmented with one extra dimension so that they all share
+        the same norm, then clustered with spherical k-means. A query scores the
+        centroids, then scores exactly only the products in the num_probes best lists,
+        so query time grows with catalog_size * num_probes / num_lists.
+
+        Args:
+            num_lists (int): Number of clusters (inverted lists); more lists means faster, lower-recall queries.
+            num_probes (int): Default number of lists scanned per query; more probes means higher recall.
+            num_iterations (int): k-means iterations used by build().
+            seed (int): Random seed for centroid initialisation.
+        """
+        self.num_lists = num_lists
+        self.num_probes = num_probes
+        self.num_iterations = num_iterations
+        self.seed = seed
+        self.centroids = None
+        self.vectors = None
+        self.product_ids = None
+        self.list_offsets = None
+
+    def __len__(self) -> int:
+        return 0 if self.product_ids is None else len(self.product_ids)
+
+    @property
+    def nbytes(self) -> int:
+        if self.vectors is None:
+            return 0
+        return self.vectors.nbytes + self.centroids.nbytes + self.list_offsets.nbytes
+
+    def build(self, product_ids: List[Any], product_matrix: np.ndarray) -> 'StyleAnnIndex':
+        """
+        Clusters the products and lays each inverted list out contiguously.
+
+        Args:
+            product_ids (List[Any]): Product ID per row of product_matrix.
+            product_matrix (np.ndarray): Product style vectors, one row per product.
+
+        Returns:
+            StyleAnnIndex: self, for chaining.
+        """
+        product_matrix = np.asarray(product_matrix, dtype=np.float32)
+        if len(product_matrix) == 0:
+            raise ValueError("Cannot build an ANN index over an empty catalog")
+
+        num_lists = min(self.num_lists, len(product_matrix))
+        directions = _augment_for_inner_product(product_matrix)
+        rng = np.random.default_rng(self.seed)
+        centroids = directions[rng.choice(len(directions), num_lists, replace=False)]
+
+        for _ in range(self.num_iterations):
+            assignments = np.argmax(directions @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, directions)
+            counts = np.bincount(assignments, minlength=num_lists)
+
+            # Re-seed empty lists from random products so every list stays useful
+            empty = counts == 0
+            sums[empty] = directions[rng.choice(len(directions), int(empty.sum()))]
+            centroids = _normalize_rows(sums)
+
+        assignments = np.argmax(directions @ centroids.T, axis=1)
+        order = np.argsort(assignments, kind='stable')
+
+        self.centroids = centroids.astype(np.float32)
+        self.vectors = np.ascontiguousarray(product_matrix[order])
+        # A list keeps each ID's own type; NumPy would coerce mixed int and str IDs to str
+        self.product_ids = [product_ids[i] for i in order]
+        self.list_offsets = np.concatenate(([0], np.cumsum(np.bincount(assignments, minlength=num_lists))))
+        return self
+
+    def search(self, query_vector: np.ndarray, n: int, num_probes: int = None) -> List[Tuple[Any, float]]:
+        """
+        Returns approximately the N products with the highest inner product with the query.
+
+        Args:
+            query_vector (np.ndarray): User style vector.
+            n (int): Number of products to return.
+            num_probes (int): Lists to scan for this query; defaults to the index setting.
+
+        Returns:
+            List[Tuple[Any, float]]: (product_id, match_score) pairs, highest score first.
+        """
+        query_vector = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+        num_probes = min(num_probes or self.num_probes, len(self.centroids))
+
+        # The padded query has 0 in the augmented dimension
+        centroid_scores = self.centroids[:, :-1] @ query_vector
+        probed_lists = np.argpartition(-centroid_scores, num_probes - 1)[:num_probes]
+        candidate_rows = np.concatenate([
+            np.arange(self.list_offsets[i], self.list_offsets[i + 1]) for i in probed_lists
+        ])
+
+        scores = self.vectors[candidate_rows] @ query_vector
+        n = max(0, min(n, len(scores)))
+        if n == 0:
+            return []
+
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.product_ids[candidate_rows[i]], float(scores[i])) for i in top]
+
+    def save(self, filepath: str) -> None:
+        with open(filepath, 'wb') as f:
+            np.savez(
+                f,
+                centroids=self.centroids,
+                vectors=self.vectors,
+                # JSON-encoded into a str array, so loading needs no pickle and restores each ID's type
+                product_ids=np.array([json.dumps(product_id) for product_id in self.product_ids]),
+                list_offsets=self.list_offsets,
+                params=np.array([self.num_lists, self.num_probes, self.num_iterations, self.seed])
+            )
+
+    @classmethod
+    def load(cls, filepath: str) -> 'StyleAnnIndex':
+        with np.load(filepath) as data:
+            num_lists, num_probes, num_iterations, seed = (int(p) for p in data['params'])
+            index = cls(num_lists, num_probes, num_iterations, seed)
+            index.centroids = data['centroids']
+            index.vectors = data['vectors']
+            index.product_ids = [json.loads(product_id) for product_id in data['product_ids']]
+            index.list_offsets = data['list_offsets']
+        return index
+
+
+# One ANN index per catalog version, bounded by memory like the exact catalog matrices
+_ann_indexes = LRUCache(CATALOG_INDEX_MAX_BYTES, sizeof=lambda index: index.nbytes)
+
+
+def _index_file_name(catalog_version) -> str:
+    # Hashed, so a version containing '/' or '..' cannot name a file outside STYLE_ANN_INDEX_DIR
+    digest = hashlib.sha256(str(catalog_version).encode()).hexdigest()
+    return f"style_ann_{digest}.npz"
+
+
+def get_ann_index(catalog_index) -> StyleAnnIndex:
+    """
+    Returns the ANN index for a StyleCatalogIndex's catalog version.
+
+    The index is built on first use and, when STYLE_ANN_INDEX_DIR is set, persisted
+    there so other workers and restarts load it instead of re-clustering. A persisted
+    index built with a different STYLE_ANN_NUM_LISTS is rebuilt, and loaded indexes
+    probe STYLE_ANN_NUM_PROBES lists.
+
+    Args:
+        catalog_index (StyleCatalogIndex): Exact index of the catalog version.
+
+    Returns:
+        StyleAnnIndex: ANN index over the same products.
+    """
+    catalog_version = catalog_index.catalog_version
+    if catalog_version is None:
+        raise ValueError("Approximate search requires a catalog_version")
+
+    index = _ann_indexes.get(catalog_version)
+    if index is not None:
+        return index
+
+    index_path = os.path.join(STYLE_ANN_INDEX_DIR, _index_file_name(catalog_version)) if STYLE_ANN_INDEX_DIR else None
+    index = StyleAnnIndex.load(index_path) if index_path and os.path.exists(index_path) else None
+    if index is not None and index.num_lists == STYLE_ANN_NUM_LISTS:
+        index.num_probes = STYLE_ANN_NUM_PROBES
+    else:
+        product_ids, product_matrix = catalog_index.product_matrix()
+        index = StyleAnnIndex(STYLE_ANN_NUM_LISTS, STYLE_ANN_NUM_PROBES).build(product_ids, product_matrix)
+        if index_path:
+            os.makedirs(STYLE_ANN_INDEX_DIR, exist_ok=True)
+            index.save(index_path)
+
+    _ann_indexes.put(catalog_version, index)
+    return index
\ No newline at end of file
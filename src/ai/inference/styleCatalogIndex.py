@@ -0,0 +1,235 @@
+import threading
+import numpy as np
+from typing import List, Dict, Any, Iterable, Tuple
+from src.ai.config import CATALOG_INDEX_MAX_BYTES
+from src.ai.models.styleMatcherEngine import STYLE_LINE_NAMES
+from src.ai.utils.lruCache import LRUCache
+from src.ai.utils.metrics import metrics
+
+_STYLE_LINE_POSITIONS = {name: i for i, name in enumerate(STYLE_LINE_NAMES)}
+
+
+def product_style_vector(style_attributes: Any) -> np.ndarray:
+    """
+    Converts a product's style attributes into a vector over StyleLines.
+
+    Args:
+        style_attributes (Any): Either a dict mapping style line names to affinity
+            weights, or an iterable of style line names (each weighted 1.0).
+
+    Returns:
+        np.ndarray: float32 vector of length len(StyleLines).
+    """
+    vector = np.zeros(len(STYLE_LINE_NAMES), dtype=np.float32)
+    if isinstance(style_attributes, dict):
+        items = style_attributes.items()
+    else:
+        items = ((name, 1.0) for name in style_attributes or ())
+
+    for name, weight in items:
+        position = _STYLE_LINE_POSITIONS.get(str(name).upper())
+        if position is not None:
+            vector[position] = float(weight)
+    return vector
+
+
+class StyleCatalogIndex:
+    def __init__(self, catalog_version: str = None, initial_capacity: int = 1024):
+        """
+        Precomputed product style matrix for scoring a whole catalog in one operation.
+
+        Rows are stored contiguously with spare capacity, so adding, updating and
+        removing products is amortised O(1) and never rebuilds the matrix.
+
+        Args:
+            catalog_version (str): Version of the catalog this index was built from.
+            initial_capacity (int): Number of rows to preallocate.
+        """
+        self.catalog_version = catalog_version
+        self._matrix = np.zeros((max(initial_capacity, 1), len(STYLE_LINE_NAMES)), dtype=np.float32)
+        self._product_ids = []
+        self._style_attributes = []
+        self._rows = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def build(cls, product_catalog: List[Dict[str, Any]], catalog_version: str = None) -> 'StyleCatalogIndex':
+        index = cls(catalog_version, initial_capacity=len(product_catalog))
+        index.upsert_products(product_catalog)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._product_ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self._matrix.nbytes
+
+    def copy(self, catalog_version: str = None) -> 'StyleCatalogIndex':
+        """
+        Returns an independent copy of the index, registered under catalog_version.
+        """
+        with self._lock:
+            index = StyleCatalogIndex(catalog_version, initial_capacity=len(self._matrix))
+            index._matrix[:] = self._matrix
+            index._product_ids = list(self._product_ids)
+            index._style_attributes = list(self._style_attributes)
+            index._rows = dict(self._rows)
+        return index
+
+    def upsert_products(self, products: Iterable[Dict[str, Any]]) -> None:
+        """
+        Adds new products and updates existing ones in place.
+
+        Args:
+            products (Iterable[Dict[str, Any]]): Products with 'id' and 'style_attributes'.
+        """
+        with self._lock:
+            for product in products:
+                product_id = product['id']
+                row = self._rows.get(product_id)
+                if row is None:
+                    row = len(self._product_ids)
+                    self._ensure_capacity(row + 1)
+                    self._rows[product_id] = row
+                    self._product_ids.append(product_id)
+                    self._style_attributes.append(product['style_attributes'])
+                else:
+                    self._style_attributes[row] = product['style_attributes']
+                self._matrix[row] = product_style_vector(product['style_attributes'])
+
+    def remove_products(self, product_ids: Iterable[Any]) -> None:
+        """
+        Removes products by moving the last row into the freed slot.
+
+        Args:
+            product_ids (Iterable[Any]): IDs of the products to remove; unknown IDs are ignored.
+        """
+        with self._lock:
+            for product_id in product_ids:
+                row = self._rows.pop(product_id, None)
+                if row is None:
+                    continue
+                last = len(self._product_ids) - 1
+                if row != last:
+                    moved_id = self._product_ids[last]
+                    self._matrix[row] = self._matrix[last]
+                    self._product_ids[row] = moved_id
+                    self._style_attributes[row] = self._style_attributes[last]
+                    self._rows[moved_id] = row
+                self._product_ids.pop()
+                self._style_attributes.pop()
+
+    def product_matrix(self) -> Tuple[List[Any], np.ndarray]:
+        """
+        Returns a consistent copy of the product IDs and their style vectors, one row per product.
+        """
+        with self._lock:
+            return list(self._product_ids), self._matrix[:len(self._product_ids)].copy()
+
+    def style_attributes(self, product_id: Any) -> Any:
+        with self._lock:
+            return self._style_attributes[self._rows[product_id]]
+
+    def score(self, query_vector: np.ndarray) -> np.ndarray:
+        """
+        Scores every product against a style vector in one matrix-vector product.
+
+        Args:
+            query_vector (np.ndarray): User style vector of length len(StyleLines).
+
+        Returns:
+            np.ndarray: Match score per product, in index row order.
+        """
+        query_vector = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+        with self._lock:
+            return self._matrix[:len(self._product_ids)] @ query_vector
+
+    def top_n(self, query_vector: np.ndarray, n: int) -> List[Tuple[Any, float, Any]]:
+        """
+        Returns the N best-matching products, highest score first.
+
+        Args:
+            query_vector (np.ndarray): User style vector of length len(StyleLines).
+            n (int): Number of products to return.
+
+        Returns:
+            List[Tuple[Any, float, Any]]: (product_id, match_score, style_attributes) tuples.
+        """
+        with self._lock:
+            scores = self.score(query_vector)
+            n = max(0, min(n, len(scores)))
+            if n == 0:
+                return []
+
+            # Partial selection of the top N, then order only those N
+            top_rows = np.argpartition(-scores, n - 1)[:n]
+            top_rows = top_rows[np.argsort(-scores[top_rows], kind='stable')]
+            return [(self._product_ids[row], float(scores[row]), self._style_attributes[row]) for row in top_rows]
+
+    def ranked(self, query_vector: np.ndarray) -> List[Tuple[Any, float, Any]]:
+        """
+        Returns every product ordered by match score, highest first.
+        """
+        return self.top_n(query_vector, len(self))
+
+    def _ensure_capacity(self, num_rows: int) -> None:
+        if num_rows > len(self._matrix):
+            grown = np.zeros((max(num_rows, 2 * len(self._matrix)), self._matrix.shape[1]), dtype=np.float32)
+            grown[:len(self._matrix)] = self._matrix
+            self._matrix = grown
+
+
+# One precomputed index per catalog version, bounded by matrix memory
+_catalog_indexes = LRUCache(CATALOG_INDEX_MAX_BYTES, sizeof=lambda index: index.nbytes)
+metrics.register_collector('catalog_index', _catalog_indexes.stats)
+
+
+def get_catalog_index(product_catalog: List[Dict[str, Any]], catalog_version: str = None) -> StyleCatalogIndex:
+    """
+    Returns the index for a catalog version, building it on first use.
+
+    Args:
+        product_catalog (List[Dict[str, Any]]): Products with 'id' and 'style_attributes'.
+        catalog_version (str): Catalog version; when None the index is built but not cached.
+
+    Returns:
+        StyleCatalogIndex: Index over the catalog.
+    """
+    if catalog_version is None:
+        return StyleCatalogIndex.build(product_catalog)
+
+    index = _catalog_indexes.get(catalog_version)
+    if index is None:
+        index = StyleCatalogIndex.build(product_catalog, catalog_version)
+        _catalog_indexes.put(catalog_version, index)
+    return index
+
+
+def update_catalog_index(catalog_version: str, new_catalog_version: str,
+                         upserted_products: Iterable[Dict[str, Any]] = (),
+                         removed_product_ids: Iterable[Any] = ()) -> StyleCatalogIndex:
+    """
+    Applies incremental SKU changes to a copy of a cached index and registers the copy under a new version.
+
+    Requests holding the previous index keep scoring a consistent catalog: the changes
+    are applied before the new version is published, and the previous one is left as is.
+
+    Args:
+        catalog_version (str): Version of the cached index to update.
+        new_catalog_version (str): Version the updated index is registered under.
+        upserted_products (Iterable[Dict[str, Any]]): Added or changed products.
+        removed_product_ids (Iterable[Any]): IDs of removed products.
+
+    Returns:
+        StyleCatalogIndex: The updated index.
+    """
+    index = _catalog_indexes.get(catalog_version)
+    if index is None:
+        raise KeyError(f"No catalog index cached for version {catalog_version}")
+
+    updated = index.copy(new_catalog_version)
+    updated.upsert_products(upserted_products)
+    updated.remove_products(removed_product_ids)
+    _catalog_indexes.put(new_catalog_version, updated)
+    return updated
\ No newline at end of file
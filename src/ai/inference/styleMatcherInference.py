@@ -1,9 +1,12 @@
-import tensorflow as tf
+import os
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from src.shared.types import StylePreference
-from src.ai.utils.dataPreprocessing import preprocess_style_data
+from src.ai.inference.styleCatalogIndex import get_catalog_index
+from src.ai.inference.styleAnnIndex import get_ann_index
 from src.ai.models.styleMatcherModel import StyleMatcherModel
+from src.ai.utils.modelRegistry import model_registry
+from src.ai.utils.preferenceVectorizer import PreferenceVectorizer, VECTORIZER_FILE_SUFFIX
 
 MODEL_PATH = '/path/to/trained/style_matcher_model'
 
@@ -15,20 +18,21 @@ def load_style_matcher_model() -> StyleMatcherModel:
         StyleMatcherModel: Loaded TensorFlow model for style matching
     """
     try:
-        model = tf.keras.models.load_model(MODEL_PATH)
-        return StyleMatcherModel(model)
+        # Loaded once per process and shared through the model registry
+        return model_registry.get(MODEL_PATH, StyleMatcherModel.from_saved)
     except Exception as e:
         # TODO: Implement proper error handling and logging
         print(f"Error loading model: {str(e)}")
         raise
 
-def predict_style_match(user_preferences: Dict[str, Any], product_attributes: List[Dict[str, Any]]) -> List[StylePreference]:
+def predict_style_match(user_preferences: Dict[str, Any], product_attributes: List[Dict[str, Any]], catalog_version: str = None) -> List[StylePreference]:
     """
     Predicts style matches based on user preferences and product attributes.
     
     Args:
         user_preferences (Dict[str, Any]): User's style preferences
         product_attributes (List[Dict[str, Any]]): List of product attributes
+        catalog_version (str): Catalog version; when given, the product matrix is built once and reused
     
     Returns:
         List[StylePreference]: List of style preferences with match scores
@@ -36,31 +40,18 @@ def predict_style_match(user_preferences: Dict[str, Any], product_attributes: Li
     try:
         model = load_style_matcher_model()
         
-        # Preprocess input data
-        preprocessed_data = preprocess_style_data(user_preferences, product_attributes)
+        # Get the precomputed product style matrix for this catalog version
+        index = get_catalog_index(product_attributes, catalog_version)
         
-        # Make predictions
-        predictions = model.predict(preprocessed_data)
-        
-        # Process predictions and create StylePreference objects
-        style_preferences = []
-        for i, pred in enumerate(predictions):
-            style_preferences.append(StylePreference(
-                product_id=product_attributes[i]['id'],
-                match_score=float(pred),
-                style_attributes=product_attributes[i]['style_attributes']
-            ))
-        
-        # Sort by match score in descending order
-        style_preferences.sort(key=lambda x: x.match_score, reverse=True)
-        
-        return style_preferences
+        # Score the whole catalog against the user's style vector in one operation
+        user_style_vector = predict_user_style_vector(model, user_preferences)
+        return _to_style_preferences(index.ranked(user_style_vector))
     except Exception as e:
         # TODO: Implement proper error handling and logging
         print(f"Error predicting style match: {str(e)}")
         raise
 
-def get_top_style_recommendations(user_preferences: Dict[str, Any], product_catalog: List[Dict[str, Any]], n: int) -> List[StylePreference]:
+def get_top_style_recommendations(user_preferences: Dict[str, Any], product_catalog: List[Dict[str, Any]], n: int, catalog_version: str = None, approximate: bool = False) -> List[StylePreference]:
     """
     Returns the top N style recommendations based on user preferences.
     
@@ -68,18 +59,61 @@ def get_top_style_recommendations(user_preferences: Dict[str, Any], product_cata
         user_preferences (Dict[str, Any]): User's style preferences
         product_catalog (List[Dict[str, Any]]): List of products in the catalog
         n (int): Number of top recommendations to return
+        catalog_version (str): Catalog version; when given, the product matrix is built once and reused
+        approximate (bool): Use the IVF approximate index (sub-linear, requires catalog_version)
     
     Returns:
         List[StylePreference]: Top N style recommendations
     """
     try:
-        all_matches = predict_style_match(user_preferences, product_catalog)
-        return all_matches[:n]
+        model = load_style_matcher_model()
+        index = get_catalog_index(product_catalog, catalog_version)
+        user_style_vector = predict_user_style_vector(model, user_preferences)
+        
+        if approximate:
+            # Only the products in the probed IVF lists are scored
+            matches = get_ann_index(index).search(user_style_vector, n)
+            return _to_style_preferences(
+                (product_id, score, index.style_attributes(product_id)) for product_id, score in matches
+            )
+        
+        # Select the top N with argpartition instead of sorting the whole catalog
+        return _to_style_preferences(index.top_n(user_style_vector, n))
     except Exception as e:
         # TODO: Implement proper error handling and logging
         print(f"Error getting top style recommendations: {str(e)}")
         raise
 
+def load_preference_vectorizer() -> Optional[PreferenceVectorizer]:
+    """
+    Loads the PreferenceVectorizer saved with the model, shared through the model registry
+    with StyleMatchingService, or None for models trained without one.
+    """
+    vectorizer_path = f"{MODEL_PATH}{VECTORIZER_FILE_SUFFIX}"
+    if not os.path.exists(vectorizer_path):
+        return None
+    return model_registry.get(vectorizer_path, PreferenceVectorizer.load)
+
+def predict_user_style_vector(model: StyleMatcherModel, user_preferences: Dict[str, Any]) -> np.ndarray:
+    """
+    Predicts the user's probability distribution over StyleLines, used as the catalog query vector.
+
+    Preferences are vectorized like StyleMatchingService requests: with the model's
+    PreferenceVectorizer when it has one, otherwise in key order.
+    """
+    vectorizer = load_preference_vectorizer()
+    if vectorizer is not None:
+        preferences_array = vectorizer.transform(user_preferences)
+    else:
+        preferences_array = np.array(list(user_preferences.values()), dtype=np.float32).reshape(1, -1)
+    return model.predict_style_probabilities(preferences_array)[0]
+
+def _to_style_preferences(matches) -> List[StylePreference]:
+    return [
+        StylePreference(product_id=product_id, match_score=match_score, style_attributes=style_attributes)
+        for product_id, match_score, style_attributes in matches
+    ]
+
 # TODO: Implement caching mechanism for frequent style predictions
 # TODO: Add unit tests for each function in this file
 # TODO: Integrate with monitoring system to track model performance and drift
\ No newline at end of file
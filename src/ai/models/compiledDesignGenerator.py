@@ -0,0 +1,108 @@
+import time
+import numpy as np
+import tensorflow as tf
+from typing import Sequence
+from src.ai.models.designGeneratorModel import DesignGeneratorModel
+from src.ai.utils.modelRegistry import estimate_model_size
+from src.backend.utils.logger import logger
+
+DEFAULT_BATCH_BUCKETS = (1, 2, 4, 8, 12, 16, 24, 32, 48, 64)
+
+
+class CompiledDesignGenerator:
+    def __init__(self, model: DesignGeneratorModel, batch_buckets: Sequence[int] = DEFAULT_BATCH_BUCKETS,
+                 jit_compile: bool = False):
+        """
+        Serving wrapper that runs a DesignGeneratorModel's generator as traced graphs.
+
+        Each batch bucket gets its own tf.function with a fully static input signature,
+        so a request is padded up to the nearest bucket and never triggers retracing.
+        Batches larger than the biggest bucket are run in chunks of that size. With
+        jit_compile the graphs are also compiled by XLA; whether that beats the plain
+        graph depends on the host, so compare both with designGeneratorBenchmark.
+
+        Args:
+            model (DesignGeneratorModel): Loaded generator model.
+            batch_buckets (Sequence[int]): Batch sizes to trace; requests are padded up to the nearest one.
+            jit_compile (bool): Compile the traced graphs with XLA.
+        """
+        if not batch_buckets:
+            raise ValueError("At least one batch bucket is required")
+
+        self.model = model
+        self.latent_dim = model.latent_dim
+        self.num_classes = model.num_classes
+        self.batch_buckets = tuple(sorted(set(int(bucket) for bucket in batch_buckets)))
+        self.jit_compile = jit_compile
+
+        generator = model.generator
+        self._functions = {}
+        for bucket in self.batch_buckets:
+            self._functions[bucket] = tf.function(
+                lambda noise, labels: (generator([noise, labels], training=False) + 1.0) / 2.0,
+                input_signature=[
+                    tf.TensorSpec((bucket, self.latent_dim), tf.float32),
+                    tf.TensorSpec((bucket, 1), tf.int32)
+                ],
+                jit_compile=jit_compile
+            )
+
+    @property
+    def nbytes(self) -> int:
+        return estimate_model_size(self.model.generator) + estimate_model_size(self.model.discriminator)
+
+    def warmup(self) -> dict:
+        """
+        Traces (and with jit_compile, compiles) every bucket so no request pays for it.
+
+        Returns:
+            dict: Seconds spent warming each bucket.
+        """
+        timings = {}
+        for bucket in self.batch_buckets:
+            start = time.perf_counter()
+            self._functions[bucket](
+                tf.zeros((bucket, self.latent_dim), tf.float32), tf.zeros((bucket, 1), tf.int32)
+            )
+            timings[bucket] = time.perf_counter() - start
+        logger.info(f"CompiledDesignGenerator warmed buckets {self.batch_buckets} (jit_compile={self.jit_compile})")
+        return timings
+
+    def generate_designs(self, labels, noise) -> np.ndarray:
+        # Same contract as DesignGeneratorModel.generate_designs: designs rescaled to [0, 1]
+        noise = np.asarray(noise, dtype=np.float32).reshape(-1, self.latent_dim)
+        labels = np.broadcast_to(np.asarray(labels, dtype=np.int32).reshape(-1), (len(noise),))
+
+        largest = self.batch_buckets[-1]
+        outputs = [
+            self._run_bucketed(labels[start:start + largest], noise[start:start + largest])
+            for start in range(0, len(noise), largest)
+        ]
+        return outputs[0] if len(outputs) == 1 else np.concatenate(outputs)
+
+    def generate_design(self, label, noise) -> np.ndarray:
+        return self.generate_designs([label], noise)[0]
+
+    def generate_variation(self, features, noise) -> np.ndarray:
+        noise = np.atleast_2d(noise)
+        return self.generate_designs(np.full(len(noise), features), noise)
+
+    def extract_features(self, design_image):
+        return self.model.extract_features(design_image)
+
+    def design_to_base64(self, design, image_format=None, quality=None):
+        return self.model.design_to_base64(design, image_format, quality)
+
+    def _run_bucketed(self, labels: np.ndarray, noise: np.ndarray) -> np.ndarray:
+        count = len(noise)
+        bucket = next(bucket for bucket in self.batch_buckets if bucket >= count)
+        if bucket != count:
+            # Pad with zero rows; their outputs are dropped below
+            padded_noise = np.zeros((bucket, self.latent_dim), dtype=np.float32)
+            padded_noise[:count] = noise
+            padded_labels = np.zeros(bucket, dtype=np.int32)
+            padded_labels[:count] = labels
+            noise, labels = padded_noise, padded_labels
+
+        designs = self._functions[bucket](noise, labels.reshape(-1, 1))
+        return designs.numpy()[:count]
@@ -0,0 +1,278 @@
+import argparse
+import numpy as np
+from PIL import Image
+from src.ai.models.modelArtifact import ARTIFACT_FILE_SUFFIX, ModelArtifact, load_artifact, save_artifact
+from src.ai.utils.imageEncoding import encode_image_base64
+
+# Default location of the exported generator, next to the Keras generator
+ENGINE_FILE_SUFFIX = f"_engine{ARTIFACT_FILE_SUFFIX}"
+ARTIFACT_KIND = 'design_generator'
+
+# Noise samples per style label averaged into the label's prototype design at export
+PROTOTYPE_SAMPLES = 256
+
+
+def _activate(x: np.ndarray, activation: dict) -> np.ndarray:
+    name = activation['name']
+    if name == 'leaky_relu':
+        return np.maximum(x, x * activation['negative_slope'], out=x)
+    if name == 'tanh':
+        return np.tanh(x, out=x)
+    return x
+
+
+def conv2d_transpose(x: np.ndarray, kernel: np.ndarray, bias: np.ndarray, stride: int) -> np.ndarray:
+    """
+    Transposed 2D convolution with 'same' padding, as tf.keras.layers.Conv2DTranspose.
+
+    Every input pixel is projected to a kernel-sized output patch with one matrix
+    multiply, and the patches are scatter-added into the output with one strided
+    slice addition per kernel offset.
+
+    Args:
+        x (np.ndarray): Input of shape (batch, height, width, in_channels).
+        kernel (np.ndarray): Kernel of shape (in_channels, kernel_height, kernel_width, out_channels).
+        bias (np.ndarray): Bias of shape (out_channels,).
+        stride (int): Stride in both spatial dimensions.
+
+    Returns:
+        np.ndarray: Output of shape (batch, height * stride, width * stride, out_channels).
+    """
+    batch, height, width, in_channels = x.shape
+    _, kernel_height, kernel_width, out_channels = kernel.shape
+
+    patches = (x.reshape(-1, in_channels) @ kernel.reshape(in_channels, -1)).reshape(
+        batch, height, width, kernel_height, kernel_width, out_channels
+    )
+    full = np.zeros(
+        (batch, (height - 1) * stride + kernel_height, (width - 1) * stride + kernel_width, out_channels),
+        dtype=np.float32
+    )
+    for i in range(kernel_height):
+        for j in range(kernel_width):
+            full[:, i:i + (height - 1) * stride + 1:stride, j:j + (width - 1) * stride + 1:stride] += patches[:, :, :, i, j]
+
+    # 'same' padding of the equivalent forward convolution: kernel - stride in total
+    top, left = (kernel_height - stride) // 2, (kernel_width - stride) // 2
+    output = full[:, top:top + height * stride, left:left + width * stride]
+    output += bias
+    return output
+
+
+def _fold_batch_norm(layer) -> tuple:
+    # Inference-mode BatchNormalization as a per-channel scale and shift
+    variance = layer.moving_variance.numpy().astype(np.float64)
+    scale = 1.0 / np.sqrt(variance + layer.epsilon)
+    if layer.scale:
+        scale *= layer.gamma.numpy()
+    shift = -layer.moving_mean.numpy() * scale
+    if layer.center:
+        shift += layer.beta.numpy()
+    return scale, shift
+
+
+class DesignGeneratorEngine:
+    def __init__(self, noise_kernel, label_bias, output_shape, kernels, biases, strides, activations,
+                 prototypes=None):
+        """
+        NumPy-only inference engine for an exported DesignGeneratorModel generator.
+
+        The label embedding and the first Dense layer are folded into a noise kernel
+        and a per-label bias, and every BatchNormalization into the preceding layer,
+        so generation is one matrix multiply plus a transposed convolution per layer.
+        The discriminator is not exported; style features of an uploaded design are
+        inferred from per-label prototype designs computed from the generator.
+
+        Args:
+            noise_kernel (np.ndarray): Folded first-layer kernel of shape (latent_dim, units).
+            label_bias (np.ndarray): Folded first-layer bias per style label, shape (num_classes, units).
+            output_shape (tuple): (height, width, channels) the first layer's output is reshaped to.
+            kernels (list): Transposed convolution kernels, (in_channels, height, width, out_channels).
+            biases (list): Transposed convolution biases.
+            strides (list): Transposed convolution strides.
+            activations (list): Activation per layer, the first layer's first, as {'name', ...} dicts.
+            prototypes (np.ndarray): Mean design per style label in [0, 1], for extract_features.
+        """
+        self.noise_kernel = noise_kernel
+        self.label_bias = label_bias
+        self.output_shape = tuple(output_shape)
+        self.kernels = list(kernels)
+        self.biases = list(biases)
+        self.strides = list(strides)
+        self.activations = list(activations)
+        self.prototypes = prototypes
+        self.latent_dim = noise_kernel.shape[0]
+        self.num_classes = label_bias.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.noise_kernel, self.label_bias] + self.kernels + self.biases
+        if self.prototypes is not None:
+            arrays.append(self.prototypes)
+        return sum(array.nbytes for array in arrays)
+
+    @classmethod
+    def from_keras(cls, generator, prototype_samples: int = PROTOTYPE_SAMPLES, seed: int = 0):
+        """
+        Builds an engine from a DesignGeneratorModel generator.
+
+        Supports the generator's layer stack: an Embedding concatenated with the noise,
+        a Dense layer, then Conv2DTranspose layers, each optionally followed by
+        BatchNormalization and LeakyReLU, with a Reshape after the Dense layer.
+        """
+        import tensorflow as tf
+
+        embedding, dense, reshape = None, None, None
+        layers = []  # [kernel, bias, stride, activation] per Conv2DTranspose
+        activations = [{'name': 'linear'}]
+        for layer in generator.layers:
+            if isinstance(layer, (tf.keras.layers.InputLayer, tf.keras.layers.Flatten, tf.keras.layers.Concatenate)):
+                continue
+            if isinstance(layer, tf.keras.layers.Embedding):
+                embedding = layer.embeddings.numpy()
+            elif isinstance(layer, tf.keras.layers.Dense):
+                kernel = layer.kernel.numpy().astype(np.float64)
+                bias = layer.bias.numpy() if layer.use_bias else np.zeros(kernel.shape[1])
+                dense = [kernel, bias]
+                activations[0] = cls._activation_config(layer)
+            elif isinstance(layer, tf.keras.layers.Reshape):
+                reshape = layer.target_shape
+            elif isinstance(layer, tf.keras.layers.Conv2DTranspose):
+                if layer.padding != 'same' or layer.strides[0] != layer.strides[1]:
+                    raise ValueError(f"Unsupported Conv2DTranspose configuration in layer {layer.name}")
+                # Keras layout (height, width, out, in) -> (in, height, width, out) for one matmul per layer
+                kernel = layer.kernel.numpy().transpose(3, 0, 1, 2).astype(np.float64)
+                bias = layer.bias.numpy() if layer.use_bias else np.zeros(kernel.shape[-1])
+                layers.append([kernel, bias, layer.strides[0]])
+                activations.append(cls._activation_config(layer))
+            elif isinstance(layer, tf.keras.layers.BatchNormalization):
+                scale, shift = _fold_batch_norm(layer)
+                target = layers[-1] if layers else dense
+                target[0] = target[0] * scale
+                target[1] = target[1] * scale + shift
+            elif isinstance(layer, tf.keras.layers.LeakyReLU):
+                config = layer.get_config()
+                slope = config.get('negative_slope', config.get('alpha'))
+                activations[-1] = {'name': 'leaky_relu', 'negative_slope': float(slope)}
+            else:
+                raise ValueError(f"Unsupported generator layer {layer.name} ({type(layer).__name__})")
+
+        latent_dim = int(generator.inputs[0].shape[-1])
+        noise_kernel, label_kernel = dense[0][:latent_dim], dense[0][latent_dim:]
+        engine = cls(
+            noise_kernel.astype(np.float32),
+            (embedding @ label_kernel + dense[1]).astype(np.float32),
+            reshape,
+            [kernel.astype(np.float32) for kernel, _, _ in layers],
+            [bias.astype(np.float32) for _, bias, _ in layers],
+            [stride for _, _, stride in layers],
+            activations
+        )
+        engine.prototypes = engine.compute_prototypes(prototype_samples, seed)
+        return engine
+
+    @staticmethod
+    def _activation_config(layer) -> dict:
+        name = layer.get_config().get('activation', 'linear')
+        return {'name': name if name in ('tanh', 'leaky_relu') else 'linear'}
+
+    def compute_prototypes(self, num_samples: int = PROTOTYPE_SAMPLES, seed: int = 0) -> np.ndarray:
+        rng = np.random.default_rng(seed)
+        return np.stack([
+            self.generate_designs(
+                np.full(num_samples, label), rng.standard_normal((num_samples, self.latent_dim))
+            ).mean(axis=0)
+            for label in range(self.num_classes)
+        ]).astype(np.float32)
+
+    def save(self, filepath):
+        arrays = {'noise_kernel': self.noise_kernel, 'label_bias': self.label_bias}
+        for i, (kernel, bias) in enumerate(zip(self.kernels, self.biases)):
+            arrays[f"kernel{i}"] = kernel
+            arrays[f"bias{i}"] = bias
+        if self.prototypes is not None:
+            arrays['prototypes'] = self.prototypes
+        metadata = {'output_shape': list(self.output_shape), 'strides': self.strides, 'activations': self.activations}
+        save_artifact(filepath, ModelArtifact(ARTIFACT_KIND, arrays, metadata))
+
+    @classmethod
+    def load(cls, filepath):
+        artifact = load_artifact(filepath, ARTIFACT_KIND)
+        arrays, metadata = artifact.arrays, artifact.metadata
+        num_layers = len(metadata['strides'])
+        return cls(
+            arrays['noise_kernel'], arrays['label_bias'], metadata['output_shape'],
+            [arrays[f"kernel{i}"] for i in range(num_layers)],
+            [arrays[f"bias{i}"] for i in range(num_layers)],
+            metadata['strides'], metadata['activations'],
+            prototypes=arrays.get('prototypes')
+        )
+
+    def generate_designs(self, labels, noise) -> np.ndarray:
+        # Same contract as DesignGeneratorModel.generate_designs: designs rescaled to [0, 1]
+        noise = np.asarray(noise, dtype=np.float32).reshape(-1, self.latent_dim)
+        labels = np.broadcast_to(np.asarray(labels, dtype=np.intp).reshape(-1), (len(noise),))
+
+        x = noise @ self.noise_kernel
+        x += self.label_bias[labels]
+        x = _activate(x, self.activations[0]).reshape((len(noise),) + self.output_shape)
+        for kernel, bias, stride, activation in zip(self.kernels, self.biases, self.strides, self.activations[1:]):
+            x = _activate(conv2d_transpose(x, kernel, bias, stride), activation)
+
+        x = np.ascontiguousarray(x)
+        x += 1.0
+        x /= 2.0  # Rescale to [0, 1]
+        return x
+
+    def generate_design(self, label, noise) -> np.ndarray:
+        return self.generate_designs([label], noise)[0]
+
+    def generate_variation(self, features, noise) -> np.ndarray:
+        noise = np.atleast_2d(noise)
+        return self.generate_designs(np.full(len(noise), features), noise)
+
+    def extract_features(self, design_image):
+        # The style label whose prototype design is closest to the uploaded design
+        if self.prototypes is None:
+            raise RuntimeError("extract_features requires an engine exported with prototypes")
+        height, width = self.prototypes.shape[1:3]
+        design = np.asarray(design_image.convert('RGB').resize((width, height)), dtype=np.float32) / 255.0
+        distances = ((self.prototypes - design) ** 2).sum(axis=(1, 2, 3))
+        return int(np.argmin(distances))
+
+    def design_to_base64(self, design, image_format=None, quality=None):
+        image = Image.fromarray((np.clip(design, 0.0, 1.0) * 255).astype(np.uint8))
+        return encode_image_base64(image, image_format, quality)
+
+
+def export_design_generator_engine(generator_path, output_path=None):
+    """
+    Exports a saved DesignGeneratorModel generator to a NumPy engine artifact.
+
+    Args:
+        generator_path (str): Path the generator was saved to (DesignGeneratorModel.save_model).
+        output_path (str): Destination file, defaults to f"{generator_path}{ENGINE_FILE_SUFFIX}".
+
+    Returns:
+        str: Path of the written artifact.
+    """
+    # Imported here so serving processes that only load engines never import TensorFlow
+    import tensorflow as tf
+
+    generator = tf.keras.models.load_model(generator_path)
+    output_path = output_path or f"{generator_path}{ENGINE_FILE_SUFFIX}"
+    DesignGeneratorEngine.from_keras(generator).save(output_path)
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a DesignGeneratorModel generator for NumPy-only serving")
+    parser.add_argument('generator_path')
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    print(f"Engine weights written to {export_design_generator_engine(args.generator_path, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
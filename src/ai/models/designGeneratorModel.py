@@ -1,9 +1,24 @@
+import os
 import tensorflow as tf
 import numpy as np
 from PIL import Image
-from io import BytesIO
-import base64
 from src.shared.constants.index import StyleLines
+from src.ai.models.designGeneratorEngine import DesignGeneratorEngine
+from src.ai.utils.imageEncoding import encode_image_base64
+
+def discriminator_path_for(generator_path):
+    # The discriminator is saved next to the generator: design_generator.keras -> design_generator_discriminator.keras
+    root, extension = os.path.splitext(generator_path)
+    return f"{root}_discriminator{extension}"
+
+
+def generator_dimensions(generator):
+    # (latent_dim, num_classes) of a built or loaded generator
+    latent_dim = int(generator.inputs[0].shape[-1])
+    embeddings = [layer for layer in generator.layers if isinstance(layer, tf.keras.layers.Embedding)]
+    num_classes = int(embeddings[0].input_dim) if embeddings else 1
+    return latent_dim, num_classes
+
 
 class DesignGeneratorModel:
     def __init__(self, latent_dim, num_classes):
@@ -109,20 +124,52 @@ class DesignGeneratorModel:
         generated_design = (generated_design[0, ...] + 1) / 2.0  # Rescale to [0, 1]
         return generated_design.numpy()
 
-    def save_model(self, generator_path, discriminator_path):
+    def generate_designs(self, labels, noise):
+        # Batched generation: one generator call for (batch_size, latent_dim) noise
+        labels = np.asarray(labels, dtype=np.int32).reshape(-1, 1)
+        generated_designs = self.generator([np.asarray(noise, dtype=np.float32), labels], training=False)
+        return ((generated_designs + 1) / 2.0).numpy()  # Rescale to [0, 1]
+
+    def extract_features(self, design_image):
+        # The generator is conditioned only on the style label, so infer it with the
+        # conditional discriminator: the label under which the design looks most real
+        design = np.asarray(design_image.convert('RGB').resize((28, 28)), dtype=np.float32) / 127.5 - 1.0
+        designs = np.repeat(design[np.newaxis, ...], self.num_classes, axis=0)
+        labels = np.arange(self.num_classes, dtype=np.int32).reshape(-1, 1)
+        scores = self.discriminator([designs, labels], training=False).numpy()
+        return int(np.argmax(scores[:, 0]))
+
+    def generate_variation(self, features, noise):
+        # Variations keep the initial design's style label and vary only the noise,
+        # so a (num_variations, latent_dim) noise matrix is generated in one call
+        noise = np.atleast_2d(noise)
+        return self.generate_designs(np.full(len(noise), features), noise)
+
+    def save_model(self, generator_path, discriminator_path=None):
         self.generator.save(generator_path)
-        self.discriminator.save(discriminator_path)
+        self.discriminator.save(discriminator_path or discriminator_path_for(generator_path))
+
+    def export_engine(self, filepath):
+        # Write a generator-only NumPy serving artifact; the discriminator is only needed for training
+        DesignGeneratorEngine.from_keras(self.generator).save(filepath)
 
-    def load_model(self, generator_path, discriminator_path):
+    def load_model(self, generator_path, discriminator_path=None):
         self.generator = tf.keras.models.load_model(generator_path)
-        self.discriminator = tf.keras.models.load_model(discriminator_path)
+        self.discriminator = tf.keras.models.load_model(discriminator_path or discriminator_path_for(generator_path))
+
+    @classmethod
+    def from_saved(cls, generator_path, discriminator_path=None):
+        # Take the dimensions from the saved generator instead of building networks only to replace them
+        model = cls.__new__(cls)
+        model.generator = tf.keras.models.load_model(generator_path)
+        model.latent_dim, model.num_classes = generator_dimensions(model.generator)
+        model.discriminator = tf.keras.models.load_model(discriminator_path or discriminator_path_for(generator_path))
+        return model
 
     def design_to_image(self, design):
         design = (design * 255).astype(np.uint8)
         return Image.fromarray(design)
 
-    def design_to_base64(self, design):
+    def design_to_base64(self, design, image_format=None, quality=None):
         img = self.design_to_image(design)
-        buffered = BytesIO()
-        img.save(buffered, format="PNG")
-        return base64.b64encode(buffered.getvalue()).decode()
\ No newline at end of file
+        return encode_image_base64(img, image_format, quality)
\ No newline at end of file
@@ -0,0 +1,121 @@
+import json
+import os
+import struct
+import tempfile
+import numpy as np
+from typing import Dict
+
+# Single-file serving artifact:
+#   magic (8 bytes) | header length (uint64, little-endian) | JSON header | padding |
+#   raw arrays, each starting on an ARRAY_ALIGNMENT boundary
+# The header records each array's dtype, shape and offset from the start of the array
+# section, so loading is one mmap and a few views: no parsing, no copies onto the heap.
+ARTIFACT_MAGIC = b'AIMODEL\x01'
+ARTIFACT_FILE_SUFFIX = '.model'
+ARRAY_ALIGNMENT = 64
+
+_HEADER_LENGTH = struct.Struct('<Q')
+
+
+def align_offset(offset: int) -> int:
+    # Rounds offset up to the next ARRAY_ALIGNMENT boundary
+    return -(-offset // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+
+class ModelArtifact:
+    def __init__(self, kind: str, arrays: Dict[str, np.ndarray], metadata: dict = None):
+        """
+        A model's weights and the metadata needed to rebuild it for serving.
+
+        Args:
+            kind (str): What the artifact holds, e.g. 'style_matcher'; checked on load.
+            arrays (Dict[str, np.ndarray]): Weight arrays by name.
+            metadata (dict): JSON-serializable settings such as activations or shapes.
+        """
+        self.kind = kind
+        self.arrays = arrays
+        self.metadata = metadata or {}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays.values())
+
+
+def save_artifact(path: str, artifact: ModelArtifact) -> None:
+    """
+    Writes an artifact atomically: readers, including processes that have the previous
+    version mapped, never see a partial file.
+
+    Args:
+        path (str): Destination file.
+        artifact (ModelArtifact): The artifact to write.
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in artifact.arrays.items()}
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        offset = align_offset(offset)
+        layout[name] = {'offset': offset, 'shape': list(array.shape), 'dtype': array.dtype.str}
+        offset += array.nbytes
+
+    header = json.dumps({'kind': artifact.kind, 'metadata': artifact.metadata, 'arrays': layout}).encode()
+    data_start = align_offset(len(ARTIFACT_MAGIC) + _HEADER_LENGTH.size + len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(ARTIFACT_MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name]['offset'])
+                f.write(array.data)
+            f.truncate(data_start + offset)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def is_artifact(path: str) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(len(ARTIFACT_MAGIC)) == ARTIFACT_MAGIC
+
+
+def load_artifact(path: str, kind: str = None) -> ModelArtifact:
+    """
+    Maps an artifact read-only. Arrays are views into the mapping, so pages are read on
+    first use and shared with every other process mapping the same file.
+
+    Args:
+        path (str): Artifact file.
+        kind (str): Expected kind, or None to accept any.
+
+    Returns:
+        ModelArtifact: The artifact, with read-only memory-mapped arrays.
+
+    Raises:
+        ValueError: If the file is not an artifact or holds a different kind of model.
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(len(ARTIFACT_MAGIC) + _HEADER_LENGTH.size)
+        if prefix[:len(ARTIFACT_MAGIC)] != ARTIFACT_MAGIC:
+            raise ValueError(f"{path} is not a model artifact")
+        (header_length,) = _HEADER_LENGTH.unpack(prefix[len(ARTIFACT_MAGIC):])
+        header = json.loads(f.read(header_length))
+
+    if kind is not None and header['kind'] != kind:
+        raise ValueError(f"{path} holds a '{header['kind']}' model, expected '{kind}'")
+
+    data_start = align_offset(len(ARTIFACT_MAGIC) + _HEADER_LENGTH.size + header_length)
+    mapping = np.memmap(path, dtype=np.uint8, mode='r') if os.path.getsize(path) > data_start else None
+
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype, shape = np.dtype(spec['dtype']), tuple(spec['shape'])
+        if mapping is None or int(np.prod(shape)) == 0:
+            arrays[name] = np.empty(shape, dtype=dtype)
+            continue
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=mapping, offset=data_start + spec['offset'])
+    return ModelArtifact(header['kind'], arrays, header['metadata'])
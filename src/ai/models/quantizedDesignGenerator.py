@@ -0,0 +1,218 @@
+import argparse
+import os
+import threading
+import numpy as np
+import tensorflow as tf
+from PIL import Image
+from typing import Sequence
+from src.ai.models.compiledDesignGenerator import DEFAULT_BATCH_BUCKETS
+from src.ai.models.designGeneratorModel import generator_dimensions
+from src.ai.utils.imageEncoding import encode_image_base64
+from src.backend.utils.logger import logger
+
+try:
+    from ai_edge_litert.interpreter import Interpreter
+except ImportError:
+    Interpreter = tf.lite.Interpreter
+
+QUANTIZATION_MODES = ('dynamic', 'float16', 'int8')
+TFLITE_FILE_SUFFIX = '.tflite'
+
+
+def export_quantized_generator(generator: tf.keras.Model, output_path: str, mode: str = 'int8',
+                               num_calibration_samples: int = 256, seed: int = 0) -> int:
+    """
+    Converts a DesignGeneratorModel generator to a post-training quantized TFLite model.
+
+    The exported model keeps the generator's (noise, labels) inputs with a dynamic
+    batch dimension and its tanh output in [-1, 1].
+
+    Args:
+        generator (tf.keras.Model): The Keras generator (DesignGeneratorModel.generator).
+        output_path (str): Path of the .tflite file to write.
+        mode (str): 'int8' (int8 weights and activations, calibrated on generator noise),
+            'float16' (float16 weights) or 'dynamic' (int8 weights dequantized at run time,
+            usually the slowest of the three on CPU).
+        num_calibration_samples (int): Noise samples used to calibrate int8 activation ranges.
+        seed (int): Seed of the calibration noise.
+
+    Returns:
+        int: Size of the exported model in bytes.
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unsupported quantization mode '{mode}', expected one of {QUANTIZATION_MODES}")
+
+    latent_dim, num_classes = generator_dimensions(generator)
+    converter = tf.lite.TFLiteConverter.from_keras_model(generator)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if mode == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif mode == 'int8':
+        rng = np.random.default_rng(seed)
+
+        noise_name, labels_name = (tensor.name for tensor in generator.inputs)
+
+        def representative_dataset():
+            # The generator's real input distribution: N(0, 1) noise and uniform labels,
+            # keyed by input name since the converted model may reorder its inputs
+            for _ in range(num_calibration_samples):
+                yield {
+                    noise_name: rng.standard_normal((1, latent_dim)).astype(np.float32),
+                    labels_name: rng.integers(0, num_classes, (1, 1)).astype(np.int32)
+                }
+
+        converter.representative_dataset = representative_dataset
+        # Int8 kernels wherever available; ops without one stay in float
+        converter.target_spec.supported_ops = [
+            tf.lite.OpsSet.TFLITE_BUILTINS_INT8, tf.lite.OpsSet.TFLITE_BUILTINS
+        ]
+
+    tflite_model = converter.convert()
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'wb') as f:
+        f.write(tflite_model)
+    logger.info(f"Exported {mode} quantized generator to {output_path} ({len(tflite_model)} bytes)")
+    return len(tflite_model)
+
+
+class QuantizedDesignGenerator:
+    def __init__(self, tflite_path: str, feature_model=None, batch_buckets: Sequence[int] = DEFAULT_BATCH_BUCKETS,
+                 num_threads: int = None):
+        """
+        Serves a quantized TFLite generator with the DesignGeneratorModel generation interface.
+
+        TFLite interpreters are not thread-safe and resizing their inputs reallocates
+        tensors, so one interpreter is created lazily per batch bucket, each behind its
+        own lock, and requests are padded up to the nearest bucket. Interpreters open the
+        model by path, so the file is memory-mapped read-only and its pages are shared by
+        every interpreter and every serving process instead of copied into each.
+
+        Args:
+            tflite_path (str): Path to a model written by export_quantized_generator.
+            feature_model (DesignGeneratorModel): Float model whose discriminator serves extract_features, if needed.
+            batch_buckets (Sequence[int]): Batch sizes interpreters are allocated for.
+            num_threads (int): Threads per interpreter invocation; None uses the TFLite default.
+        """
+        self.tflite_path = tflite_path
+        self.feature_model = feature_model
+        self.batch_buckets = tuple(sorted(set(int(bucket) for bucket in batch_buckets)))
+        self.num_threads = num_threads
+        self._interpreters = {}
+        self._lock = threading.Lock()
+
+        # Read the input layout once from an unallocated interpreter
+        details = Interpreter(model_path=tflite_path).get_input_details()
+        self._noise_input = next(i for i, detail in enumerate(details) if detail['dtype'] == np.float32)
+        self._labels_input = 1 - self._noise_input
+        self.latent_dim = int(details[self._noise_input]['shape_signature'][-1])
+        self.num_classes = feature_model.num_classes if feature_model is not None else None
+
+    @property
+    def nbytes(self) -> int:
+        return os.path.getsize(self.tflite_path)
+
+    def warmup(self) -> None:
+        for bucket in self.batch_buckets:
+            self._run_bucketed(np.zeros(bucket, dtype=np.int32), np.zeros((bucket, self.latent_dim), dtype=np.float32))
+
+    def generate_designs(self, labels, noise) -> np.ndarray:
+        noise = np.asarray(noise, dtype=np.float32).reshape(-1, self.latent_dim)
+        labels = np.broadcast_to(np.asarray(labels, dtype=np.int32).reshape(-1), (len(noise),))
+
+        largest = self.batch_buckets[-1]
+        outputs = [
+            self._run_bucketed(labels[start:start + largest], noise[start:start + largest])
+            for start in range(0, len(noise), largest)
+        ]
+        return outputs[0] if len(outputs) == 1 else np.concatenate(outputs)
+
+    def generate_design(self, label, noise) -> np.ndarray:
+        return self.generate_designs([label], noise)[0]
+
+    def generate_variation(self, features, noise) -> np.ndarray:
+        noise = np.atleast_2d(noise)
+        return self.generate_designs(np.full(len(noise), features), noise)
+
+    def extract_features(self, design_image):
+        if self.feature_model is None:
+            raise RuntimeError("extract_features requires the float model's discriminator")
+        return self.feature_model.extract_features(design_image)
+
+    def design_to_base64(self, design, image_format=None, quality=None):
+        # Quantized tanh outputs can overshoot [-1, 1] by a step, so clip before casting
+        image = Image.fromarray((np.clip(design, 0.0, 1.0) * 255).astype(np.uint8))
+        return encode_image_base64(image, image_format, quality)
+
+    def _interpreter(self, bucket: int) -> tuple:
+        with self._lock:
+            entry = self._interpreters.get(bucket)
+            if entry is None:
+                interpreter = Interpreter(model_path=self.tflite_path, num_threads=self.num_threads)
+                details = interpreter.get_input_details()
+                interpreter.resize_tensor_input(details[self._noise_input]['index'], [bucket, self.latent_dim])
+                interpreter.resize_tensor_input(details[self._labels_input]['index'], [bucket, 1])
+                interpreter.allocate_tensors()
+                entry = self._interpreters[bucket] = (interpreter, threading.Lock())
+            return entry
+
+    def _run_bucketed(self, labels: np.ndarray, noise: np.ndarray) -> np.ndarray:
+        count = len(noise)
+        bucket = next(bucket for bucket in self.batch_buckets if bucket >= count)
+        padded_noise = np.zeros((bucket, self.latent_dim), dtype=np.float32)
+        padded_noise[:count] = noise
+        padded_labels = np.zeros((bucket, 1), dtype=np.int32)
+        padded_labels[:count, 0] = labels
+
+        interpreter, lock = self._interpreter(bucket)
+        with lock:
+            details = interpreter.get_input_details()
+            interpreter.set_tensor(details[self._noise_input]['index'], padded_noise)
+            interpreter.set_tensor(details[self._labels_input]['index'], padded_labels)
+            interpreter.invoke()
+            designs = interpreter.get_tensor(interpreter.get_output_details()[0]['index'])
+        return (designs[:count] + 1.0) / 2.0  # Rescale to [0, 1]
+
+
+def compare_generators(reference, candidate, num_samples: int = 64, seed: int = 0) -> dict:
+    """
+    Compares a quantized generator's outputs with the float model on the same inputs.
+
+    Args:
+        reference: Float generator exposing generate_designs (e.g. DesignGeneratorModel).
+        candidate: Quantized generator exposing generate_designs.
+        num_samples (int): Designs to compare.
+        seed (int): Seed of the noise and labels.
+
+    Returns:
+        dict: Mean and max absolute error in [0, 1] pixel units, and PSNR in dB.
+    """
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((num_samples, reference.latent_dim)).astype(np.float32)
+    labels = rng.integers(0, reference.num_classes, num_samples)
+
+    expected = reference.generate_designs(labels, noise)
+    actual = candidate.generate_designs(labels, noise)
+    error = np.abs(actual - expected)
+    mse = float(np.mean(error ** 2))
+    return {
+        'mae': float(error.mean()),
+        'max_abs_error': float(error.max()),
+        'psnr_db': float('inf') if mse == 0 else float(10 * np.log10(1.0 / mse))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a quantized TFLite design generator")
+    parser.add_argument('generator_path', help="Saved Keras generator (DesignGeneratorModel.save_model)")
+    parser.add_argument('output_path', help=f"Output {TFLITE_FILE_SUFFIX} file")
+    parser.add_argument('--mode', choices=QUANTIZATION_MODES, default='int8')
+    parser.add_argument('--calibration-samples', type=int, default=256)
+    args = parser.parse_args()
+
+    generator = tf.keras.models.load_model(args.generator_path)
+    export_quantized_generator(generator, args.output_path, args.mode, args.calibration_samples)
+
+
+if __name__ == "__main__":
+    main()
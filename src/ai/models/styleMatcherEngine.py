@@ -0,0 +1,199 @@
+import argparse
+import numpy as np
+from src.shared.constants.index import StyleLines
+from src.ai.models.modelArtifact import ARTIFACT_FILE_SUFFIX, ModelArtifact, load_artifact, save_artifact
+from src.ai.utils.sharedWeights import SharedArrays
+
+# Default location of the exported weight file, next to the Keras model
+ENGINE_FILE_SUFFIX = f"_engine{ARTIFACT_FILE_SUFFIX}"
+ARTIFACT_KIND = 'style_matcher'
+
+# Style line names in model output order
+STYLE_LINE_NAMES = [style.name for style in StyleLines]
+
+
+def _linear(x):
+    return x
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def _softmax(x):
+    x -= x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+_ACTIVATIONS = {
+    'linear': _linear,
+    'relu': _relu,
+    'softmax': _softmax,
+}
+
+
+def fold_scaler_into_dense(mean, scale, weights, bias):
+    """
+    Folds StandardScaler statistics into the first Dense layer.
+
+    ((x - mean) / scale) @ W + b == x @ (W / scale[:, None]) + (b - (mean / scale) @ W)
+
+    Args:
+        mean (np.array): Per-feature mean, or None when the scaler does not center.
+        scale (np.array): Per-feature scale, or None when the scaler does not scale.
+        weights (np.array): Dense kernel of shape (num_features, units).
+        bias (np.array): Dense bias of shape (units,).
+
+    Returns:
+        tuple: Folded (weights, bias).
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    bias = np.asarray(bias, dtype=np.float64)
+    scale = np.ones(weights.shape[0]) if scale is None else np.asarray(scale, dtype=np.float64)
+    mean = np.zeros(weights.shape[0]) if mean is None else np.asarray(mean, dtype=np.float64)
+
+    folded_weights = weights / scale[:, np.newaxis]
+    folded_bias = bias - (mean / scale) @ weights
+    return folded_weights, folded_bias
+
+
+class StyleMatcherEngine:
+    def __init__(self, weights, biases, activations, scaler_mean=None, scaler_scale=None):
+        """
+        NumPy-only inference engine for an exported StyleMatcherModel.
+
+        The StandardScaler is folded into the first layer at export time, so inputs
+        are raw preference rows exactly as passed to StyleMatcherModel. Its statistics
+        are kept alongside the weights so an artifact fully describes the trained model.
+
+        Args:
+            weights (list): Dense kernels, one per layer.
+            biases (list): Dense biases, one per layer.
+            activations (list): Activation name per layer ('relu', 'softmax' or 'linear').
+            scaler_mean (np.array): Per-feature mean of the folded scaler, if known.
+            scaler_scale (np.array): Per-feature scale of the folded scaler, if known.
+        """
+        unsupported = set(activations) - set(_ACTIVATIONS)
+        if unsupported:
+            raise ValueError(f"Unsupported activations: {sorted(unsupported)}")
+
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.activations = list(activations)
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+
+    @property
+    def num_features(self):
+        return self.weights[0].shape[0]
+
+    @property
+    def nbytes(self):
+        return sum(w.nbytes for w in self.weights) + sum(b.nbytes for b in self.biases)
+
+    @classmethod
+    def from_keras(cls, keras_model, scaler):
+        """
+        Builds an engine from a trained Keras Dense stack and its fitted StandardScaler.
+        """
+        weights, biases, activations = [], [], []
+        for layer in keras_model.layers:
+            kernel, bias = layer.get_weights()
+            weights.append(kernel)
+            biases.append(bias)
+            activations.append(layer.get_config().get('activation', 'linear'))
+
+        mean, scale = getattr(scaler, 'mean_', None), getattr(scaler, 'scale_', None)
+        weights[0], biases[0] = fold_scaler_into_dense(mean, scale, weights[0], biases[0])
+        return cls(weights, biases, activations, scaler_mean=mean, scaler_scale=scale)
+
+    def save(self, filepath):
+        # Single-file model artifact (see modelArtifact), loaded by memory-mapping it
+        arrays = {}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"w{i}"] = w
+            arrays[f"b{i}"] = b
+        for name in ('scaler_mean', 'scaler_scale'):
+            if getattr(self, name) is not None:
+                arrays[name] = np.asarray(getattr(self, name), dtype=np.float64)
+        save_artifact(filepath, ModelArtifact(ARTIFACT_KIND, arrays, {'activations': self.activations}))
+
+    @classmethod
+    def load(cls, filepath):
+        artifact = load_artifact(filepath, ARTIFACT_KIND)
+        activations = artifact.metadata['activations']
+        return cls(
+            [artifact.arrays[f"w{i}"] for i in range(len(activations))],
+            [artifact.arrays[f"b{i}"] for i in range(len(activations))],
+            activations,
+            scaler_mean=artifact.arrays.get('scaler_mean'),
+            scaler_scale=artifact.arrays.get('scaler_scale')
+        )
+
+    def share(self):
+        """
+        Returns a copy of the engine whose weights live in one read-only shared memory
+        block, for serving from processes forked afterwards (see src/ai/serving.py).
+        """
+        arrays = {}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"w{i}"] = w
+            arrays[f"b{i}"] = b
+        shared = SharedArrays(arrays)
+        engine = StyleMatcherEngine(
+            [shared.arrays[f"w{i}"] for i in range(len(self.weights))],
+            [shared.arrays[f"b{i}"] for i in range(len(self.biases))],
+            self.activations, scaler_mean=self.scaler_mean, scaler_scale=self.scaler_scale
+        )
+        engine.shared_arrays = shared
+        return engine
+
+    def predict_style_probabilities(self, user_preferences):
+        # Accept a single preference row or a (batch_size, num_features) matrix
+        x = np.atleast_2d(np.asarray(user_preferences, dtype=np.float32))
+        for w, b, activation in zip(self.weights, self.biases, self.activations):
+            x = x @ w
+            x += b
+            x = _ACTIVATIONS[activation](x)
+        return x
+
+    def predict_style_line(self, user_preferences):
+        predictions = self.predict_style_probabilities(user_preferences)
+        return StyleLines(int(np.argmax(predictions[0]))).name
+
+
+def export_style_matcher_engine(model_path, output_path=None):
+    """
+    Exports a saved StyleMatcherModel and its _scaler.pkl to a NumPy engine weight file.
+
+    Args:
+        model_path (str): Path the StyleMatcherModel was saved to.
+        output_path (str): Destination file, defaults to f"{model_path}{ENGINE_FILE_SUFFIX}".
+
+    Returns:
+        str: Path of the written weight file.
+    """
+    # Imported here so serving processes that only load engines never import TensorFlow
+    from src.ai.models.styleMatcherModel import StyleMatcherModel
+
+    model = StyleMatcherModel()
+    model.load_model(model_path)
+
+    output_path = output_path or f"{model_path}{ENGINE_FILE_SUFFIX}"
+    StyleMatcherEngine.from_keras(model.model, model.scaler).save(output_path)
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a StyleMatcherModel for NumPy-only serving")
+    parser.add_argument('model_path')
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    print(f"Engine weights written to {export_style_matcher_engine(args.model_path, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
+import copy
 import tensorflow as tf
 import numpy as np
-import pandas as pd
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from src.shared.constants.index import StyleLines
+from src.ai.models.styleMatcherEngine import StyleMatcherEngine
 import joblib
 
 class StyleMatcherModel:
@@ -27,6 +27,9 @@ class StyleMatcherModel:
                            metrics=['accuracy'])
 
     def train(self, user_preferences, style_line_labels):
+        # Training-only dependency, kept out of the serving import path
+        from sklearn.model_selection import train_test_split
+
         # Split data into training and validation sets
         X_train, X_val, y_train, y_val = train_test_split(
             user_preferences, style_line_labels, test_size=0.2, random_state=42
@@ -49,6 +52,38 @@ class StyleMatcherModel:
         
         return history
 
+    def fine_tune(self, user_preferences, style_line_labels, epochs=5, batch_size=32, learning_rate=1e-4):
+        # Incremental update from the current weights: the scaler statistics are updated
+        # with the new rows instead of refit, and training runs a few low learning rate epochs
+        self.scaler.partial_fit(user_preferences)
+        user_preferences_scaled = self.scaler.transform(user_preferences)
+
+        # Fix the number of classes: a small update batch may not contain every style line
+        y_encoded = tf.keras.utils.to_categorical(style_line_labels, num_classes=len(StyleLines))
+
+        self.model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate),
+                           loss='categorical_crossentropy',
+                           metrics=['accuracy'])
+        return self.model.fit(user_preferences_scaled, y_encoded, epochs=epochs, batch_size=batch_size, verbose=0)
+
+    def accuracy(self, user_preferences, style_line_labels):
+        predicted_indices = np.argmax(self.predict_style_probabilities(user_preferences), axis=1)
+        return float(np.mean(predicted_indices == np.asarray(style_line_labels)))
+
+    def copy(self):
+        # Independent copy of the weights and scaler, so a candidate can be trained while this model serves
+        model = StyleMatcherModel()
+        model.model = tf.keras.models.clone_model(self.model)
+        model.model.set_weights(self.model.get_weights())
+        # clone_model does not carry over the compiled state train() needs
+        model.model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
+        model.scaler = copy.deepcopy(self.scaler)
+        return model
+
+    @property
+    def num_features(self):
+        return int(self.model.input_shape[-1])
+
     def predict_style_line(self, user_preferences):
         # Normalize input
         user_preferences_scaled = self.scaler.transform(user_preferences.reshape(1, -1))
@@ -62,6 +97,14 @@ class StyleMatcherModel:
         # Return corresponding style line
         return StyleLines(predicted_index).name
 
+    def predict_style_probabilities(self, user_preferences):
+        # Accept a single preference row or a (batch_size, num_features) matrix
+        user_preferences_scaled = self.scaler.transform(np.atleast_2d(user_preferences))
+
+        # Call the model directly: predict() builds a tf.data pipeline per call,
+        # which dominates latency for the small batches seen while serving
+        return self.model(user_preferences_scaled, training=False).numpy()
+
     def save_model(self, filepath):
         # Save the keras model
         tf.keras.models.save_model(self.model, filepath)
@@ -69,6 +112,17 @@ class StyleMatcherModel:
         # Save the scaler
         joblib.dump(self.scaler, f"{filepath}_scaler.pkl")
 
+    def export_engine(self, filepath):
+        # Write a NumPy-only serving copy with the scaler folded into the first layer
+        StyleMatcherEngine.from_keras(self.model, self.scaler).save(filepath)
+
+    @classmethod
+    def from_saved(cls, filepath):
+        # Build a StyleMatcherModel around a saved Keras model and scaler
+        model = cls()
+        model.load_model(filepath)
+        return model
+
     def load_model(self, filepath):
         # Load the keras model
         self.model = tf.keras.models.load_model(filepath)
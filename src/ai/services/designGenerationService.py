@@ -1,30 +1,109 @@
+import hashlib
+import os
+from functools import partial
+from typing import TYPE_CHECKING
 import numpy as np
-from src.ai.models.designGeneratorModel import DesignGeneratorModel
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.ai.config import (
+    DESIGN_ENCODE_WORKERS, DESIGN_WARM_POOL_LOW_WATERMARK, DESIGN_WARM_POOL_HIGH_WATERMARK,
+    DESIGN_WARM_POOL_REFILL_BATCH_SIZE, DESIGN_SINGLE_FLIGHT_TIMEOUT_SECONDS, DESIGN_GENERATOR_COMPILED,
+    DESIGN_GENERATOR_BATCH_BUCKETS, DESIGN_GENERATOR_JIT_COMPILE, DESIGN_GENERATOR_QUANTIZED_PATH,
+    DESIGN_GENERATOR_TFLITE_THREADS
+)
 from src.shared.constants.index import StyleLines
+from src.ai.models.designGeneratorEngine import DesignGeneratorEngine, ENGINE_FILE_SUFFIX as GENERATOR_ENGINE_FILE_SUFFIX
+from src.ai.utils.modelRegistry import model_registry
+from src.ai.utils.tensorflowThreads import configure_tensorflow_threads
+from src.ai.utils.imageEncoding import encode_image, encode_image_base64, decode_image_base64, encoding_signature
+from src.ai.utils.productImageCache import product_image_cache, ProductImage
+from src.ai.utils.designCache import design_cache, design_cache_key
+from src.ai.utils.singleFlight import SingleFlight
+from src.ai.services.designWarmPool import DesignWarmPool
 from src.backend.utils.logger import logger
-from io import BytesIO
 from PIL import Image
-import base64
+
+if TYPE_CHECKING:
+    from src.ai.models.designGeneratorModel import DesignGeneratorModel
 
 class DesignGenerationService:
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, warm_pool: bool = False, load_model: bool = True, engine: str = 'keras'):
         """
         Initializes the DesignGenerationService
         
         Args:
             model_path (str): Path to the pre-trained DesignGeneratorModel
+            warm_pool (bool): Keep a background-refilled pool of ready designs per style line
+            load_model (bool): Load the model now; False defers it to first use, e.g. a background warmup
+            engine (str): 'keras' to serve the TensorFlow generator saved at model_path (a .keras file, with its
+                discriminator saved next to it), or 'numpy' to serve the exported
+                DesignGeneratorEngine artifact found at f"{model_path}{GENERATOR_ENGINE_FILE_SUFFIX}".
+                Variations of an uploaded design keep its style label, which Keras infers with the
+                discriminator and the NumPy engine from the closest prototype design, so the two
+                engines can disagree on the same image
+        """
+        self.model_path = model_path
+        self.engine = engine
+        if engine == 'numpy':
+            self.artifact_path = f"{model_path}{GENERATOR_ENGINE_FILE_SUFFIX}"
+            self._loader = DesignGeneratorEngine.load
+        elif engine == 'keras':
+            self.artifact_path = model_path
+            self._loader = _load_design_generator
+        else:
+            raise ValueError(f"Unknown design generator engine: {engine}")
+        self._encode_executor = ThreadPoolExecutor(max_workers=DESIGN_ENCODE_WORKERS, thread_name_prefix='design-encode')
+        self._single_flight = SingleFlight('design_single_flight', timeout=DESIGN_SINGLE_FLIGHT_TIMEOUT_SECONDS)
+
+        # Load eagerly so a missing or broken artifact fails at startup
+        if load_model:
+            model_registry.get(self.artifact_path, self._loader)
+            logger.info(f"DesignGeneratorModel loaded successfully from {model_path} using the {engine} engine")
+
+        self.warm_pool = None
+        if warm_pool:
+            self.warm_pool = DesignWarmPool(
+                self.generate_pool_designs,
+                [style.name for style in StyleLines],
+                low_watermark=DESIGN_WARM_POOL_LOW_WATERMARK,
+                high_watermark=DESIGN_WARM_POOL_HIGH_WATERMARK,
+                refill_batch_size=DESIGN_WARM_POOL_REFILL_BATCH_SIZE
+            )
+
+    @property
+    def model(self) -> 'DesignGeneratorModel':
+        """
+        The active generator, resolved through the shared model registry on each access
+        so hot-swapped versions are picked up without restarting the service.
+        """
+        return model_registry.get(self.artifact_path, self._loader)
+
+    def refresh_model(self) -> bool:
+        """
+        Hot-swaps in the model artifact if it changed on disk.
+
+        Returns:
+            bool: True if a new version was activated.
         """
-        self.model = DesignGeneratorModel()
-        self.model.load_model(model_path)
-        logger.info(f"DesignGeneratorModel loaded successfully from {model_path}")
+        refreshed = model_registry.refresh(self.artifact_path, self._loader)
+        if refreshed and self.warm_pool is not None:
+            # Pooled designs came from the previous version
+            self.warm_pool.clear()
+        return refreshed
 
-    def generate_design(self, user_input: dict, style_line: str) -> str:
+    def generate_design(self, user_input: dict, style_line: str, seed: int = None,
+                        image_format: str = None, image_quality: int = None) -> str:
         """
         Generates a custom design based on user input and style
         
+        A seeded design is fully determined by the model version, style line, processed
+        input and seed, so it is served from the design cache when it was generated before.
+        
         Args:
             user_input (dict): User preferences and inputs for design generation
             style_line (str): The style line for the design
+            seed (int): Seed of the noise vector, for reproducible and cacheable designs
+            image_format (str): Output format, see imageEncoding.IMAGE_FORMATS; defaults to the deployment's
+            image_quality (int): Compression level or quality for the output format
         
         Returns:
             str: Base64 encoded generated design image
@@ -33,50 +112,236 @@ class DesignGenerationService:
         if not self._validate_input(user_input, style_line):
             raise ValueError("Invalid user input or style line")
 
+        # Designs without user input depend only on the style line, so serve a pre-generated
+        # one; pooled designs use the deployment's default encoding
+        default_encoding = image_format is None and image_quality is None
+        if seed is None and not user_input and default_encoding and self.warm_pool is not None:
+            pooled_design = self.warm_pool.take(style_line)
+            if pooled_design is not None:
+                return pooled_design
+
         # Preprocess user input into model-compatible format
         processed_input = self._preprocess_input(user_input, style_line)
 
+        # Resolve the model and its version together so the cache key and the generating model agree during a hot swap
+        model_version, model = model_registry.get_versioned(self.artifact_path, self._loader)
+
+        cache_key = None
+        if seed is not None:
+            seed = int(seed)
+            cache_key = design_cache_key(
+                model_version, style_line, processed_input, seed, encoding_signature(image_format, image_quality)
+            )
+            cached_design = design_cache.get(cache_key)
+            if cached_design is not None:
+                return cached_design
+
+            # Identical seeded requests arriving together share one generation and encode
+            return self._single_flight.do(
+                ('generate', cache_key),
+                lambda: self._generate_and_cache(model, processed_input, seed, cache_key, image_format, image_quality)
+            )
+
+        return self._generate_encoded_design(model, processed_input, seed, image_format, image_quality)
+
+    def _generate_and_cache(self, model: 'DesignGeneratorModel', processed_input, seed: int, cache_key: str,
+                            image_format: str = None, image_quality: int = None) -> str:
+        # A call that finished just before this one started has already cached the design
+        design = design_cache.get(cache_key)
+        if design is None:
+            design = self._generate_encoded_design(model, processed_input, seed, image_format, image_quality)
+            design_cache.put(cache_key, design)
+        return design
+
+    def _generate_encoded_design(self, model: 'DesignGeneratorModel', processed_input, seed: int = None,
+                                 image_format: str = None, image_quality: int = None) -> str:
         # Generate noise vector for design generation
-        noise_vector = np.random.normal(0, 1, (1, self.model.latent_dim))
+        noise_vector = self._noise_vector(model.latent_dim, seed)
 
         # Use the DesignGeneratorModel to generate the design
-        generated_design = self.model.generate_design(processed_input, noise_vector)
+        generated_design = model.generate_design(processed_input, noise_vector)
 
         # Post-process the generated design
         post_processed_design = self._postprocess_design(generated_design)
 
         # Convert the design to a base64 encoded image
-        base64_image = self._image_to_base64(post_processed_design)
+        base64_image = self._image_to_base64(post_processed_design, image_format, image_quality)
 
         return base64_image
 
-    def apply_design_to_product(self, design_base64: str, product_image_path: str) -> str:
+    def generate_pool_designs(self, style_line: str, count: int) -> list:
+        """
+        Generates designs for the warm pool with one batched generator call
+        
+        Args:
+            style_line (str): The style line for the designs
+            count (int): Number of designs to generate
+        
+        Returns:
+            list: Base64 encoded generated design images
+        """
+        model = self.model
+        labels = np.full(count, StyleLines[style_line].value)
+        noise_matrix = np.random.normal(0, 1, (count, model.latent_dim))
+        designs = model.generate_designs(labels, noise_matrix)
+        return list(self._encode_executor.map(self._postprocess_and_encode, designs))
+
+    def warmup(self, batch_sizes=DESIGN_GENERATOR_BATCH_BUCKETS) -> None:
+        """
+        Runs dummy generations at every served batch size, then one design and one variation
+        through the same calls requests make, so lazily traced graphs and allocations are ready
+        before traffic
+        
+        Args:
+            batch_sizes (Sequence[int]): Generator batch sizes to warm up
+        """
+        model = self.model
+        for batch_size in batch_sizes:
+            model.generate_designs(np.zeros(batch_size, dtype=np.int32), np.zeros((batch_size, model.latent_dim)))
+        # Seeded, so the request is generated rather than taken from the warm pool
+        design = self.generate_design(None, StyleLines(0).name, seed=0)
+        self.generate_design_variations(design, min(DESIGN_ENCODE_WORKERS, max(batch_sizes, default=1)))
+        logger.info(f"DesignGenerationService warmed up for batch sizes {tuple(batch_sizes)}")
+
+    def apply_design_to_product(self, design_base64: str, product_image_path: str,
+                                image_format: str = None, image_quality: int = None) -> str:
         """
         Applies a generated design to a product image
         
         Args:
             design_base64 (str): Base64 encoded design image
             product_image_path (str): Path to the product image
+            image_format (str): Output format, see imageEncoding.IMAGE_FORMATS; defaults to the deployment's
+            image_quality (int): Compression level or quality for the output format
         
         Returns:
             str: Base64 encoded product image with applied design
         """
+        # Identical concurrent previews share one decode, composite and encode
+        key = (
+            'apply_base64', hashlib.sha256(design_base64.encode()).hexdigest(), os.path.abspath(product_image_path),
+            encoding_signature(image_format, image_quality)
+        )
+        return self._single_flight.do(
+            key, lambda: self._apply_design_base64(design_base64, product_image_path, image_format, image_quality)
+        )
+
+    def _apply_design_base64(self, design_base64: str, product_image_path: str,
+                             image_format: str = None, image_quality: int = None) -> str:
         # Decode the base64 design image
         design_image = self._base64_to_image(design_base64)
 
-        # Load the product image
-        product_image = Image.open(product_image_path)
-
-        # Resize and position the design on the product image
-        resized_design = self._resize_design(design_image, product_image.size)
-        position = self._calculate_design_position(product_image.size, resized_design.size)
-        product_image.paste(resized_design, position, resized_design)
+        product_image = self._apply_design_image(design_image, product_image_path)
 
         # Convert the result to base64 encoded image
-        result_base64 = self._image_to_base64(product_image)
+        result_base64 = self._image_to_base64(product_image, image_format, image_quality)
 
         return result_base64
 
+    def apply_design_to_product_image(self, design_image: Image.Image, product_image_path: str) -> Image.Image:
+        """
+        Applies a decoded design image to a product image
+        
+        Args:
+            design_image (Image.Image): Decoded design image
+            product_image_path (str): Path to the product image
+        
+        Returns:
+            Image.Image: Product image with applied design; shared between coalesced
+            callers, so treat it as read-only
+        """
+        design_digest = hashlib.sha256(design_image.tobytes()).hexdigest()
+        key = ('apply', design_digest, design_image.mode, design_image.size, os.path.abspath(product_image_path))
+        return self._single_flight.do(key, lambda: self._apply_design_image(design_image, product_image_path))
+
+    def _apply_design_image(self, design_image: Image.Image, product_image_path: str) -> Image.Image:
+        # Decoded product images and their placement are cached; draw on a copy
+        product = product_image_cache.get(product_image_path)
+        product_image = product.image.copy()
+
+        # Resize and position the design within the product's design box
+        resized_design = self._resize_design(design_image, product.design_box_size)
+        position = self._calculate_design_position(product.design_box, resized_design.size)
+        product_image.paste(resized_design, position, self._design_paste_mask(resized_design, product, position))
+
+        return product_image
+
+    def apply_design_to_products(self, design_image: Image.Image, product_image_paths: list, binary: bool = False,
+                                 image_format: str = None, image_quality: int = None):
+        """
+        Applies one design to many product images, yielding each result as soon as it is encoded
+        
+        The design is resized once per distinct design box size, and all products sharing
+        that size are alpha-composited together with batched NumPy arithmetic. Product
+        images are loaded eagerly, so a missing product raises before anything is yielded.
+        
+        Args:
+            design_image (Image.Image): Decoded design image
+            product_image_paths (list): Paths to the product images
+            binary (bool): Yield encoded buffers instead of base64 strings, for binary responses
+            image_format (str): Output format, see imageEncoding.IMAGE_FORMATS; defaults to the deployment's
+            image_quality (int): Compression level or quality for the output format
+        
+        Returns:
+            Iterator[tuple]: (index into product_image_paths, encoded product image), in completion order
+        """
+        products = [product_image_cache.get(path) for path in product_image_paths]
+        encode = partial(encode_image if binary else encode_image_base64, image_format=image_format, quality=image_quality)
+        return self._composite_and_encode(design_image, products, encode)
+
+    def _composite_and_encode(self, design_image: Image.Image, products: list, encode):
+        groups = {}
+        for index, product in enumerate(products):
+            groups.setdefault(product.design_box_size, []).append(index)
+
+        # Encodes run on the pool while the next size group is composited
+        futures = {}
+        for box_size, indices in groups.items():
+            resized_design = self._resize_design(design_image, box_size)
+            composited = self._composite_design_batch(resized_design, [products[i] for i in indices])
+            for index, image in zip(indices, composited):
+                futures[self._encode_executor.submit(encode, image)] = index
+
+        for future in as_completed(futures):
+            yield futures.pop(future), future.result()
+
+    def _composite_design_batch(self, design: Image.Image, products: list) -> list:
+        # All products share the design box size, so the design lands at the same offset in each box
+        pixels = np.asarray(design, dtype=np.float32)
+        design_rgb, design_alpha = pixels[..., :3], pixels[..., 3] / 255.0
+        height, width = design_alpha.shape
+        positions = [self._calculate_design_position(product.design_box, design.size) for product in products]
+
+        alphas = np.stack([
+            product.print_mask[y - product.design_box[1]:y - product.design_box[1] + height,
+                               x - product.design_box[0]:x - product.design_box[0] + width]
+            for product, (x, y) in zip(products, positions)
+        ]) * design_alpha
+        # Only the design regions go through NumPy; the rest of each product is copied by PIL
+        crops = [
+            np.asarray(product.image.crop((x, y, x + width, y + height)))
+            for product, (x, y) in zip(products, positions)
+        ]
+        regions = np.stack([crop[..., :3] for crop in crops]).astype(np.float32)
+
+        # out = product + (design - product) * alpha, for every product at once, in place
+        blend = np.subtract(design_rgb, regions)
+        blend *= alphas[..., np.newaxis]
+        regions += blend
+        blended = np.rint(regions, out=regions).astype(np.uint8)
+
+        results = []
+        for product, crop, region, alpha, position in zip(products, crops, blended, alphas, positions):
+            if crop.shape[-1] == 4:
+                # Blend the alpha channel like the RGB ones, as Image.paste does for a single product
+                product_alpha = crop[..., 3].astype(np.float32)
+                region_alpha = np.rint(product_alpha + (pixels[..., 3] - product_alpha) * alpha).astype(np.uint8)
+                region = np.dstack([region, region_alpha])
+            result = product.image.copy()
+            result.paste(Image.fromarray(region), position)
+            results.append(result)
+        return results
+
     def generate_design_variations(self, initial_design_base64: str, num_variations: int) -> list:
         """
         Generates variations of a design based on an initial design
@@ -88,52 +353,148 @@ class DesignGenerationService:
         Returns:
             list: List of base64 encoded design variation images
         """
+        return [variation for _, variation in self.iter_design_variations(initial_design_base64, num_variations)]
+
+    def iter_design_variations(self, initial_design_base64: str, num_variations: int, chunk_size: int = None):
+        """
+        Generates variations of a design, yielding each one as soon as it is encoded
+        
+        The initial design is decoded and analysed eagerly, so invalid input raises
+        here rather than after a streaming response has started.
+        
+        Args:
+            initial_design_base64 (str): Base64 encoded initial design image
+            num_variations (int): Number of variations to generate
+            chunk_size (int): Variations generated per generator call; bounds how many raw and
+                encoded images are held at once. Defaults to all variations in one call.
+        
+        Returns:
+            Iterator[tuple]: (index, base64 encoded design variation image), in index order
+        """
         # Decode the initial design from base64
         initial_design = self._base64_to_image(initial_design_base64)
 
+        return self.iter_design_variations_from_image(initial_design, num_variations, chunk_size)
+
+    def iter_design_variations_from_image(self, initial_design: Image.Image, num_variations: int,
+                                          chunk_size: int = None, binary: bool = False,
+                                          image_format: str = None, image_quality: int = None):
+        """
+        Generates variations of an already decoded design, yielding each one as soon as it is encoded
+        
+        Args:
+            initial_design (Image.Image): Decoded initial design image
+            num_variations (int): Number of variations to generate
+            chunk_size (int): Variations generated per generator call. Defaults to all variations in one call.
+            binary (bool): Yield encoded buffers instead of base64 strings, for binary responses
+            image_format (str): Output format, see imageEncoding.IMAGE_FORMATS; defaults to the deployment's
+            image_quality (int): Compression level or quality for the output format
+        
+        Returns:
+            Iterator[tuple]: (index, encoded design variation image), in index order
+        """
+        if num_variations is None or num_variations < 1:
+            raise ValueError("num_variations must be at least 1")
+
         # Extract features from the initial design
-        initial_features = self.model.extract_features(initial_design)
+        model = self.model
+        initial_features = model.extract_features(initial_design)
+
+        encode = partial(
+            self._postprocess_and_encode_binary if binary else self._postprocess_and_encode,
+            image_format=image_format, image_quality=image_quality
+        )
+        return self._generate_variations(model, initial_features, num_variations, chunk_size or num_variations, encode)
+
+    def _generate_variations(self, model: 'DesignGeneratorModel', initial_features, num_variations: int,
+                             chunk_size: int, encode):
+        for start in range(0, num_variations, chunk_size):
+            # Generate the chunk with one generator call on a (chunk, latent_dim) noise matrix
+            noise_matrix = np.random.normal(0, 1, (min(chunk_size, num_variations - start), model.latent_dim))
+            variations = model.generate_variation(initial_features, noise_matrix)
 
-        variations = []
-        for _ in range(num_variations):
-            # Generate noise vector for variation
-            noise_vector = np.random.normal(0, 1, (1, self.model.latent_dim))
+            # Post-process and encode each variation in parallel; PIL releases
+            # the GIL while resampling and compressing, so the encodes overlap
+            futures = [self._encode_executor.submit(encode, variation) for variation in variations]
+            for offset, future in enumerate(futures):
+                yield start + offset, future.result()
+                # Drop the encoded image once it has been handed to the caller
+                futures[offset] = None
 
-            # Use the DesignGeneratorModel to create variation
-            variation = self.model.generate_variation(initial_features, noise_vector)
+    def _postprocess_and_encode(self, design: np.ndarray, image_format: str = None, image_quality: int = None) -> str:
+        return self._image_to_base64(self._postprocess_design(design), image_format, image_quality)
 
-            # Post-process and convert variation to base64
-            processed_variation = self._postprocess_design(variation)
-            variation_base64 = self._image_to_base64(processed_variation)
-            variations.append(variation_base64)
+    def _postprocess_and_encode_binary(self, design: np.ndarray, image_format: str = None, image_quality: int = None):
+        return encode_image(self._postprocess_design(design), image_format, image_quality)
 
-        return variations
+    def _noise_vector(self, latent_dim: int, seed: int = None) -> np.ndarray:
+        # generate_design adds the batch axis itself
+        if seed is None:
+            return np.random.normal(0, 1, latent_dim)
+        return np.random.default_rng(seed).standard_normal(latent_dim)
 
     def _validate_input(self, user_input: dict, style_line: str) -> bool:
-        # Implement input validation logic
-        pass
+        # The generator is conditioned on the style line; user input is optional
+        return style_line in StyleLines.__members__ and (user_input is None or isinstance(user_input, dict))
 
-    def _preprocess_input(self, user_input: dict, style_line: str) -> np.ndarray:
-        # Implement input preprocessing logic
-        pass
+    def _preprocess_input(self, user_input: dict, style_line: str) -> int:
+        # The generator's only conditioning input is the style line's class label
+        return StyleLines[style_line].value
 
     def _postprocess_design(self, design: np.ndarray) -> Image.Image:
-        # Implement design postprocessing logic
-        pass
+        # Generator output is in [0, 1]; convert to an 8-bit image
+        return Image.fromarray((np.clip(design, 0.0, 1.0) * 255).astype(np.uint8))
 
-    def _image_to_base64(self, image: Image.Image) -> str:
-        buffered = BytesIO()
-        image.save(buffered, format="PNG")
-        return base64.b64encode(buffered.getvalue()).decode()
+    def _image_to_base64(self, image: Image.Image, image_format: str = None, image_quality: int = None) -> str:
+        return encode_image_base64(image, image_format, image_quality)
 
     def _base64_to_image(self, base64_string: str) -> Image.Image:
-        image_data = base64.b64decode(base64_string)
-        return Image.open(BytesIO(image_data))
+        return decode_image_base64(base64_string)
+
+    def _resize_design(self, design: Image.Image, box_size: tuple) -> Image.Image:
+        # Fit the design inside the design box, keeping its aspect ratio
+        scale = min(box_size[0] / design.width, box_size[1] / design.height)
+        size = (max(1, round(design.width * scale)), max(1, round(design.height * scale)))
+        return design.convert('RGBA').resize(size, Image.LANCZOS)
+
+    def _calculate_design_position(self, design_box: tuple, design_size: tuple) -> tuple:
+        # Centre the design in the design box
+        left, top, right, bottom = design_box
+        return left + (right - left - design_size[0]) // 2, top + (bottom - top - design_size[1]) // 2
+
+    def _design_paste_mask(self, design: Image.Image, product: ProductImage, position: tuple) -> Image.Image:
+        # Combine the design's alpha with the product's print-area mask
+        x, y = position[0] - product.design_box[0], position[1] - product.design_box[1]
+        print_mask = product.print_mask[y:y + design.height, x:x + design.width]
+        alpha = np.asarray(design.getchannel('A'), dtype=np.float32) * print_mask
+        return Image.fromarray(alpha.astype(np.uint8))
+
+
+def _load_design_generator(model_path: str, quantized_path: str = DESIGN_GENERATOR_QUANTIZED_PATH,
+                           compiled: bool = DESIGN_GENERATOR_COMPILED) -> 'DesignGeneratorModel':
+    # Imported here so importing the service (and the app) does not load TensorFlow
+    configure_tensorflow_threads()
+    from src.ai.models.designGeneratorModel import DesignGeneratorModel
+    from src.ai.models.compiledDesignGenerator import CompiledDesignGenerator
+    from src.ai.models.quantizedDesignGenerator import QuantizedDesignGenerator
+
+    # The generator is saved at model_path and the discriminator next to it (see discriminator_path_for)
+    model = DesignGeneratorModel.from_saved(model_path)
+
+    if quantized_path:
+        quantized = QuantizedDesignGenerator(
+            quantized_path, feature_model=model,
+            batch_buckets=DESIGN_GENERATOR_BATCH_BUCKETS, num_threads=DESIGN_GENERATOR_TFLITE_THREADS
+        )
+        quantized.warmup()
+        # Only the discriminator is still needed, for extract_features; free the float generator
+        model.generator = None
+        return quantized
 
-    def _resize_design(self, design: Image.Image, product_size: tuple) -> Image.Image:
-        # Implement design resizing logic
-        pass
+    if not compiled:
+        return model
 
-    def _calculate_design_position(self, product_size: tuple, design_size: tuple) -> tuple:
-        # Implement logic to calculate design position on product
-        pass
\ No newline at end of file
+    # Warm every bucket before the registry makes this version visible to requests
+    compiled_model = CompiledDesignGenerator(model, DESIGN_GENERATOR_BATCH_BUCKETS, jit_compile=DESIGN_GENERATOR_JIT_COMPILE)
+    compiled_model.warmup()
+    return compiled_model
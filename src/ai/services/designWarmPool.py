@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Iterable, List, Optional
+from src.ai.utils.metrics import metrics
+from src.backend.utils.logger import logger
+
+
+class DesignWarmPool:
+    def __init__(self, produce_fn: Callable[[str, int], List[Any]], style_lines: Iterable[str],
+                 low_watermark: int = 8, high_watermark: int = 32, refill_batch_size: int = 8,
+                 name: str = 'design_warm_pool'):
+        """
+        Bounded per-style-line pools of ready-to-serve designs, refilled by a background thread.
+
+        Taking a design that drops a pool below low_watermark wakes the producer, which
+        refills that pool up to high_watermark in batches of refill_batch_size, so the
+        generator runs in large batches off the request path.
+
+        Args:
+            produce_fn (Callable): Function mapping (style_line, count) to a list of count encoded designs.
+            style_lines (Iterable[str]): Style lines to keep pools for.
+            low_watermark (int): Pool depth below which a refill is triggered.
+            high_watermark (int): Pool depth a refill stops at.
+            refill_batch_size (int): Designs produced per produce_fn call.
+            name (str): Name of the producer thread and of the exported stats.
+        """
+        if not 0 <= low_watermark < high_watermark:
+            raise ValueError("Watermarks must satisfy 0 <= low_watermark < high_watermark")
+
+        self.produce_fn = produce_fn
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.refill_batch_size = max(1, refill_batch_size)
+        self._pools = {style_line: deque() for style_line in style_lines}
+        # Pools currently being refilled up to the high watermark; all of them at startup
+        self._refilling = set(self._pools)
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self.served = 0
+        self.misses = 0
+        self.produced = 0
+        self.discarded = 0
+        self.refill_seconds = 0.0
+        self.refill_errors = 0
+        self._generation = 0
+
+        metrics.register_collector(name, self.stats)
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def take(self, style_line: str) -> Optional[Any]:
+        """
+        Pops a ready design for a style line.
+
+        Returns:
+            Optional[Any]: An encoded design, or None if the pool is empty and the caller
+            should generate one itself.
+        """
+        with self._condition:
+            pool = self._pools.get(style_line)
+            if not pool:
+                self.misses += 1
+                self._condition.notify()
+                return None
+
+            design = pool.popleft()
+            self.served += 1
+            if len(pool) < self.low_watermark:
+                self._condition.notify()
+            return design
+
+    def clear(self) -> None:
+        """
+        Drops all pooled designs, e.g. after a new model version is activated. Batches
+        being produced at the time are discarded rather than added to the pools.
+        """
+        with self._condition:
+            for pool in self._pools.values():
+                self.discarded += len(pool)
+                pool.clear()
+            self._generation += 1
+            self._condition.notify()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._worker.join()
+
+    def stats(self) -> dict:
+        with self._condition:
+            lookups = self.served + self.misses
+            return {
+                'depth': {style_line: len(pool) for style_line, pool in self._pools.items()},
+                'low_watermark': self.low_watermark,
+                'high_watermark': self.high_watermark,
+                'served': self.served,
+                'misses': self.misses,
+                'hit_ratio': self.served / lookups if lookups else 0.0,
+                'produced': self.produced,
+                'discarded': self.discarded,
+                'refill_errors': self.refill_errors,
+                'refill_rate_per_second': self.produced / self.refill_seconds if self.refill_seconds else 0.0
+            }
+
+    def _next_refill(self) -> Optional[tuple]:
+        # Refill the emptiest pool first; a pool that started refilling continues up to the
+        # high watermark, since it is only picked once it has fallen below the low one
+        candidates = [
+            (len(pool), style_line) for style_line, pool in self._pools.items()
+            if len(pool) < self.low_watermark or (style_line in self._refilling and len(pool) < self.high_watermark)
+        ]
+        if not candidates:
+            return None
+        depth, style_line = min(candidates)
+        return style_line, min(self.refill_batch_size, self.high_watermark - depth)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                refill = self._next_refill()
+                while refill is None and not self._closed:
+                    self._condition.wait()
+                    refill = self._next_refill()
+                if self._closed:
+                    return
+                style_line, count = refill
+                self._refilling.add(style_line)
+                generation = self._generation
+
+            start = time.perf_counter()
+            try:
+                designs = self.produce_fn(style_line, count)
+            except Exception as e:
+                logger.error(f"Error refilling design warm pool for {style_line}: {str(e)}")
+                with self._condition:
+                    self.refill_errors += 1
+                    self._refilling.discard(style_line)
+                    # Back off so a broken model does not spin the producer
+                    self._condition.wait(1.0)
+                continue
+            elapsed = time.perf_counter() - start
+
+            with self._condition:
+                self.refill_seconds += elapsed
+                self.produced += len(designs)
+                pool = self._pools[style_line]
+                if generation != self._generation:
+                    self.discarded += len(designs)
+                else:
+                    pool.extend(designs[:self.high_watermark - len(pool)])
+                if len(pool) >= self.high_watermark:
+                    self._refilling.discard(style_line)
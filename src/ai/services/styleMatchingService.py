@@ -1,20 +1,102 @@
+import os
 import numpy as np
-import pandas as pd
-from src.ai.models.styleMatcherModel import StyleMatcherModel
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Optional
+from src.ai.config import (
+    STYLE_MATCH_FINE_TUNE_EPOCHS, STYLE_MATCH_FINE_TUNE_LEARNING_RATE, STYLE_MATCH_FINE_TUNE_VALIDATION_SPLIT,
+    STYLE_MATCH_FINE_TUNE_MAX_ACCURACY_DROP
+)
+from src.ai.models.styleMatcherEngine import StyleMatcherEngine, ENGINE_FILE_SUFFIX, STYLE_LINE_NAMES
 from src.shared.constants.index import StyleLines
+from src.ai.utils.modelRegistry import model_registry, artifact_version
+from src.ai.utils.preferenceVectorizer import PreferenceVectorizer, VECTORIZER_FILE_SUFFIX
+from src.ai.utils.recommendationCache import RecommendationCache
+from src.ai.utils.tensorflowThreads import configure_tensorflow_threads
 from src.backend.utils.logger import logger
 
+if TYPE_CHECKING:
+    import pandas as pd
+    from src.ai.models.styleMatcherModel import StyleMatcherModel
+
 class StyleMatchingService:
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, engine: str = 'keras', load_model: bool = True,
+                 result_cache: RecommendationCache = None):
         """
         Initializes the StyleMatchingService.
 
         Args:
             model_path (str): Path to the pre-trained StyleMatcherModel.
+            engine (str): 'keras' to serve the TensorFlow model, or 'numpy' to serve the
+                exported StyleMatcherEngine weights found at f"{model_path}{ENGINE_FILE_SUFFIX}".
+            load_model (bool): Load the model now; False defers it to first use, e.g. a background warmup.
+            result_cache (RecommendationCache): Cache of single-user style probabilities, or None.
+
+        Requests are vectorized with the PreferenceVectorizer saved at
+        f"{model_path}{VECTORIZER_FILE_SUFFIX}" when the model was trained with one.
+        """
+        self.model_path = model_path
+        self.engine = engine
+        self.vectorizer_path = f"{model_path}{VECTORIZER_FILE_SUFFIX}"
+        self.result_cache = result_cache
+        if engine == 'numpy':
+            self.artifact_path = f"{model_path}{ENGINE_FILE_SUFFIX}"
+            self._loader = StyleMatcherEngine.load
+        elif engine == 'keras':
+            self.artifact_path = model_path
+            self._loader = _load_keras_style_matcher
+        else:
+            raise ValueError(f"Unknown style matcher engine: {engine}")
+
+        # Incremental updates run one at a time, off the request threads
+        self._update_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='style-matcher-update')
+
+        # Load eagerly so a missing or broken artifact fails at startup
+        if load_model:
+            model_registry.get(self.artifact_path, self._loader)
+            self.vectorizer  # A broken vectorizer schema fails at startup too
+            logger.info(f"StyleMatcherModel loaded successfully from {model_path} using the {engine} engine")
+
+    @property
+    def model(self):
+        """
+        The active model, resolved through the shared model registry on each access
+        so hot-swapped versions are picked up without restarting the service.
+        """
+        return model_registry.get(self.artifact_path, self._loader)
+
+    @property
+    def vectorizer(self) -> Optional[PreferenceVectorizer]:
+        """
+        The preprocessing pipeline fitted with the model, or None for models trained
+        without one, whose requests are used in key order.
+        """
+        if not os.path.exists(self.vectorizer_path):
+            return None
+        return model_registry.get(self.vectorizer_path, PreferenceVectorizer.load)
+
+    def refresh_model(self) -> bool:
+        """
+        Hot-swaps in the model artifact and its vectorizer if they changed on disk.
+
+        Returns:
+            bool: True if a new version was activated.
+        """
+        refreshed_vectorizer = model_registry.refresh(self.vectorizer_path, PreferenceVectorizer.load)
+        return model_registry.refresh(self.artifact_path, self._loader) or refreshed_vectorizer
+
+    def warmup(self, batch_sizes) -> None:
+        """
+        Runs dummy predictions at every served batch size so the first requests do not
+        pay for lazy allocation in the model.
+
+        Args:
+            batch_sizes (Sequence[int]): Batch sizes to warm up.
         """
-        self.model = StyleMatcherModel()
-        self.model.load_model(model_path)
-        logger.info(f"StyleMatcherModel loaded successfully from {model_path}")
+        model = self.model
+        for batch_size in batch_sizes:
+            style_probabilities = model.predict_style_probabilities(np.zeros((batch_size, model.num_features), dtype=np.float32))
+            self._top_n_indices(style_probabilities, len(StyleLines))
+        logger.info(f"StyleMatchingService warmed up for batch sizes {tuple(batch_sizes)}")
 
     def match_style(self, user_preferences: dict) -> str:
         """
@@ -28,7 +110,7 @@ class StyleMatchingService:
         """
         try:
             # Preprocess user preferences into a numpy array
-            preferences_array = np.array(list(user_preferences.values())).reshape(1, -1)
+            preferences_array = self._preferences_to_array(user_preferences)
             
             # Use the StyleMatcherModel to predict the style line
             predicted_style = self.model.predict_style_line(preferences_array)
@@ -51,53 +133,334 @@ class StyleMatchingService:
         """
         try:
             # Preprocess user preferences into a numpy array
-            preferences_array = np.array(list(user_preferences.values())).reshape(1, -1)
+            preferences_array = self._preferences_to_array(user_preferences)
             
             # Use the StyleMatcherModel to predict style line probabilities
             style_probabilities = self.model.predict_style_probabilities(preferences_array)
             
-            # Sort style lines by probability scores
-            style_recommendations = sorted(
-                zip(StyleLines, style_probabilities[0]),
-                key=lambda x: x[1],
-                reverse=True
-            )
-            
             # Return top N recommendations with scores
-            return style_recommendations[:num_recommendations]
+            return self.rank_style_probabilities(style_probabilities[0], num_recommendations)
         except Exception as e:
             logger.error(f"Error in get_style_recommendations: {str(e)}")
             raise
 
-    def update_user_preferences(self, new_preferences: pd.DataFrame, new_style_lines: pd.DataFrame) -> None:
+    def predict_style_probabilities_batch(self, preferences_batch: list) -> np.ndarray:
+        """
+        Predicts style line probabilities for a batch of users in one forward pass.
+
+        Args:
+            preferences_batch (list): List of user style preference dicts.
+
+        Returns:
+            np.ndarray: Array of shape (len(preferences_batch), len(StyleLines)).
+        """
+        try:
+            preferences_matrix = self._preferences_batch_to_matrix(preferences_batch)
+            return self.model.predict_style_probabilities(preferences_matrix)
+        except Exception as e:
+            logger.error(f"Error in predict_style_probabilities_batch: {str(e)}")
+            raise
+
+    def match_styles_batch(self, preferences_batch, num_recommendations: int, chunk_size: int = 4096) -> list:
         """
-        Updates the style matching model with new user preference data.
+        Matches style lines and generates recommendations for many users at once.
+
+        Args:
+            preferences_batch (list | dict): List of user preference dicts, or a columnar
+                dict mapping each preference name to a list of values (one per user).
+            num_recommendations (int): Number of recommendations to return per user.
+            chunk_size (int): Maximum number of rows per forward pass, bounding peak memory.
+
+        Returns:
+            list: One {'matched_style', 'recommendations'} dict per input row, in input order.
+        """
+        try:
+            if chunk_size < 1:
+                raise ValueError("chunk_size must be at least 1")
+
+            preferences_matrix = self._preferences_batch_to_matrix(preferences_batch)
+            num_recommendations = max(0, min(num_recommendations, len(StyleLines)))
+
+            results = []
+            for start in range(0, len(preferences_matrix), chunk_size):
+                style_probabilities = self.model.predict_style_probabilities(preferences_matrix[start:start + chunk_size])
+                top_indices = self._top_n_indices(style_probabilities, num_recommendations)
+                top_scores = np.take_along_axis(style_probabilities, top_indices, axis=1)
+                matched_indices = np.argmax(style_probabilities, axis=1)
+
+                for matched_index, indices, scores in zip(matched_indices, top_indices.tolist(), top_scores.tolist()):
+                    results.append({
+                        'matched_style': STYLE_LINE_NAMES[matched_index],
+                        'recommendations': [(STYLE_LINE_NAMES[i], score) for i, score in zip(indices, scores)]
+                    })
+
+            logger.info(f"Matched styles for {len(results)} users in batch")
+            return results
+        except Exception as e:
+            logger.error(f"Error in match_styles_batch: {str(e)}")
+            raise
+
+    def match_style_with_recommendations(self, user_preferences: dict, num_recommendations: int) -> tuple:
+        """
+        Matches a style line and generates recommendations from a single forward pass.
+
+        Args:
+            user_preferences (dict): User's style preferences.
+            num_recommendations (int): Number of recommendations to return.
+
+        Returns:
+            tuple: Matched style line and the list of top N (style line, score) pairs.
+        """
+        try:
+            style_probabilities = self.style_probabilities(user_preferences)
+            return self.styles_from_probabilities(style_probabilities, num_recommendations)
+        except Exception as e:
+            logger.error(f"Error in match_style_with_recommendations: {str(e)}")
+            raise
+
+    def style_probabilities(self, user_preferences: dict, predict: Callable[[dict], np.ndarray] = None) -> np.ndarray:
+        """
+        Predicts one user's style line probabilities, from the result cache when it holds them.
+
+        Args:
+            user_preferences (dict): User's style preferences.
+            predict (Callable): Computes the probabilities from user_preferences on a cache
+                miss, e.g. MicroBatcher.submit; defaults to a forward pass of the model.
+
+        Returns:
+            np.ndarray: Probability vector of length len(StyleLines).
+        """
+        preferences_array = self._preferences_to_array(user_preferences)
+
+        def compute() -> np.ndarray:
+            if predict is not None:
+                return predict(user_preferences)
+            return self.model.predict_style_probabilities(preferences_array)[0]
+
+        if self.result_cache is None:
+            return compute()
+        model_version = model_registry.active_version(self.artifact_path)
+        return self.result_cache.get_or_compute(preferences_array, model_version, compute)
+
+    def styles_from_probabilities(self, style_probabilities: np.ndarray, num_recommendations: int) -> tuple:
+        """
+        Derives the matched style line and recommendations from one probability vector.
+
+        Args:
+            style_probabilities (np.ndarray): Probability vector of length len(StyleLines).
+            num_recommendations (int): Number of recommendations to return.
+
+        Returns:
+            tuple: Matched style line and the list of top N (style line, score) pairs.
+        """
+        matched_style = STYLE_LINE_NAMES[int(np.argmax(style_probabilities))]
+        return matched_style, self.rank_style_probabilities(style_probabilities, num_recommendations)
+
+    def rank_style_probabilities(self, style_probabilities: np.ndarray, num_recommendations: int) -> list:
+        """
+        Ranks style lines by their predicted probability for a single user.
+
+        Args:
+            style_probabilities (np.ndarray): Probability vector of length len(StyleLines).
+            num_recommendations (int): Number of recommendations to return.
+
+        Returns:
+            list: Top N (style line, score) pairs, highest score first.
+        """
+        num_recommendations = max(0, min(num_recommendations, len(style_probabilities)))
+        top_indices = self._top_n_indices(style_probabilities[np.newaxis, :], num_recommendations)[0]
+        return [(STYLE_LINE_NAMES[i], float(style_probabilities[i])) for i in top_indices]
+
+    def _top_n_indices(self, style_probabilities: np.ndarray, num_recommendations: int) -> np.ndarray:
+        if num_recommendations <= 0:
+            return np.empty((len(style_probabilities), 0), dtype=np.intp)
+
+        # Partial selection of the top N per row, then order only those N
+        top_indices = np.argpartition(-style_probabilities, num_recommendations - 1, axis=1)[:, :num_recommendations]
+        top_scores = np.take_along_axis(style_probabilities, top_indices, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        return np.take_along_axis(top_indices, order, axis=1)
+
+    def _preferences_to_array(self, user_preferences: dict) -> np.ndarray:
+        vectorizer = self.vectorizer
+        if vectorizer is not None:
+            return vectorizer.transform(user_preferences)
+        return np.array(list(user_preferences.values())).reshape(1, -1)
+
+    def _preferences_batch_to_matrix(self, preferences_batch) -> np.ndarray:
+        vectorizer = self.vectorizer
+        # Columnar payload: {preference_name: [value_per_user, ...]}
+        if isinstance(preferences_batch, dict):
+            if vectorizer is not None:
+                return vectorizer.transform_columns(preferences_batch)
+            # Without a vectorizer features follow key order, which a columnar payload shares across rows
+            columns = [np.asarray(values, dtype=np.float32) for values in preferences_batch.values()]
+            if len({len(column) for column in columns}) > 1:
+                raise ValueError("All preference columns must have the same length")
+            return np.column_stack(columns)
+
+        if len(preferences_batch) == 0:
+            raise ValueError("preferences_batch must not be empty")
+
+        if vectorizer is not None:
+            return vectorizer.transform_batch(preferences_batch)
+
+        # List of dicts: each row in its own key order, exactly as _preferences_to_array reads one request
+        keys = preferences_batch[0].keys()
+        if any(row.keys() != keys for row in preferences_batch):
+            raise ValueError("All preference rows must have the same preference names")
+        return np.array([list(row.values()) for row in preferences_batch], dtype=np.float32)
+
+    def update_user_preferences(self, new_preferences: 'pd.DataFrame', new_style_lines: 'pd.DataFrame') -> Future:
+        """
+        Retrains the style matching model with new user preference data in the background.
+
+        Unlike fine_tune_user_preferences this is a full retrain, refitting the scaler, but
+        it runs on a copy of the active model, which keeps serving until the retrained copy
+        is hot-swapped in through the model registry.
 
         Args:
             new_preferences (pd.DataFrame): New user preference data.
             new_style_lines (pd.DataFrame): Corresponding style lines for the new preferences.
 
         Returns:
-            None
+            Future: Resolves to the activated version, or None if another update or a refresh
+            replaced the model while this one trained.
         """
         try:
+            if self.engine != 'keras':
+                raise RuntimeError("update_user_preferences requires the keras engine")
+
             # Validate input data
             if len(new_preferences) != len(new_style_lines):
                 raise ValueError("new_preferences and new_style_lines must have the same length")
 
-            # Preprocess new preference data
-            X = new_preferences.values
-            y = new_style_lines.values.ravel()
+            # Preprocess new preference data the way serving does, on the caller's thread
+            X, y = self._training_arrays(new_preferences, new_style_lines)
+            return self._update_executor.submit(self._retrain, X, y)
+        except Exception as e:
+            logger.error(f"Error in update_user_preferences: {str(e)}")
+            raise
 
-            # Retrain the StyleMatcherModel with new data
-            self.model.train(X, y)
+    def _retrain(self, X: np.ndarray, y: np.ndarray) -> Optional[str]:
+        try:
+            version = model_registry.active_version(self.artifact_path)
+            candidate = self.model.copy()
+            candidate.train(X, y)
+            logger.info(f"StyleMatcherModel retrained with {len(X)} new data points")
+            return self._activate_candidate(candidate, version)
+        except Exception as e:
+            logger.error(f"Error in _retrain: {str(e)}")
+            raise
+
+    def _activate_candidate(self, candidate: 'StyleMatcherModel', version: str) -> Optional[str]:
+        if model_registry.active_version(self.artifact_path) != version:
+            # Another update or a refresh swapped the model while this one trained
+            logger.warning(f"Discarded StyleMatcherModel update: version {version} is no longer active")
+            return None
+
+        # Save the updated model and register it under the new artifact version
+        candidate.save_model(self.model_path)
+        new_version = artifact_version(self.artifact_path)
+        model_registry.activate(self.artifact_path, new_version, model=candidate)
+        logger.info(f"Updated StyleMatcherModel saved to {self.model_path} as version {new_version}")
+        return new_version
+
+    def fine_tune_user_preferences(self, new_preferences: 'pd.DataFrame', new_style_lines: 'pd.DataFrame',
+                                   validation_preferences: 'pd.DataFrame' = None,
+                                   validation_style_lines: 'pd.DataFrame' = None,
+                                   epochs: int = STYLE_MATCH_FINE_TUNE_EPOCHS,
+                                   learning_rate: float = STYLE_MATCH_FINE_TUNE_LEARNING_RATE) -> Future:
+        """
+        Incrementally updates the style matching model in the background.
+
+        A copy of the active model is fine-tuned from its current weights, with streaming
+        scaler statistics, while the active model keeps serving. The candidate is hot-swapped
+        in through the model registry only if its validation accuracy does not regress by
+        more than STYLE_MATCH_FINE_TUNE_MAX_ACCURACY_DROP against the active model on the
+        same rows; otherwise it is discarded and the active model stays in place.
 
-            # Log the model update process
-            logger.info(f"StyleMatcherModel updated with {len(new_preferences)} new data points")
+        Args:
+            new_preferences (pd.DataFrame): New user preference data.
+            new_style_lines (pd.DataFrame): Corresponding style lines for the new preferences.
+            validation_preferences (pd.DataFrame): Validation preferences; defaults to a
+                STYLE_MATCH_FINE_TUNE_VALIDATION_SPLIT holdout of the new data.
+            validation_style_lines (pd.DataFrame): Corresponding style lines for the validation preferences.
+            epochs (int): Fine-tuning epochs.
+            learning_rate (float): Fine-tuning learning rate.
 
-            # Save the updated model
-            self.model.save_model(self.model.model_path)
-            logger.info(f"Updated StyleMatcherModel saved to {self.model.model_path}")
+        Returns:
+            Future: Resolves to a dict with 'activated', 'version', 'baseline_accuracy' and 'candidate_accuracy'.
+        """
+        try:
+            if self.engine != 'keras':
+                raise RuntimeError("fine_tune_user_preferences requires the keras engine")
+            if len(new_preferences) != len(new_style_lines):
+                raise ValueError("new_preferences and new_style_lines must have the same length")
+
+            # Vectorize on the caller's thread, so bad input raises here rather than in the future
+            X, y = self._training_arrays(new_preferences, new_style_lines)
+            if validation_preferences is not None:
+                X_val, y_val = self._training_arrays(validation_preferences, validation_style_lines)
+            else:
+                X, y, X_val, y_val = self._holdout_split(X, y, STYLE_MATCH_FINE_TUNE_VALIDATION_SPLIT)
+
+            return self._update_executor.submit(self._fine_tune, X, y, X_val, y_val, epochs, learning_rate)
         except Exception as e:
-            logger.error(f"Error in update_user_preferences: {str(e)}")
-            raise
\ No newline at end of file
+            logger.error(f"Error in fine_tune_user_preferences: {str(e)}")
+            raise
+
+    def _fine_tune(self, X: np.ndarray, y: np.ndarray, X_val: np.ndarray, y_val: np.ndarray,
+                   epochs: int, learning_rate: float) -> dict:
+        try:
+            version = model_registry.active_version(self.artifact_path)
+            model = self.model
+            candidate = model.copy()
+            candidate.fine_tune(X, y, epochs=epochs, learning_rate=learning_rate)
+
+            result = {
+                'activated': False,
+                'version': version,
+                'baseline_accuracy': model.accuracy(X_val, y_val),
+                'candidate_accuracy': candidate.accuracy(X_val, y_val)
+            }
+            if result['candidate_accuracy'] < result['baseline_accuracy'] - STYLE_MATCH_FINE_TUNE_MAX_ACCURACY_DROP:
+                logger.warning(
+                    f"Rolled back StyleMatcherModel update: validation accuracy {result['candidate_accuracy']:.4f} "
+                    f"regressed from {result['baseline_accuracy']:.4f}"
+                )
+                return result
+            new_version = self._activate_candidate(candidate, version)
+            if new_version is None:
+                return result
+
+            result['version'] = new_version
+            result['activated'] = True
+            logger.info(
+                f"StyleMatcherModel fine-tuned on {len(X)} data points and activated as version {result['version']} "
+                f"(validation accuracy {result['baseline_accuracy']:.4f} -> {result['candidate_accuracy']:.4f})"
+            )
+            return result
+        except Exception as e:
+            logger.error(f"Error in _fine_tune: {str(e)}")
+            raise
+
+    def _training_arrays(self, preferences: 'pd.DataFrame', style_lines: 'pd.DataFrame') -> tuple:
+        vectorizer = self.vectorizer
+        X = vectorizer.transform_columns(preferences) if vectorizer is not None else preferences.values
+        return X, style_lines.values.ravel()
+
+    def _holdout_split(self, X: np.ndarray, y: np.ndarray, validation_split: float) -> tuple:
+        if len(X) < 2:
+            raise ValueError("At least two data points are required to hold out validation data")
+        order = np.random.default_rng().permutation(len(X))
+        num_validation = min(len(X) - 1, max(1, int(round(len(X) * validation_split))))
+        validation, train = order[:num_validation], order[num_validation:]
+        return X[train], y[train], X[validation], y[validation]
+
+
+def _load_keras_style_matcher(model_path: str):
+    # Imported here so NumPy-engine workers never load TensorFlow
+    configure_tensorflow_threads()
+    from src.ai.models.styleMatcherModel import StyleMatcherModel
+    return StyleMatcherModel.from_saved(model_path)
\ No newline at end of file
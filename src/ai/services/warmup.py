@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+from src.ai.utils.metrics import metrics
+from src.backend.utils.logger import logger
+
+WARMUP_PENDING = 'pending'
+WARMUP_RUNNING = 'running'
+WARMUP_READY = 'ready'
+WARMUP_FAILED = 'failed'
+
+
+class Warmup:
+    def __init__(self, steps: Dict[str, Callable[[], None]], name: str = 'warmup', max_attempts: int = 1,
+                 retry_delay_seconds: float = 0.0, on_failure: Optional[Callable[[], None]] = None):
+        """
+        Runs representative dummy inferences once at startup and tracks readiness.
+
+        Steps run in order on a background thread, so the process can answer liveness
+        checks while it warms up; ready only becomes True once every step has finished.
+        A failing step is retried up to max_attempts times; if it still fails the worker
+        stays not ready rather than serving cold or broken, and on_failure is called, e.g.
+        to exit so the process supervisor restarts the worker.
+
+        Args:
+            steps (Dict[str, Callable]): Warmup steps by name, run in insertion order.
+            name (str): Name of the warmup thread and of the exported stats.
+            max_attempts (int): Attempts per step before warmup fails.
+            retry_delay_seconds (float): Pause between attempts of a step.
+            on_failure (Callable): Called once warmup has failed.
+        """
+        self.steps = dict(steps)
+        self.name = name
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay_seconds = retry_delay_seconds
+        self.on_failure = on_failure
+        self.attempts = {}
+        self.state = WARMUP_PENDING
+        self.error = None
+        self.step_seconds = {}
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = None
+
+        metrics.register_collector(name, self.status)
+
+    @property
+    def ready(self) -> bool:
+        return self.state == WARMUP_READY
+
+    def start(self) -> None:
+        """
+        Starts warming up on a background thread; later calls are no-ops.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def run(self) -> bool:
+        """
+        Runs every step on the calling thread.
+
+        Returns:
+            bool: True if all steps succeeded.
+        """
+        with self._lock:
+            self.state = WARMUP_RUNNING
+            self.started_at = time.time()
+
+        try:
+            for step_name, step in self.steps.items():
+                self._run_step(step_name, step)
+            state = WARMUP_READY
+        except Exception as e:
+            logger.error(f"Error in warmup: {str(e)}")
+            with self._lock:
+                self.error = str(e)
+            state = WARMUP_FAILED
+
+        with self._lock:
+            self.state = state
+            self.finished_at = time.time()
+        self._done.set()
+        if state == WARMUP_FAILED and self.on_failure is not None:
+            self.on_failure()
+        return state == WARMUP_READY
+
+    def _run_step(self, step_name: str, step: Callable[[], None]) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            with self._lock:
+                self.attempts[step_name] = attempt
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    raise
+                logger.warning(f"Warmup step {step_name} failed (attempt {attempt}/{self.max_attempts}): {str(e)}")
+                time.sleep(self.retry_delay_seconds)
+                continue
+            with self._lock:
+                self.step_seconds[step_name] = time.perf_counter() - start
+            logger.info(f"Warmup step {step_name} finished in {self.step_seconds[step_name]:.2f}s")
+            return
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until warmup has finished.
+
+        Returns:
+            bool: True if warmup finished and succeeded within the timeout.
+        """
+        self._done.wait(timeout)
+        return self.ready
+
+    def status(self) -> dict:
+        with self._lock:
+            elapsed = None
+            if self.started_at is not None:
+                elapsed = (self.finished_at or time.time()) - self.started_at
+            return {
+                'status': self.state,
+                'ready': self.state == WARMUP_READY,
+                'error': self.error,
+                'elapsed_seconds': elapsed,
+                'step_seconds': dict(self.step_seconds),
+                'attempts': dict(self.attempts)
+            }
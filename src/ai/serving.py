@@ -0,0 +1,146 @@
+"""
+Multi-process serving for src/ai/app.py.
+
+The parent process binds the listening socket, loads the weights that can be shared
+and forks SERVING_WORKERS workers that accept on that socket, so requests are served
+in parallel without the GIL and without one copy of every model per worker:
+
+- The NumPy style matcher artifact (STYLE_MATCHER_ENGINE=numpy) is memory-mapped
+  once before forking, so workers share its pages.
+- The NumPy design generator artifact (DESIGN_GENERATOR_ENGINE=numpy) and a quantized
+  generator (DESIGN_GENERATOR_QUANTIZED_PATH) are memory-mapped from their files by
+  each worker, so their pages are shared through the page cache.
+- Keras models are loaded by each worker's warmup: TensorFlow is not fork-safe, so
+  the parent never imports it.
+
+Each worker's TensorFlow, TFLite, BLAS and encoder pools are sized to its share of
+the cores (WORKER_CPU_COUNT). Metrics and in-memory caches are per worker.
+
+Usage:
+    SERVING_WORKERS=8 SERVING_PORT=5000 python -m src.ai.serving
+"""
+import os
+import signal
+import socket
+import time
+from src.ai.config import (
+    SERVING_WORKERS, SERVING_HOST, SERVING_PORT, SERVING_PIN_CPUS, WORKER_CPU_COUNT, STYLE_MATCHER_ENGINE,
+    MODEL_PATH_STYLE_MATCHER
+)
+from src.backend.utils.logger import logger
+
+# Thread pools read when their libraries load, i.e. in each worker after the fork
+_THREAD_ENVIRONMENT = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+LISTEN_BACKLOG = 1024
+RESPAWN_DELAY_SECONDS = 1.0
+
+
+def preload_shared_models() -> None:
+    """
+    Loads the models workers can share into the model registry before forking.
+    """
+    # Imported after the thread environment is set: BLAS reads it when NumPy loads
+    from src.ai.models.styleMatcherEngine import StyleMatcherEngine, ENGINE_FILE_SUFFIX
+    from src.ai.utils.modelRegistry import model_registry
+
+    if STYLE_MATCHER_ENGINE == 'numpy':
+        # Artifacts are memory-mapped, so their pages are shared through the page cache
+        engine = model_registry.get(f"{MODEL_PATH_STYLE_MATCHER}{ENGINE_FILE_SUFFIX}", StyleMatcherEngine.load)
+        logger.info(f"Shared {engine.nbytes} bytes of style matcher weights across workers")
+
+
+def worker_cpus(index: int) -> list:
+    # Disjoint slices of the allowed cores, WORKER_CPU_COUNT per worker, wrapping around
+    cpus = sorted(os.sched_getaffinity(0))
+    start = (index * WORKER_CPU_COUNT) % len(cpus)
+    return [cpus[(start + i) % len(cpus)] for i in range(min(WORKER_CPU_COUNT, len(cpus)))]
+
+
+def run_worker(listener: socket.socket, index: int) -> None:
+    """
+    Serves the app on the inherited listening socket until terminated.
+    """
+    from werkzeug.serving import make_server
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if SERVING_PIN_CPUS:
+        os.sched_setaffinity(0, worker_cpus(index))
+
+    # Imported in the worker so the warmup thread and executors start after the fork
+    from src.ai.app import app
+
+    host, port = listener.getsockname()[:2]
+    server = make_server(host, port, app, threaded=True, fd=listener.fileno())
+    logger.info(f"Worker {index} (pid {os.getpid()}) serving on {host}:{port}")
+    server.serve_forever()
+
+
+def serve(host: str = SERVING_HOST, port: int = SERVING_PORT, workers: int = SERVING_WORKERS) -> None:
+    """
+    Runs the pre-forked server, restarting workers that exit until SIGTERM or SIGINT.
+
+    Args:
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free one.
+        workers (int): Number of worker processes.
+    """
+    for name in _THREAD_ENVIRONMENT:
+        os.environ.setdefault(name, str(WORKER_CPU_COUNT))
+
+    preload_shared_models()
+    listener = socket.create_server((host, port), backlog=LISTEN_BACKLOG)
+    listener.set_inheritable(True)
+    logger.info(f"Listening on {host}:{listener.getsockname()[1]} with {workers} workers")
+
+    children = {}
+    stopping = False
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                run_worker(listener, index)
+            except BaseException as e:
+                logger.error(f"Error in worker {index}: {str(e)}")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        children[pid] = index
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for index in range(workers):
+        spawn(index)
+
+    try:
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index = children.pop(pid, None)
+            if index is None or stopping:
+                continue
+            logger.error(f"Worker {index} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}, restarting")
+            time.sleep(RESPAWN_DELAY_SECONDS)
+            if not stopping:
+                spawn(index)
+    finally:
+        listener.close()
+
+
+if __name__ == "__main__":
+    serve()
@@ -2,9 +2,9 @@ import tensorflow as tf
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 from src.ai.models.styleMatcherModel import StyleMatcherModel
-from src.ai.utils.dataPreprocessing import preprocess_style_data
+from src.ai.utils.dataPreprocessing import preprocess_style_data, fit_preference_vectorizer
+from src.ai.utils.preferenceVectorizer import VECTORIZER_FILE_SUFFIX
 from src.ai.utils.modelEvaluation import evaluate_style_matcher
 from src.shared.constants import MODEL_SAVE_PATH, STYLE_DATA_PATH
 import logging
@@ -19,27 +19,22 @@ def load_and_preprocess_data():
     Loads the style data from CSV and preprocesses it for training
     
     Returns:
-        tuple: Preprocessed features and labels
+        tuple: Train and test features and labels, and the fitted PreferenceVectorizer
     """
     # Load style data from CSV file
     df = pd.read_csv(STYLE_DATA_PATH)
     
-    # Preprocess the data using preprocess_style_data function
-    preprocessed_data = preprocess_style_data(df)
+    # Fit the preprocessing pipeline (schema, category maps and scaler statistics) that
+    # is saved with the model and reused by serving
+    vectorizer = fit_preference_vectorizer(df)
     
-    # Split features and labels
-    features = preprocessed_data.drop('style_label', axis=1)
-    labels = preprocessed_data['style_label']
+    # Preprocess the data using preprocess_style_data function
+    features, labels = preprocess_style_data(df, vectorizer)
     
     # Perform train-test split
     X_train, X_test, y_train, y_test = train_test_split(features, labels, test_size=0.2, random_state=42)
     
-    # Scale the features using StandardScaler
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    return X_train_scaled, X_test_scaled, y_train, y_test
+    return X_train, X_test, y_train, y_test, vectorizer
 
 def create_and_compile_model(input_shape):
     """
@@ -105,7 +100,7 @@ def main():
     
     # Load and preprocess data
     logging.info("Loading and preprocessing data...")
-    X_train, X_test, y_train, y_test = load_and_preprocess_data()
+    X_train, X_test, y_train, y_test, vectorizer = load_and_preprocess_data()
     
     # Create and compile the model
     logging.info("Creating and compiling the model...")
@@ -124,6 +119,7 @@ def main():
     # Save the trained model
     logging.info(f"Saving the trained model to {MODEL_SAVE_PATH}...")
     tf.keras.models.save_model(model, MODEL_SAVE_PATH)
+    vectorizer.save(f"{MODEL_SAVE_PATH}{VECTORIZER_FILE_SUFFIX}")
     
     # Log training completion
     logging.info("Training completed successfully!")
@@ -1,28 +1,36 @@
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from PIL import Image
 from src.shared.constants.index import StyleLines
+from src.ai.utils.preferenceVectorizer import PreferenceVectorizer
 
-def preprocess_user_preferences(user_preferences: pd.DataFrame) -> np.array:
+def preprocess_user_preferences(user_preferences: pd.DataFrame, vectorizer: PreferenceVectorizer = None) -> np.array:
     """
     Preprocesses user preference data for the StyleMatcherModel
+
+    One-hot encodes categorical columns and standardizes numerical ones with a fitted
+    PreferenceVectorizer. Pass the vectorizer saved with the model to reproduce its
+    preprocessing; without one, a new vectorizer is fitted on user_preferences.
     """
     # Remove missing values
     user_preferences = user_preferences.dropna()
 
-    # Convert categorical variables to numerical using one-hot encoding
-    categorical_columns = user_preferences.select_dtypes(include=['object']).columns
-    user_preferences = pd.get_dummies(user_preferences, columns=categorical_columns)
+    if vectorizer is None:
+        vectorizer = PreferenceVectorizer.fit(user_preferences)
+
+    return vectorizer.transform_columns(user_preferences)
 
-    # Normalize numerical features using StandardScaler
-    scaler = StandardScaler()
-    numerical_columns = user_preferences.select_dtypes(include=['float64', 'int64']).columns
-    user_preferences[numerical_columns] = scaler.fit_transform(user_preferences[numerical_columns])
+def fit_preference_vectorizer(style_data: pd.DataFrame) -> PreferenceVectorizer:
+    """
+    Fits the preference preprocessing pipeline on style training data
 
-    return user_preferences.to_numpy()
+    Save the result next to the trained model (see VECTORIZER_FILE_SUFFIX) so serving
+    vectorizes requests exactly as the training data was.
+    """
+    style_data = style_data.drop_duplicates().dropna()
+    return PreferenceVectorizer.fit(style_data.drop('style_line', axis=1))
 
-def preprocess_style_data(style_data: pd.DataFrame) -> tuple:
+def preprocess_style_data(style_data: pd.DataFrame, vectorizer: PreferenceVectorizer = None) -> tuple:
     """
     Preprocesses style data for training the StyleMatcherModel
     """
@@ -34,7 +42,7 @@ def preprocess_style_data(style_data: pd.DataFrame) -> tuple:
     y = style_data['style_line']
 
     # Preprocess features using preprocess_user_preferences function
-    X_preprocessed = preprocess_user_preferences(X)
+    X_preprocessed = preprocess_user_preferences(X, vectorizer)
 
     # Encode style lines using encode_style_lines function
     y_encoded = encode_style_lines(y.tolist())
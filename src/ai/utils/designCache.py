@@ -0,0 +1,116 @@
+import base64
+import hashlib
+import os
+import tempfile
+import threading
+import numpy as np
+from typing import Any, Optional
+from src.ai.config import DESIGN_CACHE_MAX_BYTES, DESIGN_CACHE_DIR
+from src.ai.utils.lruCache import LRUCache
+from src.ai.utils.metrics import metrics
+from src.backend.utils.logger import logger
+
+
+def design_cache_key(model_version: str, style_line: str, processed_input: Any, seed: int,
+                     image_encoding: str = 'png') -> str:
+    """
+    Content address of a generated design: a SHA-256 over everything that determines it.
+
+    Args:
+        model_version (str): Version of the generator weights.
+        style_line (str): The style line the design was generated for.
+        processed_input (Any): Model-ready conditioning input, or None.
+        seed (int): Seed of the noise vector.
+        image_encoding (str): Encoder settings of the stored image, see imageEncoding.encoding_signature.
+
+    Returns:
+        str: Hex digest identifying the design.
+    """
+    digest = hashlib.sha256()
+    for part in (model_version, style_line, seed, image_encoding):
+        digest.update(f"{part}\0".encode())
+    if processed_input is not None:
+        processed_input = np.ascontiguousarray(processed_input)
+        digest.update(f"{processed_input.dtype.str}{processed_input.shape}\0".encode())
+        digest.update(processed_input.data)
+    return digest.hexdigest()
+
+
+class DesignCache:
+    def __init__(self, max_bytes: int, directory: Optional[str] = None):
+        """
+        Two-tier cache of encoded designs: an in-memory LRU in front of an optional
+        on-disk store shared by all workers and kept across restarts.
+
+        Designs are stored under their content address, so entries never need
+        invalidating; a new model version simply produces new keys.
+
+        Args:
+            max_bytes (int): Memory budget of the in-memory tier.
+            directory (str): Directory of the on-disk tier, or None to keep designs in memory only.
+        """
+        self.directory = directory
+        self._memory = LRUCache(max_bytes, sizeof=len)
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_writes = 0
+
+    def get(self, key: str) -> Optional[str]:
+        design = self._memory.get(key)
+        if design is not None or self.directory is None:
+            return design
+
+        try:
+            with open(self._path(key), 'rb') as f:
+                design = base64.b64encode(f.read()).decode()
+        except FileNotFoundError:
+            with self._lock:
+                self.disk_misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        self._memory.put(key, design)
+        return design
+
+    def put(self, key: str, design: str) -> None:
+        self._memory.put(key, design)
+        if self.directory is None:
+            return
+
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write under a temporary name and rename so readers never see a partial file
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(base64.b64decode(design))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.error(f"Error writing design {key} to the design cache: {str(e)}")
+            return
+
+        with self._lock:
+            self.disk_writes += 1
+
+    def stats(self) -> dict:
+        stats = self._memory.stats()
+        with self._lock:
+            stats.update({
+                'disk_enabled': self.directory is not None,
+                'disk_hits': self.disk_hits,
+                'disk_misses': self.disk_misses,
+                'disk_writes': self.disk_writes
+            })
+        return stats
+
+    def _path(self, key: str) -> str:
+        # Fan out over subdirectories so no single directory grows too large
+        return os.path.join(self.directory, key[:2], key)
+
+
+design_cache = DesignCache(DESIGN_CACHE_MAX_BYTES, DESIGN_CACHE_DIR)
+metrics.register_collector('design_cache', design_cache.stats)
@@ -0,0 +1,152 @@
+import uuid
+from io import BytesIO
+from typing import Any, Iterable, Optional, Tuple
+from flask import Request, Response, send_file, stream_with_context
+from PIL import Image
+from src.ai.utils.imageEncoding import IMAGE_FORMATS, decode_image, image_mimetype
+
+PNG_MIMETYPE = 'image/png'
+OCTET_STREAM_MIMETYPE = 'application/octet-stream'
+MULTIPART_MIXED_MIMETYPE = 'multipart/mixed'
+
+# One format per image mimetype a client can ask for in its Accept header
+_IMAGE_FORMATS_BY_MIMETYPE = {
+    spec['mimetype']: image_format for image_format, spec in reversed(list(IMAGE_FORMATS.items()))
+}
+_BINARY_RESPONSE_MIMETYPES = tuple(_IMAGE_FORMATS_BY_MIMETYPE) + (OCTET_STREAM_MIMETYPE, MULTIPART_MIXED_MIMETYPE)
+
+
+def is_binary_image_request(request: Request) -> bool:
+    return (
+        request.mimetype == 'multipart/form-data'
+        or request.mimetype == OCTET_STREAM_MIMETYPE
+        or request.mimetype.startswith('image/')
+    )
+
+
+def wants_binary_image(request: Request) -> bool:
+    """
+    Returns True if the client prefers raw image bytes over JSON with base64.
+
+    Clients sending no Accept header, or */*, keep getting JSON.
+    """
+    best = request.accept_mimetypes.best_match(('application/json',) + _BINARY_RESPONSE_MIMETYPES)
+    return best in _BINARY_RESPONSE_MIMETYPES
+
+
+def read_request_image(request: Request, field: str) -> Optional[Image.Image]:
+    """
+    Decodes an image sent as a multipart upload or as a raw request body.
+
+    Args:
+        request (Request): The incoming Flask request.
+        field (str): Multipart file field holding the image.
+
+    Returns:
+        Optional[Image.Image]: The decoded image, or None for JSON requests.
+    """
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get(field)
+        if upload is None:
+            raise ValueError(f"Missing multipart file field '{field}'")
+        # Decode now: the upload's stream is closed with the request, before a streamed response is done
+        image = decode_image(upload.stream)
+        image.load()
+        return image
+
+    if is_binary_image_request(request):
+        # Read the body once; decoding then works directly on that buffer
+        return decode_image(request.get_data(cache=False))
+
+    return None
+
+
+def _json_body(request: Request) -> dict:
+    # Parameters are only read from an object body
+    body = request.get_json(silent=True)
+    return body if isinstance(body, dict) else {}
+
+
+def request_param(request: Request, name: str, default: Any = None, cast: type = None) -> Any:
+    """
+    Reads a parameter from the JSON body, or from form fields and the query string
+    for binary requests.
+    """
+    if is_binary_image_request(request):
+        value = request.form.get(name) if request.mimetype == 'multipart/form-data' else None
+        if value is None:
+            value = request.args.get(name)
+    else:
+        value = _json_body(request).get(name)
+
+    if value is None:
+        return default
+    return cast(value) if cast is not None else value
+
+
+def request_list_param(request: Request, name: str) -> list:
+    """
+    Reads a list parameter from the JSON body, or from repeated form fields and query
+    string values for binary requests.
+    """
+    if is_binary_image_request(request):
+        values = request.form.getlist(name) if request.mimetype == 'multipart/form-data' else []
+        return values or request.args.getlist(name)
+    return _json_body(request).get(name) or []
+
+
+def request_image_encoding(request: Request) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Reads the requested output encoding from the 'image_format' and 'image_quality'
+    parameters, or from an image type explicitly listed in the Accept header.
+
+    Returns:
+        Tuple[Optional[str], Optional[int]]: (image_format, image_quality); None means
+        the deployment default.
+    """
+    image_format = request_param(request, 'image_format')
+    if image_format is None:
+        # Only explicit entries count: */* or image/* keep the deployment default
+        for mimetype, _ in request.accept_mimetypes:
+            if mimetype in _IMAGE_FORMATS_BY_MIMETYPE:
+                if mimetype != image_mimetype():
+                    image_format = _IMAGE_FORMATS_BY_MIMETYPE[mimetype]
+                break
+    return image_format, request_param(request, 'image_quality', cast=int)
+
+
+def image_response(buffer: BytesIO, mimetype: str = PNG_MIMETYPE) -> Response:
+    """
+    Sends an encoded image buffer as the response body without copying it into JSON.
+    """
+    buffer.seek(0)
+    return send_file(buffer, mimetype=mimetype, max_age=0)
+
+
+def multipart_image_response(images: Iterable[Tuple[int, BytesIO]], mimetype: str = PNG_MIMETYPE) -> Response:
+    """
+    Streams encoded images as a multipart/mixed response, one part per image, each
+    sent as soon as it is produced.
+
+    Args:
+        images (Iterable[Tuple[int, BytesIO]]): (index, encoded image buffer) pairs.
+        mimetype (str): Content type of each part.
+
+    Returns:
+        Response: Streaming multipart/mixed response.
+    """
+    boundary = uuid.uuid4().hex
+
+    def generate():
+        for index, buffer in images:
+            # getvalue() hands out the buffer's own bytes object rather than a copy
+            data = buffer.getvalue()
+            yield (
+                f"--{boundary}\r\nContent-Type: {mimetype}\r\nContent-Length: {len(data)}\r\n"
+                f"Content-ID: <{index}>\r\n\r\n"
+            ).encode()
+            yield data
+            yield b"\r\n"
+        yield f"--{boundary}--\r\n".encode()
+
+    return Response(stream_with_context(generate()), content_type=f"{MULTIPART_MIXED_MIMETYPE}; boundary={boundary}")
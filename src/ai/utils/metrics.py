@@ -0,0 +1,96 @@
+import bisect
+import threading
+from typing import Callable
+
+
+class Histogram:
+    def __init__(self, name: str, buckets: tuple):
+        """
+        Cumulative histogram with fixed upper bounds, in the style of Prometheus.
+
+        Args:
+            name (str): Metric name used in snapshots.
+            buckets (tuple): Upper bounds of the histogram buckets.
+        """
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative = 0
+        buckets = {}
+        for upper_bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            buckets[str(upper_bound)] = cumulative
+        buckets['+Inf'] = count
+
+        return {
+            'buckets': buckets,
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else 0.0
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Process-wide registry of serving metrics exposed by the /metrics route.
+        """
+        self._histograms = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, buckets: tuple) -> Histogram:
+        """
+        Returns the histogram registered under name, creating it if needed.
+
+        Args:
+            name (str): Metric name.
+            buckets (tuple): Upper bounds used when the histogram is created.
+
+        Returns:
+            Histogram: The registered histogram.
+        """
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = Histogram(name, buckets)
+            return self._histograms[name]
+
+    def register_collector(self, name: str, collector: Callable[[], dict]) -> None:
+        """
+        Registers a callable whose returned stats are included in every snapshot.
+
+        Args:
+            name (str): Key of the collector's stats in the snapshot.
+            collector (Callable): Zero-argument function returning a dict of stats.
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            histograms = dict(self._histograms)
+            collectors = dict(self._collectors)
+
+        snapshot = {name: histogram.snapshot() for name, histogram in histograms.items()}
+        for name, collector in collectors.items():
+            snapshot[name] = collector()
+        return snapshot
+
+
+metrics = MetricsRegistry()
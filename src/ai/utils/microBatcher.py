@@ -0,0 +1,140 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List
+from src.ai.utils.metrics import metrics
+from src.backend.utils.logger import logger
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_WAIT_MS_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 250)
+
+_STOP = object()
+
+
+class _PendingRequest:
+    def __init__(self, item: Any):
+        self.item = item
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0, name: str = 'micro_batcher'):
+        """
+        Gathers concurrent single-item requests into batches for one forward pass.
+
+        A batch is dispatched as soon as it holds max_batch_size items or the oldest
+        item has waited max_wait_ms, whichever comes first. If batch_fn fails on a batch,
+        its items are retried one by one, so a single invalid item only fails its own caller.
+
+        Args:
+            batch_fn (Callable): Function mapping a list of items to a list of results of the same length.
+            max_batch_size (int): Maximum number of items per batch.
+            max_wait_ms (float): Maximum time the oldest item waits for the batch to fill.
+            name (str): Prefix for the exported batch-size and queue-wait histograms.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batch_size_histogram = metrics.histogram(f"{name}_batch_size", BATCH_SIZE_BUCKETS)
+        self.queue_wait_histogram = metrics.histogram(f"{name}_queue_wait_ms", QUEUE_WAIT_MS_BUCKETS)
+
+        self._queue = queue.Queue()
+        self._closed = False
+        # Orders submit against close, so no item is queued behind the stop marker
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, item: Any, timeout: float = None) -> Any:
+        """
+        Enqueues an item and blocks until its batch has been processed.
+
+        Args:
+            item (Any): Single input for batch_fn.
+            timeout (float): Maximum seconds to wait for the result.
+
+        Returns:
+            Any: The result produced for this item.
+        """
+        pending = _PendingRequest(item)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put(pending)
+        return pending.future.result(timeout)
+
+    def close(self) -> None:
+        """
+        Stops the worker thread after the already-queued items are processed.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._worker.join()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = [first]
+            deadline = first.enqueued_at + self.max_wait
+            stop_requested = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    pending = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if pending is _STOP:
+                    stop_requested = True
+                    break
+                batch.append(pending)
+
+            self._process(batch)
+            if stop_requested:
+                return
+
+    def _process(self, batch: List[_PendingRequest]) -> None:
+        dispatched_at = time.perf_counter()
+        self.batch_size_histogram.observe(len(batch))
+        for pending in batch:
+            self.queue_wait_histogram.observe((dispatched_at - pending.enqueued_at) * 1000.0)
+
+        try:
+            results = self._call_batch_fn([pending.item for pending in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"Error in micro-batch of 1 item: {str(e)}")
+                batch[0].future.set_exception(e)
+                return
+            logger.error(f"Error in micro-batch of {len(batch)} items, retrying them one by one: {str(e)}")
+            for pending in batch:
+                self._process_single(pending)
+            return
+
+        for pending, result in zip(batch, results):
+            pending.future.set_result(result)
+
+    def _process_single(self, pending: _PendingRequest) -> None:
+        try:
+            result = self._call_batch_fn([pending.item])[0]
+        except Exception as e:
+            pending.future.set_exception(e)
+            return
+        pending.future.set_result(result)
+
+    def _call_batch_fn(self, items: List[Any]) -> List[Any]:
+        results = self.batch_fn(items)
+        if len(results) != len(items):
+            raise ValueError(f"batch_fn returned {len(results)} results for {len(items)} items")
+        return results
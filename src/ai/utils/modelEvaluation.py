@@ -1,8 +1,5 @@
 import numpy as np
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support, confusion_matrix
-import matplotlib.pyplot as plt
-import seaborn as sns
-import tensorflow as tf
 from src.shared.constants.index import StyleLines
 from src.backend.utils.logger import logger
 
@@ -67,6 +64,10 @@ def plot_confusion_matrix(y_true, y_pred):
     Returns:
         None: Displays the confusion matrix plot.
     """
+    # Plotting libraries are imported on use so evaluation never loads them implicitly
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     cm = confusion_matrix(y_true, y_pred)
     plt.figure(figsize=(10, 8))
     sns.heatmap(cm, annot=True, fmt='d', cmap='Blues')
@@ -89,6 +90,8 @@ def plot_generated_designs(generated_designs, grid_size):
     Returns:
         None: Displays the grid of generated designs.
     """
+    import matplotlib.pyplot as plt
+
     fig, axes = plt.subplots(grid_size, grid_size, figsize=(15, 15))
     for i, ax in enumerate(axes.flat):
         if i < len(generated_designs):
@@ -108,6 +111,8 @@ def calculate_inception_score(generated_designs, num_splits=10):
     Returns:
         float: Inception Score.
     """
+    import tensorflow as tf
+
     # Load pre-trained Inception model
     inception_model = tf.keras.applications.InceptionV3(include_top=False, pooling='avg', input_shape=(299, 299, 3))
 
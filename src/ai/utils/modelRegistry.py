@@ -0,0 +1,231 @@
+import os
+import threading
+from typing import Any, Callable, Tuple
+from src.ai.config import MODEL_REGISTRY_MAX_BYTES
+from src.ai.utils.lruCache import LRUCache
+from src.ai.utils.metrics import metrics
+from src.backend.utils.logger import logger
+
+UNVERSIONED = 'unversioned'
+
+
+# Files saved next to a model that its loader reads too, e.g. StyleMatcherModel's scaler
+COMPANION_FILE_SUFFIXES = ('_scaler.pkl',)
+
+
+def _artifact_files(path: str) -> list:
+    if os.path.isdir(path):
+        # A SavedModel directory's own mtime does not change when the files inside are rewritten
+        files = [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+    else:
+        files = [path]
+    return files + [f"{path}{suffix}" for suffix in COMPANION_FILE_SUFFIXES]
+
+
+def artifact_version(path: str) -> str:
+    """
+    Derives a version for a model artifact from the newest modification time and the
+    total size of its files: every file under a model directory, plus companion files
+    such as the scaler saved next to the model.
+
+    Args:
+        path (str): Path to the model file or directory.
+
+    Returns:
+        str: Version string, or UNVERSIONED if the artifact does not exist.
+    """
+    if not os.path.exists(path):
+        return UNVERSIONED
+
+    latest_mtime, total_size = 0, 0
+    for file_path in _artifact_files(path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue
+        latest_mtime = max(latest_mtime, stat.st_mtime_ns)
+        total_size += stat.st_size
+    return f"{latest_mtime}-{total_size}"
+
+
+def estimate_model_size(model: Any) -> int:
+    """
+    Estimates the in-memory size of a loaded model in bytes.
+
+    Handles NumPy engines (nbytes), Keras models (count_params) and wrapper
+    objects such as StyleMatcherModel or DesignGeneratorModel that hold them.
+    """
+    if hasattr(model, 'nbytes'):
+        return int(model.nbytes)
+    if hasattr(model, 'count_params'):
+        return int(model.count_params()) * 4
+    if hasattr(model, '__dict__'):
+        return sum(
+            estimate_model_size(value) for value in vars(model).values()
+            if hasattr(value, 'nbytes') or hasattr(value, 'count_params')
+        )
+    return 0
+
+
+class ModelVersionUnavailable(LookupError):
+    """
+    Raised when a pinned model version is no longer loaded and the artifact on disk
+    has since changed, so that version cannot be loaded again.
+    """
+
+
+class ModelRegistry:
+    def __init__(self, max_bytes: int):
+        """
+        Process-wide cache of loaded models keyed by (path, version).
+
+        Each artifact is loaded once and shared by every caller. Entries are evicted
+        least-recently-used first once their estimated size exceeds max_bytes. Each
+        path has an active version, which activate() swaps atomically so callers
+        move to a new model without a serving pause.
+
+        Args:
+            max_bytes (int): Memory budget for loaded models.
+        """
+        self._cache = LRUCache(max_bytes, sizeof=estimate_model_size)
+        self._active_versions = {}
+        self._load_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, loader: Callable[[str], Any], version: str = None) -> Any:
+        """
+        Returns the model for path, loading it on first use.
+
+        Args:
+            path (str): Path to the model artifact.
+            loader (Callable): Function loading the artifact at path.
+            version (str): Explicit version; defaults to the active version for path.
+
+        Returns:
+            Any: The loaded model.
+
+        Raises:
+            ModelVersionUnavailable: If version was evicted and the artifact on disk has changed since.
+        """
+        return self.get_versioned(path, loader, version)[1]
+
+    def get_versioned(self, path: str, loader: Callable[[str], Any], version: str = None) -> Tuple[str, Any]:
+        """
+        Returns the model for path together with the version it was loaded as.
+
+        Only the artifact currently on disk can be (re)loaded. When the active version
+        was evicted and the artifact has changed since, the artifact on disk is loaded
+        and activated instead; an explicitly requested version raises.
+
+        Args:
+            path (str): Path to the model artifact.
+            loader (Callable): Function loading the artifact at path.
+            version (str): Explicit version; defaults to the active version for path.
+
+        Returns:
+            Tuple[str, Any]: (version, loaded model).
+
+        Raises:
+            ModelVersionUnavailable: If version was evicted and the artifact on disk has changed since.
+        """
+        pinned = version is not None
+        if not pinned:
+            version = self.active_version(path)
+        requested_version = version
+
+        model = self._cache.get((path, version))
+        if model is not None:
+            return version, model
+
+        # Only one thread loads a given artifact; the others wait and reuse it
+        with self._load_lock(path):
+            model = self._cache.get((path, version))
+            if model is None:
+                disk_version = artifact_version(path)
+                if disk_version != version:
+                    if pinned:
+                        raise ModelVersionUnavailable(
+                            f"Version {version} of {path} is no longer loaded and the artifact is now {disk_version}"
+                        )
+                    # The active version was evicted and replaced on disk since: serve the artifact on disk
+                    version = disk_version
+                    model = self._cache.get((path, version))
+            if model is None:
+                model = loader(path)
+                self._cache.put((path, version), model)
+                logger.info(f"Model registry loaded {path} (version {version})")
+
+        with self._lock:
+            # Unless another thread activated a different version meanwhile
+            active_version = self._active_versions.get(path)
+            if active_version is None or (not pinned and active_version == requested_version):
+                self._active_versions[path] = version
+        return version, model
+
+    def activate(self, path: str, version: str, loader: Callable[[str], Any] = None, model: Any = None) -> str:
+        """
+        Atomically makes version the active model for path.
+
+        The new model is loaded (or taken from model) before the switch, so callers
+        keep using the previous version until the new one is ready.
+
+        Args:
+            path (str): Path to the model artifact.
+            version (str): Version to activate.
+            loader (Callable): Function loading the artifact, used when model is not given.
+            model (Any): Already-loaded model to register under version.
+
+        Returns:
+            str: The previously active version, or None.
+        """
+        if model is None:
+            if loader is None:
+                raise ValueError("activate requires either a loader or a model")
+            model = loader(path)
+        self._cache.put((path, version), model)
+
+        with self._lock:
+            previous_version = self._active_versions.get(path)
+            self._active_versions[path] = version
+
+        # The previous version is left to age out of the LRU so in-flight requests can finish
+        logger.info(f"Model registry activated {path} version {version} (previous {previous_version})")
+        return previous_version
+
+    def refresh(self, path: str, loader: Callable[[str], Any]) -> bool:
+        """
+        Activates the artifact on disk if it changed since the active version was loaded.
+
+        Returns:
+            bool: True if a new version was activated.
+        """
+        version = artifact_version(path)
+        if version == UNVERSIONED or version == self.active_version(path):
+            return False
+        self.activate(path, version, loader=loader)
+        return True
+
+    def active_version(self, path: str) -> str:
+        with self._lock:
+            version = self._active_versions.get(path)
+        return version if version is not None else artifact_version(path)
+
+    def evict(self, path: str, version: str = None) -> None:
+        for key in self._cache.keys():
+            if key[0] == path and (version is None or key[1] == version):
+                self._cache.pop(key)
+
+    def stats(self) -> dict:
+        stats = self._cache.stats()
+        with self._lock:
+            stats['active_versions'] = dict(self._active_versions)
+        return stats
+
+    def _load_lock(self, path: str) -> threading.Lock:
+        # One lock per artifact path rather than per version, so the locks stay bounded by the number of artifacts
+        with self._lock:
+            return self._load_locks.setdefault(path, threading.Lock())
+
+
+model_registry = ModelRegistry(MODEL_REGISTRY_MAX_BYTES)
+metrics.register_collector('model_registry', model_registry.stats)
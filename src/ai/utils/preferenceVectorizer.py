@@ -0,0 +1,243 @@
+import json
+import os
+import tempfile
+import numpy as np
+from operator import itemgetter
+from typing import Mapping, Optional, Sequence
+
+VECTORIZER_FILE_SUFFIX = '_vectorizer.json'
+VECTORIZER_FORMAT_VERSION = 1
+
+
+class PreferenceVectorizer:
+    def __init__(self, numeric_columns: Sequence[str], mean: Sequence[float], scale: Sequence[float],
+                 categorical_columns: Mapping[str, Sequence] = None):
+        """
+        Fitted preprocessing pipeline turning user preference dicts into model input rows.
+
+        Produces the same layout as preprocess_user_preferences: standardized numeric
+        columns in schema order, followed by a one-hot block per categorical column with
+        its categories in sorted order. The schema is fixed at fit time, so the output
+        no longer depends on the key order of the request or on which categories happen
+        to appear in a batch. Missing numeric values map to the training mean, missing or
+        unseen categories to an all-zero block.
+
+        Args:
+            numeric_columns (Sequence[str]): Names of the numeric preferences, in output order.
+            mean (Sequence[float]): Training mean of each numeric column.
+            scale (Sequence[float]): Training standard deviation of each numeric column (1 where constant).
+            categorical_columns (Mapping[str, Sequence]): Known categories of each categorical preference.
+        """
+        self.numeric_columns = list(numeric_columns)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.categorical_columns = {name: list(categories) for name, categories in (categorical_columns or {}).items()}
+
+        if len(self.mean) != len(self.numeric_columns) or len(self.scale) != len(self.numeric_columns):
+            raise ValueError("mean and scale must have one entry per numeric column")
+
+        self._inverse_scale = (1.0 / self.scale).astype(np.float32)
+        # Column offset, category codes and (for string categories) the sorted category
+        # array used to encode NumPy string columns with one searchsorted
+        self._category_blocks = []
+        offset = len(self.numeric_columns)
+        for name, categories in self.categorical_columns.items():
+            codes = _CategoryCodes((category, i) for i, category in enumerate(categories))
+            string_categories = np.array(categories) if categories and all(isinstance(c, str) for c in categories) else None
+            self._category_blocks.append((name, offset, codes, string_categories))
+            offset += len(categories)
+        self.num_features = offset
+
+    @classmethod
+    def fit(cls, preferences) -> 'PreferenceVectorizer':
+        """
+        Fits the schema, category maps and scaler statistics on training data.
+
+        Args:
+            preferences: Column mapping such as a pd.DataFrame or {name: values}. Columns of
+                string or object dtype are categorical, all others numeric.
+
+        Returns:
+            PreferenceVectorizer: The fitted vectorizer.
+        """
+        numeric_columns, mean, scale, categorical_columns = [], [], [], {}
+        for name in preferences:
+            values = np.asarray(preferences[name])
+            if values.dtype.kind in 'OUS':
+                categorical_columns[name] = sorted({value for value in values.tolist() if not _is_missing(value)})
+            elif values.dtype.kind == 'b':
+                # Flags pass through unscaled, as preprocess_user_preferences does
+                numeric_columns.append(name)
+                mean.append(0.0)
+                scale.append(1.0)
+            else:
+                values = values.astype(np.float64)
+                numeric_columns.append(name)
+                mean.append(float(np.nanmean(values)) if len(values) else 0.0)
+                std = float(np.nanstd(values)) if len(values) else 0.0
+                scale.append(std if std > 0 else 1.0)
+        return cls(numeric_columns, mean, scale, categorical_columns)
+
+    @property
+    def feature_names(self) -> list:
+        names = list(self.numeric_columns)
+        for name, categories in self.categorical_columns.items():
+            names.extend(f"{name}_{category}" for category in categories)
+        return names
+
+    @property
+    def nbytes(self) -> int:
+        return self.mean.nbytes + self.scale.nbytes
+
+    def transform(self, user_preferences: dict) -> np.ndarray:
+        """
+        Vectorizes one user's preferences.
+
+        Args:
+            user_preferences (dict): Preference values by name.
+
+        Returns:
+            np.ndarray: float32 array of shape (1, num_features).
+        """
+        out = np.zeros((1, self.num_features), dtype=np.float32)
+        numeric = out[:, :len(self.numeric_columns)]
+        numeric[0] = [user_preferences.get(name) for name in self.numeric_columns]
+        for name, offset, codes, _ in self._category_blocks:
+            code = codes[user_preferences.get(name)]
+            if code >= 0:
+                out[0, offset + code] = 1.0
+        self._standardize(numeric)
+        return out
+
+    def transform_batch(self, preferences_batch: Sequence[dict], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorizes a batch of preference dicts into one preallocated matrix.
+
+        Args:
+            preferences_batch (Sequence[dict]): One preference dict per user.
+            out (np.ndarray): Optional float32 buffer of shape (len(preferences_batch), num_features) to fill.
+
+        Returns:
+            np.ndarray: float32 array of shape (len(preferences_batch), num_features).
+        """
+        num_rows = len(preferences_batch)
+        out = self._output(num_rows, out)
+        numeric = out[:, :len(self.numeric_columns)]
+        for j, name in enumerate(self.numeric_columns):
+            try:
+                # C-level pass over the rows while every row has a numeric value
+                numeric[:, j] = np.fromiter(map(itemgetter(name), preferences_batch), np.float32, num_rows)
+            except (KeyError, TypeError):
+                numeric[:, j] = np.array([row.get(name) for row in preferences_batch], dtype=np.float32)
+        for name, offset, codes, string_categories in self._category_blocks:
+            try:
+                values = list(map(itemgetter(name), preferences_batch))
+            except KeyError:
+                values = [row.get(name) for row in preferences_batch]
+            self._one_hot(out, offset, len(codes), self._category_codes(codes, string_categories, values))
+        self._standardize(numeric)
+        return out
+
+    def transform_columns(self, preferences_columns: Mapping[str, Sequence], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorizes a columnar batch, e.g. a pd.DataFrame or {name: [value_per_user, ...]}.
+
+        Args:
+            preferences_columns (Mapping[str, Sequence]): Equal-length value sequences by preference name.
+            out (np.ndarray): Optional float32 buffer of shape (num_users, num_features) to fill.
+
+        Returns:
+            np.ndarray: float32 array of shape (num_users, num_features).
+        """
+        lengths = {len(preferences_columns[name]) for name in preferences_columns}
+        if len(lengths) > 1:
+            raise ValueError("All preference columns must have the same length")
+        num_rows = lengths.pop() if lengths else 0
+
+        out = self._output(num_rows, out)
+        numeric = out[:, :len(self.numeric_columns)]
+        for j, name in enumerate(self.numeric_columns):
+            if name in preferences_columns:
+                numeric[:, j] = np.asarray(preferences_columns[name], dtype=np.float32)
+            else:
+                numeric[:, j] = np.nan
+        for name, offset, codes, string_categories in self._category_blocks:
+            if name in preferences_columns:
+                category_codes = self._category_codes(codes, string_categories, preferences_columns[name])
+            else:
+                category_codes = np.full(num_rows, -1, dtype=np.intp)
+            self._one_hot(out, offset, len(codes), category_codes)
+        self._standardize(numeric)
+        return out
+
+    def save(self, path: str) -> None:
+        """
+        Writes the fitted pipeline as JSON, atomically so serving never reads a partial file.
+
+        Args:
+            path (str): Destination file, by convention f"{model_path}{VECTORIZER_FILE_SUFFIX}".
+        """
+        schema = {
+            'version': VECTORIZER_FORMAT_VERSION,
+            'numeric_columns': self.numeric_columns,
+            'mean': self.mean.tolist(),
+            'scale': self.scale.tolist(),
+            'categorical_columns': self.categorical_columns
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(schema, f, indent=2)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> 'PreferenceVectorizer':
+        with open(path) as f:
+            schema = json.load(f)
+        if schema.get('version') != VECTORIZER_FORMAT_VERSION:
+            raise ValueError(f"Unsupported preference vectorizer version in {path}: {schema.get('version')}")
+        return cls(schema['numeric_columns'], schema['mean'], schema['scale'], schema['categorical_columns'])
+
+    def _output(self, num_rows: int, out: Optional[np.ndarray]) -> np.ndarray:
+        if out is None:
+            return np.empty((num_rows, self.num_features), dtype=np.float32)
+        if out.shape != (num_rows, self.num_features) or out.dtype != np.float32:
+            raise ValueError(f"out must be a float32 array of shape {(num_rows, self.num_features)}")
+        return out
+
+    def _category_codes(self, codes: '_CategoryCodes', string_categories: Optional[np.ndarray], values) -> np.ndarray:
+        if not isinstance(values, list):
+            values = np.asarray(values)
+            if string_categories is not None and values.dtype.kind == string_categories.dtype.kind:
+                # Vectorized lookup in the sorted categories, no per-value Python call
+                positions = np.minimum(np.searchsorted(string_categories, values), len(string_categories) - 1)
+                return np.where(string_categories[positions] == values, positions, -1)
+            values = values.tolist()
+        return np.fromiter(map(codes.__getitem__, values), np.intp, len(values))
+
+    def _one_hot(self, out: np.ndarray, offset: int, block_size: int, codes: np.ndarray) -> None:
+        out[:, offset:offset + block_size] = 0.0
+        rows = np.flatnonzero(codes >= 0)
+        out[rows, offset + codes[rows]] = 1.0
+
+    def _standardize(self, numeric: np.ndarray) -> None:
+        missing = np.isnan(numeric)
+        if missing.any():
+            np.copyto(numeric, self.mean, where=missing)
+        numeric -= self.mean
+        numeric *= self._inverse_scale
+
+
+class _CategoryCodes(dict):
+    # Category -> one-hot index; missing and unseen values map to -1 (no column set)
+    def __missing__(self, category) -> int:
+        return -1
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+import numpy as np
+from typing import Tuple
+from PIL import Image
+from src.ai.config import PRODUCT_IMAGE_CACHE_MAX_BYTES, PRODUCT_DESIGN_BOX_DEFAULT
+from src.ai.utils.lruCache import LRUCache
+from src.ai.utils.metrics import metrics
+
+PLACEMENT_FILE_SUFFIX = '.placement.json'
+
+
+def placement_path(product_image_path: str) -> str:
+    return os.path.splitext(product_image_path)[0] + PLACEMENT_FILE_SUFFIX
+
+
+def _file_signature(path: str) -> tuple:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ProductImage:
+    def __init__(self, image: Image.Image, design_box: Tuple[int, int, int, int], print_mask: np.ndarray, signature: tuple):
+        """
+        A decoded product image with the placement metadata needed to apply designs to it.
+
+        Args:
+            image (Image.Image): Fully decoded product image; treat as read-only and copy before drawing.
+            design_box (tuple): (left, top, right, bottom) pixel box the design is fitted into.
+            print_mask (np.ndarray): float32 (height, width) mask over design_box, 1 where ink may be printed.
+            signature (tuple): (mtime_ns, size) of the image and placement files the entry was built from.
+        """
+        self.image = image
+        self.design_box = design_box
+        self.print_mask = print_mask
+        self.signature = signature
+
+    @property
+    def design_box_size(self) -> Tuple[int, int]:
+        left, top, right, bottom = self.design_box
+        return right - left, bottom - top
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.image.getbands()) * self.image.width * self.image.height + self.print_mask.nbytes
+
+
+def _default_design_box(size: Tuple[int, int]) -> Tuple[int, int, int, int]:
+    width, height = size
+    left, top, right, bottom = PRODUCT_DESIGN_BOX_DEFAULT
+    return int(left * width), int(top * height), int(right * width), int(bottom * height)
+
+
+def load_product_image(product_image_path: str) -> ProductImage:
+    """
+    Decodes a product image and precomputes where designs are placed on it.
+
+    The design box comes from a '<name>.placement.json' file next to the image when
+    present ({"design_box": [left, top, right, bottom], "print_mask": "mask.png"}),
+    otherwise from PRODUCT_DESIGN_BOX_DEFAULT as fractions of the image size. The
+    print mask is the optional mask image, multiplied by the product's own alpha so
+    designs never spill onto transparent background.
+
+    Args:
+        product_image_path (str): Path to the product image.
+
+    Returns:
+        ProductImage: Decoded image with its placement metadata.
+    """
+    signature = (_file_signature(product_image_path), _file_signature(placement_path(product_image_path)))
+
+    with Image.open(product_image_path) as source:
+        has_alpha = 'A' in source.getbands() or 'transparency' in source.info
+        image = source.convert('RGBA' if has_alpha else 'RGB')
+
+    placement = {}
+    if signature[1] is not None:
+        with open(placement_path(product_image_path)) as f:
+            placement = json.load(f)
+
+    left, top, right, bottom = placement.get('design_box') or _default_design_box(image.size)
+    left, top = max(0, int(left)), max(0, int(top))
+    right, bottom = min(image.width, int(right)), min(image.height, int(bottom))
+    if right <= left or bottom <= top:
+        raise ValueError(f"Empty design box for product image {product_image_path}")
+    design_box = (left, top, right, bottom)
+
+    print_mask = np.ones((bottom - top, right - left), dtype=np.float32)
+    if placement.get('print_mask'):
+        mask_path = os.path.join(os.path.dirname(product_image_path), placement['print_mask'])
+        with Image.open(mask_path) as mask:
+            print_mask *= np.asarray(mask.convert('L').resize(image.size).crop(design_box), dtype=np.float32) / 255.0
+    if has_alpha:
+        print_mask *= np.asarray(image.getchannel('A').crop(design_box), dtype=np.float32) / 255.0
+
+    return ProductImage(image, design_box, print_mask, signature)
+
+
+class ProductImageCache:
+    def __init__(self, max_bytes: int):
+        """
+        Memory-bounded LRU cache of decoded product images and their placement metadata.
+
+        Entries are validated against the (mtime_ns, size) of the image and placement
+        files on every lookup, so replacing a product photo takes effect on the next
+        request at the cost of a stat call rather than a decode.
+
+        Args:
+            max_bytes (int): Upper bound on the decoded size of cached images.
+        """
+        self._cache = LRUCache(max_bytes, sizeof=lambda entry: entry.nbytes)
+        self._lock = threading.Lock()
+        self.invalidations = 0
+
+    def get(self, product_image_path: str) -> ProductImage:
+        path = os.path.abspath(product_image_path)
+        entry = self._cache.get(path)
+        if entry is not None:
+            current = (_file_signature(path), _file_signature(placement_path(path)))
+            if current == entry.signature:
+                return entry
+            with self._lock:
+                self.invalidations += 1
+
+        entry = load_product_image(path)
+        self._cache.put(path, entry)
+        return entry
+
+    def invalidate(self, product_image_path: str) -> None:
+        self._cache.pop(os.path.abspath(product_image_path))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        stats = self._cache.stats()
+        with self._lock:
+            stats['invalidations'] = self.invalidations
+        return stats
+
+
+product_image_cache = ProductImageCache(PRODUCT_IMAGE_CACHE_MAX_BYTES)
+metrics.register_collector('product_image_cache', product_image_cache.stats)
@@ -0,0 +1,122 @@
+import hashlib
+import threading
+import time
+import numpy as np
+from typing import Callable
+from src.ai.config import STYLE_MATCH_CACHE_MAX_BYTES, STYLE_MATCH_CACHE_TTL_SECONDS
+from src.ai.utils.lruCache import LRUCache
+from src.ai.utils.metrics import metrics
+
+# Approximate per-entry cost on top of the cached array: key, tuple and float objects
+ENTRY_OVERHEAD_BYTES = 256
+
+
+def recommendation_cache_key(preferences_vector: np.ndarray, model_version: str) -> str:
+    """
+    Canonical hash of a style match: a SHA-256 over the model-ready preference vector and
+    the model version that determines the result.
+
+    Args:
+        preferences_vector (np.ndarray): Vectorized preferences of one user.
+        model_version (str): Active version of the style matcher.
+
+    Returns:
+        str: Hex digest identifying the result.
+    """
+    # Same float32 bytes for equal vectors whatever their input dtype, and -0.0 == 0.0
+    vector = np.ascontiguousarray(preferences_vector, dtype=np.float32) + np.float32(0.0)
+    digest = hashlib.sha256()
+    digest.update(f"{model_version}\0".encode())
+    digest.update(f"{vector.shape}\0".encode())
+    digest.update(vector.data)
+    return digest.hexdigest()
+
+
+def _entry_size(entry: tuple) -> int:
+    return entry[0].nbytes + ENTRY_OVERHEAD_BYTES
+
+
+class RecommendationCache:
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        """
+        Bounded cache of style match results in front of the style matcher.
+
+        Entries are evicted least-recently-used first once max_bytes is reached and
+        expire ttl_seconds after they were computed. Results are the style matcher's
+        probabilities, which do not depend on the product catalog, so keys hold only the
+        preference vector and the model version. While requests alternate between the old
+        and new version during a hot swap both stay cached; once the old version is retired
+        its entries age out through the LRU.
+
+        Args:
+            max_bytes (int): Memory budget of the cached results.
+            ttl_seconds (float): Lifetime of an entry.
+        """
+        self.ttl_seconds = ttl_seconds
+        self._cache = LRUCache(max_bytes, sizeof=_entry_size)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.saved_seconds = 0.0
+
+    def get_or_compute(self, preferences_vector: np.ndarray, model_version: str,
+                       compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        Returns the cached result for a user's preferences, computing and caching it on a miss.
+
+        Args:
+            preferences_vector (np.ndarray): Vectorized preferences of one user.
+            model_version (str): Active version of the style matcher.
+            compute (Callable): Zero-argument function computing the result on a miss.
+
+        Returns:
+            np.ndarray: The result, read-only since it is shared by every hit.
+        """
+        key = recommendation_cache_key(preferences_vector, model_version)
+
+        entry = self._cache.get(key)
+        if entry is not None:
+            result, expires_at, compute_seconds = entry
+            if time.monotonic() < expires_at:
+                with self._lock:
+                    self.hits += 1
+                    self.saved_seconds += compute_seconds
+                return result
+            self._cache.pop(key)
+            with self._lock:
+                self.expirations += 1
+
+        with self._lock:
+            self.misses += 1
+        start = time.perf_counter()
+        result = np.array(compute())
+        compute_seconds = time.perf_counter() - start
+
+        result.setflags(write=False)
+        self._cache.put(key, (result, time.monotonic() + self.ttl_seconds, compute_seconds))
+        return result
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        cache_stats = self._cache.stats()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': cache_stats['entries'],
+                'bytes': cache_stats['bytes'],
+                'max_bytes': cache_stats['max_bytes'],
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'expirations': self.expirations,
+                'evictions': cache_stats['evictions'],
+                'saved_seconds': self.saved_seconds
+            }
+
+
+recommendation_cache = RecommendationCache(STYLE_MATCH_CACHE_MAX_BYTES, STYLE_MATCH_CACHE_TTL_SECONDS)
+metrics.register_collector('style_match_cache', recommendation_cache.stats)
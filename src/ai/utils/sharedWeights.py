@@ -0,0 +1,56 @@
+import os
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Dict
+from src.ai.models.modelArtifact import align_offset
+
+
+class SharedArrays:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Packs named arrays into a single POSIX shared memory block.
+
+        Processes forked after construction inherit the mapping, so the weights exist
+        once in physical memory however many workers serve them. The views in `arrays`
+        are read-only so no process can modify or privately copy a shared page.
+
+        Args:
+            arrays (Dict[str, np.ndarray]): Arrays to share, by name.
+        """
+        layout, offset = {}, 0
+        arrays = {key: np.ascontiguousarray(array) for key, array in arrays.items()}
+        for key, array in arrays.items():
+            # Each array starts on a cache-line boundary, as in a model artifact
+            offset = align_offset(offset)
+            layout[key] = (offset, array.shape, array.dtype)
+            offset += array.nbytes
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self._owner_pid = os.getpid()
+        self.layout = layout
+        self.arrays = {}
+        for key, array in arrays.items():
+            view = self._view(key)
+            view[...] = array
+            view.flags.writeable = False
+            self.arrays[key] = view
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def nbytes(self) -> int:
+        return self._shm.size
+
+    def unlink(self) -> None:
+        """
+        Removes the block once no new process needs to attach; existing mappings stay
+        valid until their processes exit. Only the creating process unlinks.
+        """
+        if os.getpid() == self._owner_pid:
+            self._shm.unlink()
+
+    def _view(self, key: str) -> np.ndarray:
+        offset, shape, dtype = self.layout[key]
+        return np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=offset)
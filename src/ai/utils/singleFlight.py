@@ -0,0 +1,84 @@
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Hashable
+from src.ai.utils.metrics import metrics
+
+
+class SingleFlight:
+    def __init__(self, name: str = 'single_flight', timeout: float = None):
+        """
+        Coalesces concurrent calls for the same key into one execution.
+
+        The first caller for a key runs the function; callers arriving while it is in
+        flight wait for and share its result (or exception). Nothing is cached once
+        the call completes, so later callers start a new execution.
+
+        Args:
+            name (str): Key of the exported stats.
+            timeout (float): Default seconds a waiting caller blocks before giving up; None waits forever.
+        """
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.deduplicated = 0
+        self.timeouts = 0
+        self.errors = 0
+        metrics.register_collector(name, self.stats)
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: float = None) -> Any:
+        """
+        Runs fn, or waits for the in-flight call with the same key.
+
+        Args:
+            key (Hashable): Identity of the computation.
+            fn (Callable): Zero-argument function computing the result.
+            timeout (float): Seconds to wait on an in-flight call, overriding the default.
+
+        Returns:
+            Any: The result of fn, possibly computed for another caller.
+
+        Raises:
+            TimeoutError: If waiting on another caller's execution exceeds the timeout.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.executions += 1
+            else:
+                self.deduplicated += 1
+
+        if leader:
+            try:
+                result = fn()
+            except BaseException as e:
+                with self._lock:
+                    self.errors += 1
+                    del self._calls[key]
+                future.set_exception(e)
+                raise
+            with self._lock:
+                del self._calls[key]
+            future.set_result(result)
+            return result
+
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise TimeoutError(f"Timed out waiting for in-flight call {key!r}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            calls = self.executions + self.deduplicated
+            return {
+                'in_flight': len(self._calls),
+                'executions': self.executions,
+                'deduplicated': self.deduplicated,
+                'deduplicated_ratio': self.deduplicated / calls if calls else 0.0,
+                'timeouts': self.timeouts,
+                'errors': self.errors
+            }
@@ -0,0 +1,75 @@
+import json
+from typing import Iterable, Optional
+from flask import Request
+from src.backend.utils.logger import logger
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+SSE_MIMETYPE = 'text/event-stream'
+
+_STREAM_FORMATS = {
+    'ndjson': NDJSON_MIMETYPE,
+    'sse': SSE_MIMETYPE,
+}
+
+
+def negotiate_stream_format(request: Request) -> Optional[str]:
+    """
+    Picks a streaming format from the request's 'stream' field or Accept header.
+
+    Args:
+        request (Request): The incoming Flask request.
+
+    Returns:
+        Optional[str]: 'ndjson', 'sse', or None for a regular JSON response.
+    """
+    body = request.get_json(silent=True)
+    # Only an object body can carry the 'stream' field; a list body is a regular payload
+    requested = (body.get('stream') if isinstance(body, dict) else None) or request.args.get('stream')
+    if requested in _STREAM_FORMATS:
+        return requested
+
+    # JSON is listed first so clients sending */* keep getting a regular response
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE, SSE_MIMETYPE])
+    for stream_format, mimetype in _STREAM_FORMATS.items():
+        if best == mimetype:
+            return stream_format
+    return None
+
+
+def stream_mimetype(stream_format: str) -> str:
+    return _STREAM_FORMATS[stream_format]
+
+
+def encode_stream(events: Iterable[dict], stream_format: str, event_name: str = 'message',
+                  error_message: str = 'An error occurred while streaming the response'):
+    """
+    Serializes dict events as NDJSON lines or server-sent events.
+
+    An error raised by events is logged and sent as a final {'error': error_message}
+    event, since the response status has already been committed once streaming starts.
+
+    Args:
+        events (Iterable[dict]): Events to send, in order.
+        stream_format (str): 'ndjson' or 'sse'.
+        event_name (str): SSE event name for regular events.
+        error_message (str): Client-facing message sent if events raises.
+
+    Yields:
+        str: Serialized chunks ready to be written to the response.
+    """
+    def serialize(event, name):
+        payload = json.dumps(event)
+        if stream_format == 'sse':
+            return f"event: {name}\ndata: {payload}\n\n"
+        return f"{payload}\n"
+
+    try:
+        for event in events:
+            yield serialize(event, event_name)
+    except Exception as e:
+        logger.error(f"Error while streaming {event_name} events: {str(e)}")
+        yield serialize({'error': error_message}, 'error')
+        return
+
+    if stream_format == 'sse':
+        yield serialize({}, 'end')
@@ -0,0 +1,35 @@
+import threading
+from src.ai.config import TF_INTRA_OP_THREADS, TF_INTER_OP_THREADS
+from src.backend.utils.logger import logger
+
+_lock = threading.Lock()
+_configured = False
+
+
+def configure_tensorflow_threads() -> None:
+    """
+    Sizes TensorFlow's intra-op and inter-op thread pools from TF_INTRA_OP_THREADS and
+    TF_INTER_OP_THREADS, so each serving worker uses only its share of the cores.
+
+    TensorFlow fixes its pools when the runtime initializes, so this must run before the
+    first model is built; model loaders call it first thing and later calls are no-ops.
+    """
+    global _configured
+    with _lock:
+        if _configured:
+            return
+        _configured = True
+        if TF_INTRA_OP_THREADS is None and TF_INTER_OP_THREADS is None:
+            return
+
+        import tensorflow as tf
+        try:
+            if TF_INTRA_OP_THREADS is not None:
+                tf.config.threading.set_intra_op_parallelism_threads(TF_INTRA_OP_THREADS)
+            if TF_INTER_OP_THREADS is not None:
+                tf.config.threading.set_inter_op_parallelism_threads(TF_INTER_OP_THREADS)
+        except RuntimeError as e:
+            # The runtime was already initialized by an earlier TensorFlow call
+            logger.error(f"Error configuring TensorFlow threads: {str(e)}")
+            return
+        logger.info(f"TensorFlow threads: intra-op {TF_INTRA_OP_THREADS}, inter-op {TF_INTER_OP_THREADS}")
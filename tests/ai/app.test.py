@@ -0,0 +1,188 @@
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from io import BytesIO
+from PIL import Image
+
+# The app reads its config at import: serve the routes without the background warmup or warm pool
+os.environ['WARMUP_ENABLED'] = '0'
+os.environ['DESIGN_WARM_POOL_ENABLED'] = '0'
+if 'src.ai.config' in sys.modules:
+    importlib.reload(sys.modules['src.ai.config'])
+
+import src.ai.app as ai_app
+from src.ai.models.designGeneratorEngine import ENGINE_FILE_SUFFIX
+from src.ai.models.designGeneratorModel import DesignGeneratorModel
+from src.ai.services.designGenerationService import DesignGenerationService
+from src.ai.utils.imageEncoding import encode_image, encode_image_base64, decode_image, decode_image_base64
+from src.ai.utils.modelRegistry import model_registry
+from src.ai.utils.streaming import NDJSON_MIMETYPE, SSE_MIMETYPE
+from src.shared.constants.index import StyleLines
+
+# Measured at ~0.3s on a development machine, versus ~3.3s when the services imported
+# TensorFlow, pandas and sklearn at module level; the budget leaves headroom for slow CI hosts
+IMPORT_TIME_BUDGET_SECONDS = 1.5
+
+# Loaded by the background warmup, or by training and evaluation code, never by importing the app
+HEAVY_MODULES = ('tensorflow', 'keras', 'pandas', 'sklearn', 'matplotlib', 'seaborn')
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+IMPORT_SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import src.ai.app
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+class TestAppImport(unittest.TestCase):
+    def import_app(self):
+        # A fresh interpreter, so modules imported by other tests do not count
+        env = dict(os.environ, WARMUP_ENABLED='0', DESIGN_WARM_POOL_ENABLED='0')
+        result = subprocess.run(
+            [sys.executable, '-c', IMPORT_SCRIPT], env=env, cwd=REPO_ROOT, capture_output=True, text=True, timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_import_does_not_load_heavy_libraries(self):
+        self.assertEqual(self.import_app()['loaded'], [])
+
+    def test_import_time_within_budget(self):
+        # Best of three, to ignore a cold filesystem cache
+        seconds = min(self.import_app()['seconds'] for _ in range(3))
+        self.assertLess(seconds, IMPORT_TIME_BUDGET_SECONDS)
+
+class AppRouteTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Serve the design routes from a NumPy generator exported to a temporary directory
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.model_path = os.path.join(cls.directory.name, 'design_generator')
+        DesignGeneratorModel(16, len(StyleLines)).export_engine(f"{cls.model_path}{ENGINE_FILE_SUFFIX}")
+        cls.original_service = ai_app.design_generation_service
+        ai_app.design_generation_service = DesignGenerationService(cls.model_path, engine='numpy')
+        cls.client = ai_app.app.test_client()
+        cls.design = Image.new('RGB', (28, 28), (200, 40, 90))
+        cls.product_paths = []
+        for name, size in (('shirt.png', (60, 80)), ('mug.png', (90, 50))):
+            cls.product_paths.append(os.path.join(cls.directory.name, name))
+            Image.new('RGBA', size, (240, 240, 240, 255)).save(cls.product_paths[-1])
+
+    @classmethod
+    def tearDownClass(cls):
+        ai_app.design_generation_service = cls.original_service
+        model_registry.evict(f"{cls.model_path}{ENGINE_FILE_SUFFIX}")
+        cls.directory.cleanup()
+
+def multipart_mixed_parts(response) -> list:
+    # (Content-ID, body) of each part of a multipart/mixed response
+    boundary = response.headers['Content-Type'].split('boundary=')[1].encode()
+    parts = []
+    for chunk in response.get_data().split(b"--" + boundary)[1:-1]:
+        head, data = chunk.lstrip(b"\r\n").split(b"\r\n\r\n", 1)
+        headers = dict(line.split(': ', 1) for line in head.decode().split('\r\n'))
+        parts.append((headers['Content-ID'], data[:-2]))
+    return parts
+
+class TestBinaryImageTransport(AppRouteTestCase):
+    def test_apply_design_binary_upload_and_response(self):
+        response = self.client.post(
+            '/apply-design', headers={'Accept': 'image/png'},
+            data={'design': (BytesIO(encode_image(self.design, 'png').getvalue()), 'design.png'),
+                  'product_image_path': self.product_paths[0]}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'image/png')
+        binary_result = decode_image(response.get_data())
+        self.assertEqual(binary_result.size, (60, 80))
+
+        # A legacy client sending and receiving base64 JSON gets the same image
+        response = self.client.post('/apply-design', json={
+            'design_base64': encode_image_base64(self.design), 'product_image_path': self.product_paths[0]
+        })
+        self.assertEqual(response.status_code, 200)
+        legacy_result = decode_image_base64(response.get_json()['applied_design'])
+        self.assertEqual(list(legacy_result.getdata()), list(binary_result.getdata()))
+
+    def test_apply_design_raw_body_with_json_response(self):
+        response = self.client.post(
+            f"/apply-design?product_image_path={self.product_paths[1]}",
+            data=encode_image(self.design, 'png').getvalue(), content_type='application/octet-stream'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(decode_image_base64(response.get_json()['applied_design']).size, (90, 50))
+
+    def test_bulk_apply_multipart_response(self):
+        response = self.client.post(
+            '/apply-design/bulk', headers={'Accept': 'multipart/mixed'},
+            data={'design': (BytesIO(encode_image(self.design, 'png').getvalue()), 'design.png'),
+                  'product_image_paths': self.product_paths}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        sizes = {index: decode_image(data).size for index, data in multipart_mixed_parts(response)}
+        self.assertEqual(sizes, {'<0>': (60, 80), '<1>': (90, 50)})
+
+    def test_design_variations_binary_and_legacy(self):
+        response = self.client.post(
+            '/design-variations?num_variations=3', headers={'Accept': 'multipart/mixed'},
+            data=encode_image(self.design, 'png').getvalue(), content_type='image/png'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        parts = multipart_mixed_parts(response)
+        self.assertEqual([index for index, _ in parts], ['<0>', '<1>', '<2>'])
+        self.assertEqual(decode_image(parts[0][1]).size, (28, 28))
+
+        response = self.client.post('/design-variations', json={
+            'initial_design_base64': encode_image_base64(self.design), 'num_variations': 3
+        })
+        self.assertEqual(len(response.get_json()['variations']), 3)
+
+class TestDesignVariationsStreaming(AppRouteTestCase):
+    def request_variations(self, num_variations, **kwargs):
+        body = {'initial_design_base64': encode_image_base64(self.design), 'num_variations': num_variations}
+        body.update(kwargs.pop('json', {}))
+        return self.client.post('/design-variations', json=body, **kwargs)
+
+    def test_ndjson_stream(self):
+        response = self.request_variations(3, json={'stream': 'ndjson'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, NDJSON_MIMETYPE)
+        events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([event['index'] for event in events], [0, 1, 2])
+        self.assertEqual(decode_image_base64(events[0]['variation']).size, (28, 28))
+
+    def test_sse_stream_from_accept_header(self):
+        response = self.request_variations(2, headers={'Accept': SSE_MIMETYPE})
+
+        self.assertEqual(response.mimetype, SSE_MIMETYPE)
+        blocks = response.get_data(as_text=True).strip().split('\n\n')
+        names = [block.splitlines()[0] for block in blocks]
+        self.assertEqual(names, ['event: variation', 'event: variation', 'event: end'])
+        self.assertEqual(json.loads(blocks[1].splitlines()[1][len('data: '):])['index'], 1)
+
+    def test_regular_json_response(self):
+        response = self.request_variations(2)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()['variations']), 2)
+
+    def test_invalid_num_variations_is_a_bad_request(self):
+        for num_variations in (0, -1, None, 'three', [3]):
+            for stream in (None, 'ndjson'):
+                response = self.request_variations(num_variations, json={'stream': stream})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('num_variations', response.get_json()['error'])
+
+if __name__ == '__main__':
+    unittest.main()
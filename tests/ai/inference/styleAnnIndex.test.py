@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.ai.inference import styleAnnIndex
+from src.ai.inference.styleAnnIndex import StyleAnnIndex, get_ann_index, _index_file_name
+from src.ai.inference.styleCatalogIndex import StyleCatalogIndex
+from src.shared.constants.index import StyleLines
+
+class TestStyleAnnIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(7)
+        catalog = [
+            {'id': f"sku-{i}", 'style_attributes': dict(zip([s.name for s in StyleLines], rng.random(len(StyleLines))))}
+            for i in range(4000)
+        ]
+        cls.catalog_index = StyleCatalogIndex.build(catalog, catalog_version='ann-test-v1')
+        cls.product_ids, cls.product_matrix = cls.catalog_index.product_matrix()
+        cls.queries = rng.random((25, len(StyleLines)))
+        cls.index = StyleAnnIndex(num_lists=32, num_probes=8).build(cls.product_ids, cls.product_matrix)
+
+    def recall(self, index, n, num_probes=None):
+        found = 0
+        for query in self.queries:
+            exact = {product_id for product_id, _, _ in self.catalog_index.top_n(query, n)}
+            found += len(exact & {product_id for product_id, _ in index.search(query, n, num_probes)})
+        return found / (n * len(self.queries))
+
+    def test_recall_against_exact_index(self):
+        self.assertGreaterEqual(self.recall(self.index, 10), 0.9)
+        # Probing every list is an exact search
+        self.assertEqual(self.recall(self.index, 10, num_probes=32), 1.0)
+
+    def test_scores_are_exact_inner_products(self):
+        scores = dict(zip(self.product_ids, self.product_matrix @ self.queries[0].astype(np.float32)))
+        results = self.index.search(self.queries[0], 20)
+
+        self.assertEqual(len(results), 20)
+        for product_id, score in results:
+            self.assertAlmostEqual(score, float(scores[product_id]), places=4)
+        self.assertEqual([score for _, score in results], sorted((score for _, score in results), reverse=True))
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'style_ann.npz')
+            self.index.save(path)
+            loaded = StyleAnnIndex.load(path)
+
+        self.assertEqual((loaded.num_lists, loaded.num_probes), (32, 8))
+        self.assertEqual(len(loaded), len(self.index))
+        for query in self.queries[:5]:
+            self.assertEqual(loaded.search(query, 10), self.index.search(query, 10))
+
+    def test_mixed_product_ids_keep_their_type(self):
+        product_ids = [i if i % 2 else f"sku-{i}" for i in range(len(self.product_ids))]
+        index = StyleAnnIndex(num_lists=8, num_probes=8).build(product_ids, self.product_matrix)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'style_ann.npz')
+            index.save(path)
+            loaded = StyleAnnIndex.load(path)
+
+        expected = dict(zip(product_ids, self.product_matrix @ self.queries[0].astype(np.float32)))
+        results = loaded.search(self.queries[0], 50)
+        self.assertEqual(results, index.search(self.queries[0], 50))
+        self.assertEqual({type(product_id) for product_id, _ in results}, {int, str})
+        for product_id, score in results:
+            self.assertAlmostEqual(score, float(expected[product_id]), places=4)
+
+class TestGetAnnIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        catalog = [
+            {'id': f"sku-{i}", 'style_attributes': dict(zip([s.name for s in StyleLines], rng.random(len(StyleLines))))}
+            for i in range(300)
+        ]
+        self.catalog_version = 'ann-persist-v1'
+        self.catalog_index = StyleCatalogIndex.build(catalog, catalog_version=self.catalog_version)
+        self.query = rng.random(len(StyleLines))
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings = (styleAnnIndex.STYLE_ANN_INDEX_DIR, styleAnnIndex.STYLE_ANN_NUM_LISTS, styleAnnIndex.STYLE_ANN_NUM_PROBES)
+        styleAnnIndex.STYLE_ANN_INDEX_DIR = os.path.join(self.directory.name, 'ann')
+        styleAnnIndex.STYLE_ANN_NUM_LISTS, styleAnnIndex.STYLE_ANN_NUM_PROBES = 16, 4
+
+    def tearDown(self):
+        styleAnnIndex.STYLE_ANN_INDEX_DIR, styleAnnIndex.STYLE_ANN_NUM_LISTS, styleAnnIndex.STYLE_ANN_NUM_PROBES = self.settings
+        styleAnnIndex._ann_indexes.pop(self.catalog_index.catalog_version)
+        self.directory.cleanup()
+
+    def test_index_is_persisted_and_reloaded(self):
+        first = get_ann_index(self.catalog_index)
+        self.assertIs(get_ann_index(self.catalog_index), first)
+        path = os.path.join(styleAnnIndex.STYLE_ANN_INDEX_DIR, _index_file_name(self.catalog_version))
+        self.assertTrue(os.path.exists(path))
+
+        # A fresh worker loads the persisted index instead of re-clustering the catalog
+        styleAnnIndex._ann_indexes.pop(self.catalog_version)
+
+        def product_matrix():
+            raise AssertionError("the index was rebuilt")
+
+        self.catalog_index.product_matrix = product_matrix
+        reloaded = get_ann_index(self.catalog_index)
+
+        self.assertIsNot(reloaded, first)
+        self.assertEqual(reloaded.search(self.query, 10), first.search(self.query, 10))
+
+    def test_reloaded_index_follows_the_configuration(self):
+        get_ann_index(self.catalog_index)
+        styleAnnIndex._ann_indexes.pop(self.catalog_version)
+
+        styleAnnIndex.STYLE_ANN_NUM_PROBES = 8
+        self.assertEqual(get_ann_index(self.catalog_index).num_probes, 8)
+        styleAnnIndex._ann_indexes.pop(self.catalog_version)
+
+        # A different list count means the persisted clustering is stale
+        styleAnnIndex.STYLE_ANN_NUM_LISTS = 32
+        rebuilt = get_ann_index(self.catalog_index)
+        self.assertEqual((rebuilt.num_lists, len(rebuilt.centroids)), (32, 32))
+        path = os.path.join(styleAnnIndex.STYLE_ANN_INDEX_DIR, _index_file_name(self.catalog_version))
+        self.assertEqual(StyleAnnIndex.load(path).num_lists, 32)
+
+    def test_catalog_version_cannot_escape_the_index_dir(self):
+        self.catalog_index.catalog_version = '../../escaped'
+        get_ann_index(self.catalog_index)
+
+        self.assertEqual(os.listdir(self.directory.name), ['ann'])
+        self.assertEqual(len(os.listdir(styleAnnIndex.STYLE_ANN_INDEX_DIR)), 1)
+
+    def test_requires_a_catalog_version(self):
+        with self.assertRaises(ValueError):
+            get_ann_index(StyleCatalogIndex.build([{'id': 'sku-0', 'style_attributes': {}}]))
+
+if __name__ == '__main__':
+    unittest.main()
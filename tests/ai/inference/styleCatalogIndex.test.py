@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+from src.ai.inference.styleCatalogIndex import (
+    StyleCatalogIndex, product_style_vector, get_catalog_index, update_catalog_index
+)
+from src.shared.constants.index import StyleLines
+
+class TestStyleCatalogIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.catalog = [
+            {'id': f"sku-{i}", 'style_attributes': dict(zip([s.name for s in StyleLines], rng.random(len(StyleLines))))}
+            for i in range(500)
+        ]
+        self.query = rng.random(len(StyleLines))
+        self.index = StyleCatalogIndex.build(self.catalog, catalog_version='v1')
+
+    def exact_ranking(self, catalog):
+        scores = {p['id']: float(product_style_vector(p['style_attributes']) @ self.query) for p in catalog}
+        return sorted(scores, key=scores.get, reverse=True)
+
+    def test_product_style_vector(self):
+        vector = product_style_vector(['casual', 'VINTAGE', 'unknown'])
+        self.assertEqual(vector.shape, (len(StyleLines),))
+        self.assertEqual(vector.sum(), 2.0)
+
+    def test_top_n_matches_exact_sort(self):
+        top = self.index.top_n(self.query, 10)
+
+        self.assertEqual([product_id for product_id, _, _ in top], self.exact_ranking(self.catalog)[:10])
+        scores = [score for _, score, _ in top]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_incremental_updates(self):
+        new_product = {'id': 'sku-new', 'style_attributes': {s.name: 10.0 for s in StyleLines}}
+        updated_product = {'id': 'sku-3', 'style_attributes': {}}
+
+        self.index.upsert_products([new_product, updated_product])
+        self.index.remove_products(['sku-0', 'sku-1', 'missing'])
+
+        expected_catalog = [p for p in self.catalog if p['id'] not in ('sku-0', 'sku-1', 'sku-3')]
+        expected_catalog += [new_product, updated_product]
+
+        self.assertEqual(len(self.index), len(expected_catalog))
+        self.assertEqual(self.index.top_n(self.query, 1)[0][0], 'sku-new')
+        self.assertEqual([p for p, _, _ in self.index.ranked(self.query)][:20], self.exact_ranking(expected_catalog)[:20])
+
+    def test_index_is_reused_per_catalog_version(self):
+        first = get_catalog_index(self.catalog, catalog_version='test-v1')
+        second = get_catalog_index(self.catalog, catalog_version='test-v1')
+        self.assertIs(first, second)
+
+        first_ranking = first.ranked(self.query)
+        updated = update_catalog_index('test-v1', 'test-v2', removed_product_ids=['sku-0'])
+        self.assertIs(get_catalog_index(self.catalog, catalog_version='test-v2'), updated)
+        self.assertEqual(len(updated), len(self.catalog) - 1)
+        # Requests still holding the previous version score it unchanged
+        self.assertIsNot(updated, first)
+        self.assertEqual((first.catalog_version, len(first)), ('test-v1', len(self.catalog)))
+        self.assertEqual(first.ranked(self.query), first_ranking)
+
+if __name__ == '__main__':
+    unittest.main()
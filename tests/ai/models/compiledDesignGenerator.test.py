@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.ai.models.designGeneratorModel import DesignGeneratorModel
+from src.ai.models.compiledDesignGenerator import CompiledDesignGenerator
+
+class TestCompiledDesignGenerator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = DesignGeneratorModel(latent_dim=16, num_classes=6)
+        cls.compiled = CompiledDesignGenerator(cls.model, batch_buckets=(1, 4, 8))
+        cls.compiled.warmup()
+
+    def test_matches_eager_generator_with_padding(self):
+        noise = np.random.normal(0, 1, (3, 16))
+        labels = np.array([0, 2, 5])
+
+        expected = self.model.generate_designs(labels, noise)
+        actual = self.compiled.generate_designs(labels, noise)
+
+        self.assertEqual(actual.shape, (3, 28, 28, 3))
+        np.testing.assert_allclose(actual, expected, atol=1e-5)
+
+    def test_batches_larger_than_biggest_bucket_are_chunked(self):
+        noise = np.random.normal(0, 1, (19, 16))
+        labels = np.arange(19) % 6
+
+        np.testing.assert_allclose(
+            self.compiled.generate_designs(labels, noise), self.model.generate_designs(labels, noise), atol=1e-5
+        )
+
+    def test_single_design_and_variations(self):
+        noise = np.random.normal(0, 1, 16)
+
+        design = self.compiled.generate_design(3, noise)
+        variations = self.compiled.generate_variation(3, np.stack([noise, noise]))
+
+        self.assertEqual(design.shape, (28, 28, 3))
+        np.testing.assert_allclose(variations[1], design, atol=1e-5)
+
+    def test_no_retracing_after_warmup(self):
+        for batch_size in (1, 2, 3, 5, 8):
+            self.compiled.generate_designs(np.zeros(batch_size), np.zeros((batch_size, 16)))
+
+        for function in self.compiled._functions.values():
+            self.assertEqual(function.experimental_get_tracing_count(), 1)
+
+    def test_wraps_a_saved_model(self):
+        # The service's default path: a model restored from disk behind the compiled generator
+        with tempfile.TemporaryDirectory() as directory:
+            model_path = os.path.join(directory, 'design_generator.keras')
+            self.model.save_model(model_path)
+            compiled = CompiledDesignGenerator(DesignGeneratorModel.from_saved(model_path), batch_buckets=(1, 4))
+        compiled.warmup()
+        noise = np.random.normal(0, 1, (4, 16))
+        labels = np.array([1, 3, 4, 0])
+
+        np.testing.assert_allclose(
+            compiled.generate_designs(labels, noise), self.model.generate_designs(labels, noise), atol=1e-5
+        )
+
+if __name__ == '__main__':
+    unittest.main()
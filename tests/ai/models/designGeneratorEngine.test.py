@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import tensorflow as tf
+from src.ai.models.designGeneratorModel import DesignGeneratorModel
+from src.ai.models.designGeneratorEngine import DesignGeneratorEngine, conv2d_transpose
+
+class TestDesignGeneratorEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = DesignGeneratorModel(latent_dim=16, num_classes=6)
+        # Non-trivial BatchNormalization statistics, so folding is actually exercised
+        rng = np.random.default_rng(0)
+        for layer in cls.model.generator.layers:
+            if isinstance(layer, tf.keras.layers.BatchNormalization):
+                shape = layer.moving_mean.shape
+                layer.moving_mean.assign(rng.normal(0, 0.1, shape))
+                layer.moving_variance.assign(rng.uniform(0.5, 1.5, shape))
+                layer.gamma.assign(rng.uniform(0.5, 1.5, shape))
+                layer.beta.assign(rng.normal(0, 0.1, shape))
+        cls.engine = DesignGeneratorEngine.from_keras(cls.model.generator, prototype_samples=16)
+
+    def test_conv2d_transpose_matches_keras(self):
+        for stride in (1, 2):
+            layer = tf.keras.layers.Conv2DTranspose(4, (5, 5), strides=(stride, stride), padding='same')
+            x = np.random.rand(2, 5, 5, 3).astype(np.float32)
+            expected = layer(x).numpy()
+            kernel, bias = layer.get_weights()
+
+            actual = conv2d_transpose(x, kernel.transpose(3, 0, 1, 2), bias, stride)
+
+            np.testing.assert_allclose(actual, expected, atol=1e-5)
+
+    def test_matches_keras_generator(self):
+        noise = np.random.normal(0, 1, (5, 16))
+        labels = np.array([0, 1, 2, 3, 5])
+
+        expected = self.model.generate_designs(labels, noise)
+        actual = self.engine.generate_designs(labels, noise)
+
+        self.assertEqual(actual.shape, (5, 28, 28, 3))
+        np.testing.assert_allclose(actual, expected, atol=1e-4)
+
+    def test_save_and_load_generator_only_artifact(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'design_generator_engine.model')
+            self.model.export_engine(path)
+            loaded = DesignGeneratorEngine.load(path)
+
+            self.assertFalse(loaded.noise_kernel.flags.writeable)
+            self.assertLess(os.path.getsize(path), self.model.generator.count_params() * 4 + loaded.prototypes.nbytes + 4096)
+            noise = np.random.normal(0, 1, (3, 16))
+            np.testing.assert_allclose(
+                loaded.generate_designs([0, 1, 2], noise), self.engine.generate_designs([0, 1, 2], noise), atol=1e-6
+            )
+
+    def test_extract_features_returns_closest_prototype_label(self):
+        for label in range(6):
+            image = self.model.design_to_image(self.engine.prototypes[label])
+            self.assertEqual(self.engine.extract_features(image), label)
+
+    def test_extract_features_differs_from_keras(self):
+        # Keras labels a design with its conditional discriminator, the engine (which ships without
+        # the discriminator) with the nearest prototype, so the same image can get different labels
+        image = self.model.design_to_image(self.engine.prototypes[0])
+        discriminator = self.model.discriminator
+        scores = np.array([[0.1], [0.2], [0.1], [0.3], [0.2], [0.9]], dtype=np.float32)
+        self.model.discriminator = lambda inputs, training=False: tf.constant(scores)
+        try:
+            keras_label = self.model.extract_features(image)
+        finally:
+            self.model.discriminator = discriminator
+
+        self.assertEqual(self.engine.extract_features(image), 0)
+        self.assertEqual(keras_label, 5)
+
+        design = np.asarray(image, dtype=np.float32) / 127.5 - 1.0
+        labels = np.arange(6, dtype=np.int32).reshape(-1, 1)
+        real_scores = discriminator([np.repeat(design[np.newaxis], 6, axis=0), labels], training=False).numpy()
+        self.assertEqual(self.model.extract_features(image), int(np.argmax(real_scores[:, 0])))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.ai.models.designGeneratorModel import DesignGeneratorModel, discriminator_path_for
+
+class TestDesignGeneratorModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = DesignGeneratorModel(latent_dim=16, num_classes=6)
+        cls.noise = np.random.default_rng(0).normal(0, 1, (5, 16)).astype(np.float32)
+
+    def test_batched_generation_matches_single_designs(self):
+        labels = np.array([0, 1, 2, 3, 5])
+
+        designs = self.model.generate_designs(labels, self.noise)
+
+        self.assertEqual(designs.shape, (5, 28, 28, 3))
+        for label, noise, design in zip(labels, self.noise, designs):
+            np.testing.assert_allclose(design, self.model.generate_design(label, noise), atol=1e-5)
+
+    def test_variations_match_single_designs(self):
+        variations = self.model.generate_variation(4, self.noise)
+
+        self.assertEqual(len(variations), len(self.noise))
+        for noise, variation in zip(self.noise, variations):
+            np.testing.assert_allclose(variation, self.model.generate_design(4, noise), atol=1e-5)
+        # A single noise vector is one variation
+        np.testing.assert_allclose(self.model.generate_variation(4, self.noise[0]), variations[:1], atol=1e-5)
+
+    def test_from_saved_restores_dimensions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            generator_path = os.path.join(directory, 'design_generator.keras')
+            self.model.save_model(generator_path)
+            self.assertTrue(os.path.exists(discriminator_path_for(generator_path)))
+            loaded = DesignGeneratorModel.from_saved(generator_path)
+
+        self.assertEqual((loaded.latent_dim, loaded.num_classes), (16, 6))
+        np.testing.assert_allclose(
+            loaded.generate_designs([1, 2], self.noise[:2]), self.model.generate_designs([1, 2], self.noise[:2]), atol=1e-6
+        )
+
+if __name__ == '__main__':
+    unittest.main()
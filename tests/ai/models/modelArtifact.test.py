@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.ai.models.modelArtifact import (
+    ARRAY_ALIGNMENT, ModelArtifact, is_artifact, load_artifact, save_artifact
+)
+
+class TestModelArtifact(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'model.model')
+        self.arrays = {
+            'kernel': np.random.rand(13, 7).astype(np.float32),
+            'bias': np.random.rand(7).astype(np.float32),
+            'table': np.arange(5, dtype=np.int64),
+            'empty': np.zeros((0, 3), dtype=np.float32)
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        save_artifact(self.path, ModelArtifact('test', self.arrays, {'activations': ['relu', 'softmax']}))
+        artifact = load_artifact(self.path, 'test')
+
+        self.assertTrue(is_artifact(self.path))
+        self.assertEqual(artifact.metadata, {'activations': ['relu', 'softmax']})
+        for name, array in self.arrays.items():
+            np.testing.assert_array_equal(artifact.arrays[name], array)
+            self.assertEqual(artifact.arrays[name].dtype, array.dtype)
+
+    def test_arrays_are_aligned_read_only_views(self):
+        save_artifact(self.path, ModelArtifact('test', self.arrays))
+        artifact = load_artifact(self.path)
+
+        for name in ('kernel', 'bias', 'table'):
+            array = artifact.arrays[name]
+            self.assertFalse(array.flags.writeable)
+            self.assertIsInstance(array.base, np.memmap)
+            self.assertEqual(array.ctypes.data % ARRAY_ALIGNMENT, 0)
+
+    def test_rejects_other_files_and_kinds(self):
+        save_artifact(self.path, ModelArtifact('test', self.arrays))
+        with self.assertRaises(ValueError):
+            load_artifact(self.path, 'design_generator')
+
+        other_path = os.path.join(self.temp_dir.name, 'weights.npz')
+        np.savez(other_path, **self.arrays)
+        self.assertFalse(is_artifact(other_path))
+        with self.assertRaises(ValueError):
+            load_artifact(other_path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.ai.models.designGeneratorModel import DesignGeneratorModel
+from src.ai.models.quantizedDesignGenerator import (
+    QuantizedDesignGenerator, compare_generators, export_quantized_generator
+)
+
+class TestQuantizedDesignGenerator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.model = DesignGeneratorModel(latent_dim=16, num_classes=6)
+        cls.path = os.path.join(cls.temp_dir, 'generator.tflite')
+        export_quantized_generator(cls.model.generator, cls.path, mode='int8', num_calibration_samples=32)
+        cls.quantized = QuantizedDesignGenerator(cls.path, feature_model=cls.model, batch_buckets=(1, 4))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir)
+
+    def test_export_is_smaller_than_float_weights(self):
+        self.assertLess(self.quantized.nbytes, self.model.generator.count_params() * 4 / 2)
+
+    def test_outputs_close_to_float_generator(self):
+        error = compare_generators(self.model, self.quantized, num_samples=16)
+
+        self.assertLess(error['mae'], 0.02)
+        self.assertGreater(error['psnr_db'], 30.0)
+
+    def test_padding_and_chunking_preserve_order(self):
+        noise = np.random.normal(0, 1, (6, 16))
+        labels = np.arange(6)
+
+        batch = self.quantized.generate_designs(labels, noise)
+        single = self.quantized.generate_design(labels[5], noise[5])
+
+        self.assertEqual(batch.shape, (6, 28, 28, 3))
+        np.testing.assert_allclose(batch[5], single, atol=1e-6)
+
+    def test_design_to_base64_and_extract_features(self):
+        design = self.quantized.generate_design(0, np.zeros(16))
+
+        image = self.model.design_to_image(design)
+
+        self.assertTrue(self.quantized.design_to_base64(design))
+        self.assertIn(self.quantized.extract_features(image), range(6))
+
+if __name__ == '__main__':
+    unittest.main()
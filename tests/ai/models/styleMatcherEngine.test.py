@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.ai.models.styleMatcherModel import StyleMatcherModel
+from src.ai.models.styleMatcherEngine import StyleMatcherEngine, fold_scaler_into_dense
+from src.shared.constants.index import StyleLines
+
+class TestStyleMatcherEngine(unittest.TestCase):
+    def setUp(self):
+        self.keras_model = StyleMatcherModel()
+        num_features = len(StyleLines)
+        self.keras_model.scaler.fit(np.random.rand(50, num_features) * 10 + 3)
+        self.engine = StyleMatcherEngine.from_keras(self.keras_model.model, self.keras_model.scaler)
+        self.sample_batch = np.random.rand(16, num_features) * 10 + 3
+
+    def test_fold_scaler_into_dense(self):
+        mean, scale = np.array([1.0, -2.0]), np.array([0.5, 4.0])
+        weights, bias = np.random.rand(2, 3), np.random.rand(3)
+        x = np.random.rand(5, 2)
+
+        folded_weights, folded_bias = fold_scaler_into_dense(mean, scale, weights, bias)
+
+        np.testing.assert_allclose(x @ folded_weights + folded_bias, ((x - mean) / scale) @ weights + bias)
+
+    def test_matches_keras_outputs(self):
+        expected = self.keras_model.predict_style_probabilities(self.sample_batch)
+        actual = self.engine.predict_style_probabilities(self.sample_batch)
+
+        self.assertEqual(actual.shape, (16, len(StyleLines)))
+        np.testing.assert_allclose(actual, expected, rtol=1e-4, atol=1e-5)
+
+    def test_single_row_prediction(self):
+        row = self.sample_batch[0]
+        probabilities = self.engine.predict_style_probabilities(row)
+
+        self.assertEqual(probabilities.shape, (1, len(StyleLines)))
+        self.assertAlmostEqual(float(probabilities.sum()), 1.0, places=5)
+        self.assertEqual(self.engine.predict_style_line(row), self.keras_model.predict_style_line(row))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'style_matcher_engine.model')
+            self.engine.save(path)
+            loaded = StyleMatcherEngine.load(path)
+
+        np.testing.assert_array_equal(
+            loaded.predict_style_probabilities(self.sample_batch),
+            self.engine.predict_style_probabilities(self.sample_batch)
+        )
+
+    def test_load_maps_artifact_with_scaler_statistics(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'style_matcher_engine.model')
+            self.engine.save(path)
+            loaded = StyleMatcherEngine.load(path)
+
+            self.assertFalse(loaded.weights[1].flags.writeable)
+            np.testing.assert_allclose(loaded.scaler_mean, self.keras_model.scaler.mean_)
+            np.testing.assert_allclose(loaded.scaler_scale, self.keras_model.scaler.scale_)
+
+    def test_load_rejects_non_artifacts(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'style_matcher_engine.npz')
+            with open(path, 'wb') as f:
+                np.savez(f, w0=self.engine.weights[0])
+            with self.assertRaises(ValueError):
+                StyleMatcherEngine.load(path)
+
+    def test_shared_engine_matches(self):
+        shared = self.engine.share()
+        try:
+            np.testing.assert_array_equal(
+                shared.predict_style_probabilities(self.sample_batch),
+                self.engine.predict_style_probabilities(self.sample_batch)
+            )
+            self.assertFalse(shared.weights[0].flags.writeable)
+        finally:
+            shared.shared_arrays.unlink()
+
+if __name__ == '__main__':
+    unittest.main()
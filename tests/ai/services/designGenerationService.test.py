@@ -0,0 +1,230 @@
+import os
+import tempfile
+import threading
+import time
+import json
+import unittest
+import numpy as np
+from PIL import Image
+from src.ai.models.designGeneratorModel import DesignGeneratorModel
+from src.ai.models.designGeneratorEngine import ENGINE_FILE_SUFFIX
+from src.ai.models.compiledDesignGenerator import CompiledDesignGenerator
+from src.ai.services.designGenerationService import DesignGenerationService, _load_design_generator
+from src.ai.utils.imageEncoding import decode_image, decode_image_base64
+from src.ai.utils.modelRegistry import model_registry
+from src.shared.constants.index import StyleLines
+
+class DesignGenerationServiceTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.model_path = os.path.join(cls.directory.name, 'design_generator')
+        DesignGeneratorModel(100, len(StyleLines)).export_engine(f"{cls.model_path}{ENGINE_FILE_SUFFIX}")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.services = []
+
+    def tearDown(self):
+        for service in self.services:
+            if service.warm_pool is not None:
+                service.warm_pool.close()
+        model_registry.evict(f"{self.model_path}{ENGINE_FILE_SUFFIX}")
+
+    def create_service(self, **kwargs) -> DesignGenerationService:
+        service = DesignGenerationService(self.model_path, engine='numpy', **kwargs)
+        self.services.append(service)
+        return service
+
+    def count_generations(self, service: DesignGenerationService, delay: float = 0.0) -> list:
+        # Wrap the loaded generator so the test sees every call that reaches it
+        model = service.model
+        generate_design = model.generate_design
+        calls = []
+
+        def counting_generate_design(label, noise):
+            calls.append(label)
+            time.sleep(delay)
+            return generate_design(label, noise)
+
+        model.generate_design = counting_generate_design
+        return calls
+
+class TestGenerateDesign(DesignGenerationServiceTestCase):
+    def test_generates_a_design_for_a_style_line(self):
+        service = self.create_service()
+        for user_input in (None, {}, {'color': 'red'}):
+            design = decode_image_base64(service.generate_design(user_input, 'CASUAL'))
+            self.assertEqual(design.size, (28, 28))
+
+    def test_rejects_invalid_input(self):
+        service = self.create_service()
+        with self.assertRaises(ValueError):
+            service.generate_design({}, 'NOT_A_STYLE')
+        with self.assertRaises(ValueError):
+            service.generate_design(['not', 'a', 'dict'], 'CASUAL')
+
+    def test_serves_pooled_designs(self):
+        service = self.create_service(warm_pool=True)
+        deadline = time.monotonic() + 10
+        while service.warm_pool.stats()['depth']['FORMAL'] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        design = service.generate_design({}, 'FORMAL')
+
+        self.assertEqual(service.warm_pool.stats()['served'], 1)
+        self.assertEqual(decode_image_base64(design).size, (28, 28))
+
+class TestApplyDesignToProducts(DesignGenerationServiceTestCase):
+    def write_product(self, name, pixels, placement=None, print_mask=None):
+        path = os.path.join(self.directory.name, name)
+        Image.fromarray(pixels).save(path)
+        if print_mask is not None:
+            Image.fromarray(print_mask).save(os.path.join(self.directory.name, f"mask_{name}"))
+            placement = dict(placement, print_mask=f"mask_{name}")
+        if placement is not None:
+            with open(path.replace('.png', '.placement.json'), 'w') as f:
+                json.dump(placement, f)
+        return path
+
+    def test_bulk_composite_matches_single_product(self):
+        rng = np.random.default_rng(1201)
+        alpha = np.linspace(0, 255, 20 * 30).reshape(20, 30)
+        design = Image.fromarray(np.dstack([rng.integers(0, 256, (20, 30, 3)), alpha]).astype(np.uint8), 'RGBA')
+        transparent = rng.integers(0, 256, (70, 50, 4), dtype=np.uint8)
+        transparent[..., 3] = np.where(np.arange(50) < 25, 255, 60)
+        paths = [
+            self.write_product('shirt.png', rng.integers(0, 256, (120, 80, 3), dtype=np.uint8)),
+            self.write_product('hoodie.png', rng.integers(0, 256, (90, 90, 3), dtype=np.uint8)),
+            # Same design box size as the shirt, so it is composited in the same batch
+            self.write_product('shirt_large.png', rng.integers(0, 256, (150, 120, 3), dtype=np.uint8),
+                               placement={'design_box': [10, 20, 50, 80]}),
+            self.write_product('bag.png', transparent),
+            self.write_product('mug.png', rng.integers(0, 256, (60, 100, 3), dtype=np.uint8),
+                               placement={'design_box': [5, 5, 95, 40]},
+                               print_mask=rng.integers(0, 256, (60, 100), dtype=np.uint8))
+        ]
+        service = self.create_service()
+
+        results = {}
+        for index, buffer in service.apply_design_to_products(design, paths, binary=True):
+            results[index] = decode_image(buffer)
+
+        self.assertEqual(sorted(results), list(range(len(paths))))
+        for index, path in enumerate(paths):
+            expected = service.apply_design_to_product_image(design, path)
+            self.assertEqual((results[index].size, results[index].mode), (expected.size, expected.mode), path)
+            # PIL's paste rounds its integer blend slightly differently from the float blend
+            difference = np.abs(np.asarray(results[index], dtype=np.int16) - np.asarray(expected, dtype=np.int16))
+            self.assertLessEqual(difference.max(), 1, path)
+
+class TestDesignVariations(DesignGenerationServiceTestCase):
+    def test_batched_variations_match_single_designs(self):
+        service = self.create_service()
+        model = service.model
+        initial_design = service.generate_design({}, 'MINIMALIST', seed=801)
+        label = model.extract_features(decode_image_base64(initial_design))
+
+        # The service draws one noise row per variation from the global generator, in order
+        np.random.seed(802)
+        noise = np.random.normal(0, 1, (5, model.latent_dim))
+        expected = [np.asarray(service._postprocess_design(model.generate_design(label, row))) for row in noise]
+
+        for chunk_size in (None, 2):
+            np.random.seed(802)
+            variations = service.iter_design_variations(initial_design, 5, chunk_size=chunk_size)
+            indices, designs = zip(*variations)
+
+            self.assertEqual(list(indices), list(range(5)))
+            for design, single in zip(designs, expected):
+                difference = np.abs(np.asarray(decode_image_base64(design), dtype=np.int16) - single)
+                self.assertLessEqual(difference.max(), 1)
+
+        np.random.seed(802)
+        self.assertEqual(service.generate_design_variations(initial_design, 5), list(designs))
+
+class TestWarmup(DesignGenerationServiceTestCase):
+    def test_warms_up_through_generate_design(self):
+        service = self.create_service(load_model=False)
+        calls = self.count_generations(service)
+
+        service.warmup(())
+        self.assertEqual(len(calls), 1)
+        # The warmup design is seeded, so warming up again is served from the design cache
+        service.warmup((1, 4))
+        self.assertEqual(len(calls), 1)
+
+class TestSeededDesignCache(DesignGenerationServiceTestCase):
+    def test_identical_seeded_requests_skip_the_generator(self):
+        service = self.create_service()
+        calls = self.count_generations(service)
+
+        first = service.generate_design({}, 'VINTAGE', seed=1401)
+        second = service.generate_design({}, 'VINTAGE', seed=1401)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+        service.generate_design({}, 'VINTAGE', seed=1402)
+        self.assertEqual(len(calls), 2)
+
+class TestGenerationSingleFlight(DesignGenerationServiceTestCase):
+    def test_concurrent_identical_requests_share_one_generation(self):
+        service = self.create_service()
+        calls = self.count_generations(service, delay=0.3)
+        num_requests = 8
+        barrier = threading.Barrier(num_requests)
+        results = [None] * num_requests
+
+        def request(index):
+            barrier.wait()
+            results[index] = service.generate_design({}, 'SPORTY', seed=1501)
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(num_requests)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(set(results)), 1)
+        self.assertIsNotNone(results[0])
+        stats = service._single_flight.stats()
+        self.assertEqual((stats['executions'], stats['deduplicated']), (1, num_requests - 1))
+
+class TestKerasEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.model_path = os.path.join(cls.directory.name, 'design_generator.keras')
+        cls.saved_model = DesignGeneratorModel(16, len(StyleLines))
+        cls.saved_model.save_model(cls.model_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def tearDown(self):
+        model_registry.evict(self.model_path)
+
+    def test_serves_the_saved_model_through_the_compiled_generator(self):
+        service = DesignGenerationService(self.model_path, engine='keras')
+
+        self.assertIsInstance(service.model, CompiledDesignGenerator)
+        design = decode_image_base64(service.generate_design({}, 'BOHEMIAN', seed=1801))
+        self.assertEqual(design.size, (28, 28))
+
+    def test_loads_the_saved_dimensions_and_weights(self):
+        model = _load_design_generator(self.model_path, quantized_path=None, compiled=False)
+
+        self.assertEqual(model.latent_dim, 16)
+        self.assertEqual(model.num_classes, len(StyleLines))
+        for saved, loaded in zip(self.saved_model.discriminator.get_weights(), model.discriminator.get_weights()):
+            np.testing.assert_array_equal(saved, loaded)
+        noise = np.random.default_rng(0).normal(size=16).astype(np.float32)
+        np.testing.assert_allclose(model.generate_design(2, noise), self.saved_model.generate_design(2, noise), atol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import threading
+import time
+import unittest
+from src.ai.services.designWarmPool import DesignWarmPool
+
+class TestDesignWarmPool(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.pool = None
+
+    def tearDown(self):
+        if self.pool is not None:
+            self.pool.close()
+
+    def produce(self, style_line, count):
+        self.calls.append((style_line, count))
+        return [f"{style_line}-{len(self.calls)}-{i}" for i in range(count)]
+
+    def wait_for_depth(self, style_line, depth, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.pool.stats()['depth'][style_line] == depth:
+                return
+            time.sleep(0.005)
+        self.fail(f"Pool {style_line} did not reach depth {depth}")
+
+    def test_fills_every_pool_to_high_watermark(self):
+        self.pool = DesignWarmPool(self.produce, ['CASUAL', 'FORMAL'], low_watermark=2, high_watermark=6, refill_batch_size=4)
+
+        self.wait_for_depth('CASUAL', 6)
+        self.wait_for_depth('FORMAL', 6)
+        self.assertTrue(all(count <= 4 for _, count in self.calls))
+
+    def test_refills_below_low_watermark_only(self):
+        self.pool = DesignWarmPool(self.produce, ['CASUAL'], low_watermark=2, high_watermark=4, refill_batch_size=4)
+        self.wait_for_depth('CASUAL', 4)
+        calls_when_full = len(self.calls)
+
+        self.assertIsNotNone(self.pool.take('CASUAL'))
+        self.assertIsNotNone(self.pool.take('CASUAL'))
+        time.sleep(0.05)
+        self.assertEqual(len(self.calls), calls_when_full)
+
+        self.pool.take('CASUAL')
+        self.wait_for_depth('CASUAL', 4)
+        self.assertEqual(len(self.calls), calls_when_full + 1)
+
+    def test_empty_pool_is_a_miss(self):
+        release = threading.Event()
+
+        def blocked_produce(style_line, count):
+            release.wait()
+            return self.produce(style_line, count)
+
+        self.pool = DesignWarmPool(blocked_produce, ['CASUAL'], low_watermark=1, high_watermark=2)
+
+        self.assertIsNone(self.pool.take('CASUAL'))
+        self.assertIsNone(self.pool.take('UNKNOWN'))
+        self.assertEqual(self.pool.stats()['misses'], 2)
+        release.set()
+
+    def test_clear_discards_pooled_designs(self):
+        self.pool = DesignWarmPool(self.produce, ['CASUAL'], low_watermark=1, high_watermark=3)
+        self.wait_for_depth('CASUAL', 3)
+        first = self.pool.take('CASUAL')
+
+        self.pool.clear()
+        self.wait_for_depth('CASUAL', 3)
+
+        # Designs are named '<style line>-<produce call>-<index>'
+        self.assertNotEqual(self.pool.take('CASUAL').split('-')[1], first.split('-')[1])
+        self.assertEqual(self.pool.stats()['discarded'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.ai.models.styleMatcherEngine import StyleMatcherEngine, ENGINE_FILE_SUFFIX
+from src.ai.models.styleMatcherModel import StyleMatcherModel
+from src.ai.services.styleMatchingService import StyleMatchingService
+from src.ai.utils.modelRegistry import model_registry
+from src.ai.utils.preferenceVectorizer import PreferenceVectorizer, VECTORIZER_FILE_SUFFIX
+from src.ai.utils.recommendationCache import RecommendationCache
+from src.shared.constants.index import StyleLines
+
+def _style_data(num_rows, seed, label_shift=0):
+    # Each user's style line is their strongest preference (shifted for contradicting data)
+    preferences = np.random.default_rng(seed).random((num_rows, len(StyleLines))).astype(np.float32)
+    style_lines = (np.argmax(preferences, axis=1) + label_shift) % len(StyleLines)
+    return pd.DataFrame(preferences), pd.DataFrame({'style_line': style_lines})
+
+class TestStyleMatchingServiceFineTune(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # A briefly trained model, so updates on consistent data clearly improve it
+        preferences, style_lines = _style_data(200, seed=0)
+        cls.baseline = StyleMatcherModel()
+        cls.baseline.scaler.fit(preferences.values)
+        cls.baseline.fine_tune(preferences.values, style_lines.values.ravel(), epochs=1, learning_rate=1e-3)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.directory.name, 'style_matcher.keras')
+        self.baseline.save_model(self.model_path)
+        self.service = StyleMatchingService(self.model_path)
+
+    def tearDown(self):
+        model_registry.evict(self.model_path)
+        self.directory.cleanup()
+
+    def test_fine_tune_keeps_serving_and_swaps_in_the_candidate(self):
+        serving_model = self.service.model
+        version = model_registry.active_version(self.model_path)
+        weights = [w.copy() for w in serving_model.model.get_weights()]
+
+        future = self.service.fine_tune_user_preferences(*_style_data(1000, seed=1), epochs=10, learning_rate=1e-2)
+        # Requests keep being served by the active model while the update trains
+        self.service.match_style_with_recommendations({str(i): 0.5 for i in range(len(StyleLines))}, 2)
+        result = future.result(timeout=120)
+
+        self.assertTrue(result['activated'])
+        self.assertGreaterEqual(result['candidate_accuracy'], result['baseline_accuracy'])
+        self.assertIsNot(self.service.model, serving_model)
+        self.assertNotEqual(model_registry.active_version(self.model_path), version)
+        # The previous model was copied, not trained in place
+        for before, after in zip(weights, serving_model.model.get_weights()):
+            np.testing.assert_array_equal(before, after)
+
+    def test_fine_tune_rolls_back_on_regression(self):
+        serving_model = self.service.model
+        version = model_registry.active_version(self.model_path)
+        validation_preferences, validation_style_lines = _style_data(300, seed=2)
+
+        result = self.service.fine_tune_user_preferences(
+            *_style_data(1000, seed=3, label_shift=1),
+            validation_preferences=validation_preferences,
+            validation_style_lines=validation_style_lines,
+            epochs=20, learning_rate=1e-2
+        ).result(timeout=120)
+
+        self.assertFalse(result['activated'])
+        self.assertLess(result['candidate_accuracy'], result['baseline_accuracy'])
+        self.assertIs(self.service.model, serving_model)
+        self.assertEqual(model_registry.active_version(self.model_path), version)
+
+    def test_update_retrains_a_copy_and_swaps_it_in(self):
+        serving_model = self.service.model
+        version = model_registry.active_version(self.model_path)
+        weights = [w.copy() for w in serving_model.model.get_weights()]
+
+        future = self.service.update_user_preferences(*_style_data(200, seed=5))
+        self.service.match_style_with_recommendations({str(i): 0.5 for i in range(len(StyleLines))}, 2)
+        new_version = future.result(timeout=120)
+
+        self.assertEqual(model_registry.active_version(self.model_path), new_version)
+        self.assertNotEqual(new_version, version)
+        self.assertIsNot(self.service.model, serving_model)
+        for before, after in zip(weights, serving_model.model.get_weights()):
+            np.testing.assert_array_equal(before, after)
+
+    def test_fine_tune_requires_keras_engine(self):
+        service = StyleMatchingService(self.model_path, engine='numpy', load_model=False)
+        with self.assertRaises(RuntimeError):
+            service.fine_tune_user_preferences(*_style_data(10, seed=4))
+
+class TestStyleMatchingServiceResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.directory.name, 'style_matcher')
+        rng = np.random.default_rng(0)
+        StyleMatcherEngine(
+            [rng.random((3, 8)), rng.random((8, len(StyleLines)))], [np.zeros(8), np.zeros(len(StyleLines))],
+            ['relu', 'softmax']
+        ).save(f"{self.model_path}{ENGINE_FILE_SUFFIX}")
+        PreferenceVectorizer.fit({'budget': [1.0, 2.0, 3.0], 'color': ['blue', 'red', 'red']}).save(
+            f"{self.model_path}{VECTORIZER_FILE_SUFFIX}"
+        )
+        self.cache = RecommendationCache(max_bytes=1024 ** 2, ttl_seconds=60)
+        self.service = StyleMatchingService(self.model_path, engine='numpy', result_cache=self.cache)
+        self.uncached_service = StyleMatchingService(self.model_path, engine='numpy')
+
+    def tearDown(self):
+        model_registry.evict(f"{self.model_path}{ENGINE_FILE_SUFFIX}")
+        model_registry.evict(f"{self.model_path}{VECTORIZER_FILE_SUFFIX}")
+        self.directory.cleanup()
+
+    def test_repeat_requests_are_served_from_the_cache(self):
+        preferences = {'budget': 2.5, 'color': 'red'}
+        expected = self.uncached_service.match_style_with_recommendations(preferences, 3)
+
+        self.assertEqual(self.service.match_style_with_recommendations(preferences, 3), expected)
+        # Same answers in a different key order hit the same entry
+        self.assertEqual(self.service.match_style_with_recommendations({'color': 'red', 'budget': 2.5}, 3), expected)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        # Probabilities do not depend on num_recommendations, so other counts hit the same entry
+        self.service.match_style_with_recommendations(preferences, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+
+        self.service.match_style_with_recommendations({'budget': 1.0, 'color': 'red'}, 3)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_predict_runs_only_on_misses(self):
+        calls = []
+
+        def predict(user_preferences):
+            calls.append(user_preferences)
+            return self.uncached_service.style_probabilities(user_preferences)
+
+        for _ in range(3):
+            self.service.style_probabilities({'budget': 1.0, 'color': 'blue'}, predict=predict)
+        self.assertEqual(len(calls), 1)
+
+class TestStyleMatchingServiceBatch(unittest.TestCase):
+    def setUp(self):
+        # No vectorizer: features are read in each request's key order
+        self.directory = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.directory.name, 'style_matcher')
+        rng = np.random.default_rng(1)
+        StyleMatcherEngine(
+            [rng.random((3, 8)), rng.random((8, len(StyleLines)))], [np.zeros(8), np.zeros(len(StyleLines))],
+            ['relu', 'softmax']
+        ).save(f"{self.model_path}{ENGINE_FILE_SUFFIX}")
+        self.service = StyleMatchingService(self.model_path, engine='numpy')
+
+    def tearDown(self):
+        model_registry.evict(f"{self.model_path}{ENGINE_FILE_SUFFIX}")
+        self.directory.cleanup()
+
+    def test_rows_keep_their_own_key_order(self):
+        preferences_batch = [{'a': 0.1, 'b': 0.9, 'c': 0.4}, {'c': 0.1, 'a': 0.9, 'b': 0.4}]
+        expected = np.vstack([
+            self.service.model.predict_style_probabilities(self.service._preferences_to_array(preferences))
+            for preferences in preferences_batch
+        ])
+
+        np.testing.assert_allclose(self.service.predict_style_probabilities_batch(preferences_batch), expected, rtol=1e-5)
+
+    def test_rejects_rows_with_different_preferences(self):
+        with self.assertRaises(ValueError):
+            self.service.predict_style_probabilities_batch([{'a': 0.1, 'b': 0.9, 'c': 0.4}, {'a': 0.1, 'b': 0.9, 'd': 0.4}])
+        with self.assertRaises(ValueError):
+            self.service.match_styles_batch({'a': [0.1, 0.2], 'b': [0.9], 'c': [0.4, 0.5]}, 2)
+
+    def test_columnar_rows_match_single_requests(self):
+        results = self.service.match_styles_batch({'a': [0.1, 0.7], 'b': [0.9, 0.2], 'c': [0.4, 0.3]}, 2)
+
+        self.assertEqual(results[1]['matched_style'], self.service.match_style({'a': 0.7, 'b': 0.2, 'c': 0.3}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import threading
+import unittest
+from src.ai.services.warmup import Warmup, WARMUP_FAILED, WARMUP_PENDING
+
+class TestWarmup(unittest.TestCase):
+    def test_ready_only_after_all_steps_finish(self):
+        release = threading.Event()
+        calls = []
+        warmup = Warmup({
+            'first': lambda: calls.append('first'),
+            'second': lambda: (release.wait(2.0), calls.append('second'))
+        }, name='warmup_test_order')
+
+        self.assertEqual(warmup.status()['status'], WARMUP_PENDING)
+        warmup.start()
+        self.assertFalse(warmup.wait(0.05))
+        self.assertFalse(warmup.status()['ready'])
+
+        release.set()
+        self.assertTrue(warmup.wait(2.0))
+        self.assertEqual(calls, ['first', 'second'])
+        self.assertEqual(set(warmup.status()['step_seconds']), {'first', 'second'})
+
+    def test_failed_step_leaves_worker_not_ready(self):
+        def broken():
+            raise RuntimeError("model missing")
+
+        warmup = Warmup({'broken': broken, 'never': lambda: None}, name='warmup_test_failure')
+        warmup.start()
+
+        self.assertFalse(warmup.wait(2.0))
+        status = warmup.status()
+        self.assertEqual(status['status'], WARMUP_FAILED)
+        self.assertEqual(status['error'], "model missing")
+        self.assertNotIn('never', status['step_seconds'])
+
+    def test_failed_step_is_retried(self):
+        failures = []
+
+        def flaky():
+            if len(failures) < 2:
+                failures.append('failed')
+                raise RuntimeError("not loaded yet")
+
+        warmup = Warmup({'flaky': flaky}, name='warmup_test_retry', max_attempts=3)
+        warmup.start()
+
+        self.assertTrue(warmup.wait(2.0))
+        self.assertEqual(warmup.status()['attempts'], {'flaky': 3})
+
+    def test_on_failure_called_after_last_attempt(self):
+        attempts = []
+        failed = threading.Event()
+
+        def broken():
+            attempts.append(1)
+            raise RuntimeError("model missing")
+
+        warmup = Warmup({'broken': broken}, name='warmup_test_on_failure', max_attempts=2, on_failure=failed.set)
+        warmup.start()
+
+        self.assertFalse(warmup.wait(2.0))
+        self.assertTrue(failed.wait(2.0))
+        self.assertEqual(len(attempts), 2)
+
+    def test_no_steps_is_ready_immediately(self):
+        warmup = Warmup({}, name='warmup_test_empty')
+        warmup.start()
+        warmup.start()
+
+        self.assertTrue(warmup.wait(1.0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import urllib.request
+import numpy as np
+from src.ai.models.styleMatcherEngine import StyleMatcherEngine, ENGINE_FILE_SUFFIX
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+class TestServing(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        engine = StyleMatcherEngine([np.random.rand(6, 8), np.random.rand(8, 6)], [np.zeros(8), np.zeros(6)], ['relu', 'softmax'])
+        engine.save(os.path.join(self.temp_dir.name, f"style_matcher{ENGINE_FILE_SUFFIX}"))
+
+        self.port = _free_port()
+        env = dict(
+            os.environ, SERVING_WORKERS='2', SERVING_PORT=str(self.port), STYLE_MATCHER_ENGINE='numpy',
+            MODEL_PATH_STYLE_MATCHER=os.path.join(self.temp_dir.name, 'style_matcher'), WARMUP_ENABLED='0'
+        )
+        self.server = subprocess.Popen([sys.executable, '-m', 'src.ai.serving'], env=env, cwd=REPO_ROOT)
+        self.wait_until_listening()
+
+    def tearDown(self):
+        if self.server.poll() is None:
+            self.server.kill()
+            self.server.wait()
+        self.temp_dir.cleanup()
+
+    def wait_until_listening(self, timeout=30.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{self.port}/health", timeout=1)
+                return
+            except OSError:
+                time.sleep(0.1)
+        self.fail("Server did not start listening")
+
+    def test_workers_serve_shared_model_and_stop_on_sigterm(self):
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{self.port}/match-style",
+            data=json.dumps({'user_preferences': {str(i): float(i) for i in range(6)}}).encode(),
+            headers={'Content-Type': 'application/json'}
+        )
+        for _ in range(4):
+            with urllib.request.urlopen(request, timeout=10) as response:
+                self.assertEqual(response.status, 200)
+                self.assertIn('matched_style', json.loads(response.read()))
+
+        self.server.send_signal(signal.SIGTERM)
+        self.assertEqual(self.server.wait(15), 0)
+
+if __name__ == '__main__':
+    unittest.main()
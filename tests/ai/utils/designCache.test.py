@@ -0,0 +1,49 @@
+import base64
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.ai.utils.designCache import DesignCache, design_cache_key
+
+DESIGN = base64.b64encode(b'\x89PNG fake design bytes').decode()
+
+class TestDesignCacheKey(unittest.TestCase):
+    def test_key_depends_on_every_input(self):
+        base = design_cache_key('v1', 'CASUAL', np.array([1.0, 2.0]), 7)
+
+        self.assertEqual(base, design_cache_key('v1', 'CASUAL', np.array([1.0, 2.0]), 7))
+        self.assertNotEqual(base, design_cache_key('v2', 'CASUAL', np.array([1.0, 2.0]), 7))
+        self.assertNotEqual(base, design_cache_key('v1', 'FORMAL', np.array([1.0, 2.0]), 7))
+        self.assertNotEqual(base, design_cache_key('v1', 'CASUAL', np.array([1.0, 3.0]), 7))
+        self.assertNotEqual(base, design_cache_key('v1', 'CASUAL', np.array([1.0, 2.0]), 8))
+        self.assertNotEqual(base, design_cache_key('v1', 'CASUAL', np.array([1.0, 2.0], dtype=np.float32), 7))
+
+class TestDesignCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_memory_only(self):
+        cache = DesignCache(max_bytes=1024)
+        cache.put('abc', DESIGN)
+
+        self.assertEqual(cache.get('abc'), DESIGN)
+        self.assertIsNone(cache.get('missing'))
+
+    def test_disk_tier_survives_a_new_cache(self):
+        key = design_cache_key('v1', 'CASUAL', None, 1)
+        DesignCache(max_bytes=1024, directory=self.directory.name).put(key, DESIGN)
+
+        restarted = DesignCache(max_bytes=1024, directory=self.directory.name)
+
+        self.assertEqual(restarted.get(key), DESIGN)
+        self.assertEqual(restarted.get(key), DESIGN)
+        stats = restarted.stats()
+        self.assertEqual(stats['disk_hits'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(os.listdir(os.path.join(self.directory.name, key[:2])), [key])
+
+if __name__ == '__main__':
+    unittest.main()
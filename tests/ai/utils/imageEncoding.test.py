@@ -0,0 +1,39 @@
+import unittest
+from PIL import Image
+from src.ai.utils import imageEncoding
+from src.ai.utils.imageEncoding import encode_image, decode_image, encoding_signature, image_mimetype, _save_options
+
+class TestImageEncoding(unittest.TestCase):
+    def setUp(self):
+        self.image = Image.new('RGBA', (16, 12), (30, 60, 90, 255))
+
+    def test_round_trip_in_every_format(self):
+        for image_format in imageEncoding.IMAGE_FORMATS:
+            decoded = decode_image(encode_image(self.image, image_format))
+            self.assertEqual(decoded.size, (16, 12), image_format)
+        self.assertEqual(image_mimetype('webp'), 'image/webp')
+        with self.assertRaises(ValueError):
+            encode_image(self.image, 'gif')
+
+    def test_request_quality_is_clamped_to_the_format_scale(self):
+        self.assertEqual(_save_options('png', 50)['compress_level'], 9)
+        self.assertEqual(_save_options('jpeg', 500)['quality'], 100)
+        self.assertNotEqual(encoding_signature('webp', 40), encoding_signature('webp', 90))
+
+class TestDeploymentQuality(unittest.TestCase):
+    def setUp(self):
+        self.defaults = (imageEncoding.DESIGN_IMAGE_FORMAT, imageEncoding.DESIGN_IMAGE_QUALITY)
+        imageEncoding.DESIGN_IMAGE_FORMAT, imageEncoding.DESIGN_IMAGE_QUALITY = 'webp', 60
+
+    def tearDown(self):
+        imageEncoding.DESIGN_IMAGE_FORMAT, imageEncoding.DESIGN_IMAGE_QUALITY = self.defaults
+
+    def test_applies_only_to_the_deployment_format(self):
+        self.assertEqual(_save_options('webp')['quality'], 60)
+        self.assertEqual(_save_options('webp', 70)['quality'], 70)
+        # A PNG requested from a WebP deployment keeps PNG's own compression level
+        self.assertEqual(_save_options('png'), imageEncoding.IMAGE_FORMATS['png']['options'])
+        self.assertEqual(_save_options('jpeg'), imageEncoding.IMAGE_FORMATS['jpeg']['options'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from io import BytesIO
+from flask import Flask, request
+from PIL import Image
+from src.ai.utils.imageEncoding import encode_image
+from src.ai.utils.imageTransport import (
+    read_request_image, request_param, request_list_param, request_image_encoding, wants_binary_image,
+    multipart_image_response, OCTET_STREAM_MIMETYPE
+)
+
+def parse_multipart_mixed(body: bytes, content_type: str) -> list:
+    # (headers, data) for each part of a multipart/mixed body
+    boundary = content_type.split('boundary=')[1].encode()
+    parts = []
+    for chunk in body.split(b"--" + boundary)[1:]:
+        if chunk.startswith(b"--"):
+            break
+        head, data = chunk.lstrip(b"\r\n").split(b"\r\n\r\n", 1)
+        headers = dict(line.split(': ', 1) for line in head.decode().split('\r\n'))
+        parts.append((headers, data[:-2]))
+    return parts
+
+class ImageTransportTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.image = Image.new('RGB', (12, 8), (10, 120, 240))
+        self.png = encode_image(self.image, 'png').getvalue()
+
+    def request_context(self, **kwargs):
+        return self.app.test_request_context('/', method='POST', **kwargs)
+
+class TestReadRequestImage(ImageTransportTestCase):
+    def test_multipart_upload(self):
+        with self.request_context(data={'design': (BytesIO(self.png), 'design.png'), 'product_image_path': 'a.png'}):
+            image = read_request_image(request, 'design')
+            self.assertEqual(request_param(request, 'product_image_path'), 'a.png')
+
+        # Still readable once the request, and with it the upload's stream, is closed
+        self.assertEqual(image.size, (12, 8))
+        self.assertEqual(image.getpixel((0, 0))[:3], (10, 120, 240))
+
+    def test_missing_multipart_field(self):
+        with self.request_context(data={'other': (BytesIO(self.png), 'design.png')}):
+            with self.assertRaises(ValueError):
+                read_request_image(request, 'design')
+
+    def test_raw_body(self):
+        for content_type in (OCTET_STREAM_MIMETYPE, 'image/png'):
+            with self.request_context(data=self.png, content_type=content_type, query_string={'num_variations': '3'}):
+                image = read_request_image(request, 'initial_design')
+                self.assertEqual(request_param(request, 'num_variations', cast=int), 3)
+            self.assertEqual(image.size, (12, 8))
+
+    def test_json_requests_carry_no_image(self):
+        with self.request_context(json={'product_image_paths': ['a.png', 'b.png'], 'image_quality': 3}):
+            self.assertIsNone(read_request_image(request, 'design'))
+            self.assertEqual(request_list_param(request, 'product_image_paths'), ['a.png', 'b.png'])
+            self.assertEqual(request_param(request, 'image_quality', cast=int), 3)
+
+    def test_list_body_has_no_params(self):
+        with self.request_context(json=[3]):
+            self.assertIsNone(request_param(request, 'num_variations', cast=int))
+            self.assertEqual(request_list_param(request, 'product_image_paths'), [])
+
+    def test_repeated_form_fields_are_a_list(self):
+        data = {'design': (BytesIO(self.png), 'design.png'), 'product_image_paths': ['a.png', 'b.png']}
+        with self.request_context(data=data):
+            self.assertEqual(request_list_param(request, 'product_image_paths'), ['a.png', 'b.png'])
+
+class TestResponseNegotiation(ImageTransportTestCase):
+    def wants_binary(self, accept):
+        headers = {'Accept': accept} if accept is not None else {}
+        with self.request_context(json={}, headers=headers):
+            return wants_binary_image(request)
+
+    def test_wants_binary_image(self):
+        for accept in ('image/png', 'image/webp', OCTET_STREAM_MIMETYPE, 'multipart/mixed'):
+            self.assertTrue(self.wants_binary(accept), accept)
+        for accept in (None, '*/*', 'application/json', 'application/json, image/png;q=0.5'):
+            self.assertFalse(self.wants_binary(accept), accept)
+
+    def test_image_encoding_from_params_or_accept(self):
+        with self.request_context(json={'image_format': 'jpeg', 'image_quality': 70}):
+            self.assertEqual(request_image_encoding(request), ('jpeg', 70))
+        with self.request_context(json={}, headers={'Accept': 'image/webp'}):
+            self.assertEqual(request_image_encoding(request), ('webp', None))
+        with self.request_context(json={}, headers={'Accept': 'image/*'}):
+            self.assertEqual(request_image_encoding(request), (None, None))
+
+class TestMultipartImageResponse(ImageTransportTestCase):
+    def test_one_part_per_image(self):
+        images = [(2, BytesIO(b"second")), (0, BytesIO(self.png))]
+        with self.request_context():
+            response = multipart_image_response(iter(images), 'image/png')
+            body = b"".join(response.response)
+
+        parts = parse_multipart_mixed(body, response.headers['Content-Type'])
+        self.assertTrue(response.headers['Content-Type'].startswith('multipart/mixed; boundary='))
+        self.assertEqual([headers['Content-ID'] for headers, _ in parts], ['<2>', '<0>'])
+        self.assertEqual([data for _, data in parts], [b"second", self.png])
+        self.assertEqual(parts[1][0]['Content-Length'], str(len(self.png)))
+        self.assertEqual(parts[1][0]['Content-Type'], 'image/png')
+
+if __name__ == '__main__':
+    unittest.main()
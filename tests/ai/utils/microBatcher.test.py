@@ -0,0 +1,117 @@
+import itertools
+import threading
+import time
+import unittest
+from src.ai.utils.microBatcher import MicroBatcher
+
+class TestMicroBatcher(unittest.TestCase):
+    def setUp(self):
+        self.batch_sizes = []
+
+        def batch_fn(items):
+            self.batch_sizes.append(len(items))
+            return [item * 2 for item in items]
+
+        self.batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=50, name='test_batcher')
+
+    def tearDown(self):
+        self.batcher.close()
+
+    def test_single_request_is_flushed_after_max_wait(self):
+        start = time.perf_counter()
+        self.assertEqual(self.batcher.submit(21), 42)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(self.batch_sizes, [1])
+
+    def test_concurrent_requests_share_a_batch(self):
+        results = {}
+
+        def worker(value):
+            results[value] = self.batcher.submit(value)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Every caller gets its own result back
+        self.assertEqual(results, {i: i * 2 for i in range(8)})
+        self.assertLess(len(self.batch_sizes), 8)
+        self.assertTrue(all(size <= 8 for size in self.batch_sizes))
+
+    def test_batch_errors_are_propagated_to_every_caller(self):
+        failing = MicroBatcher(lambda items: 1 / 0, max_batch_size=4, max_wait_ms=1, name='test_failing')
+        try:
+            with self.assertRaises(ZeroDivisionError):
+                failing.submit(1)
+        finally:
+            failing.close()
+
+    def test_failed_batch_only_fails_the_invalid_item(self):
+        release = threading.Event()
+        calls = []
+
+        def batch_fn(items):
+            release.wait(2.0)
+            calls.append(list(items))
+            return [10 // item for item in items]
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=3, max_wait_ms=500, name='test_partial_failure')
+        results = {}
+
+        def worker(value):
+            try:
+                results[value] = batcher.submit(value, timeout=5)
+            except ZeroDivisionError as e:
+                results[value] = e
+
+        threads = [threading.Thread(target=worker, args=(value,)) for value in (1, 0, 5)]
+        try:
+            for thread in threads:
+                thread.start()
+            release.set()
+            for thread in threads:
+                thread.join(5)
+        finally:
+            batcher.close()
+
+        self.assertEqual((results[1], results[5]), (10, 2))
+        self.assertIsInstance(results[0], ZeroDivisionError)
+        self.assertEqual(sorted(len(items) for items in calls), [1, 1, 1, 3])
+
+    def test_submit_after_close_raises(self):
+        self.batcher.close()
+        with self.assertRaises(RuntimeError):
+            self.batcher.submit(1)
+
+    def test_submit_racing_close_never_hangs(self):
+        batcher = MicroBatcher(lambda items: items, max_batch_size=4, max_wait_ms=1, name='test_close_race')
+        outcomes = []
+
+        def worker():
+            for value in itertools.count():
+                try:
+                    outcomes.append(batcher.submit(value, timeout=2))
+                except RuntimeError:
+                    outcomes.append('closed')
+                    return
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        time.sleep(0.01)
+        batcher.close()
+        thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        # Every submit either got its result or was refused; none timed out behind the stop marker
+        self.assertEqual(outcomes[-1], 'closed')
+        self.assertEqual(outcomes[:-1], list(range(len(outcomes) - 1)))
+
+    def test_histograms_are_recorded(self):
+        self.batcher.submit(1)
+        self.assertGreaterEqual(self.batcher.batch_size_histogram.snapshot()['count'], 1)
+        self.assertGreaterEqual(self.batcher.queue_wait_histogram.snapshot()['count'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
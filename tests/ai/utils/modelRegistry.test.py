@@ -0,0 +1,160 @@
+import os
+import tempfile
+import threading
+import unittest
+import numpy as np
+from src.ai.utils.modelRegistry import ModelRegistry, ModelVersionUnavailable, artifact_version, estimate_model_size
+
+class FakeModel:
+    def __init__(self, path, num_bytes=1000):
+        self.path = path
+        self.weights = np.zeros(num_bytes, dtype=np.uint8)
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = ModelRegistry(max_bytes=2500)
+        self.load_count = 0
+
+    def loader(self, path):
+        self.load_count += 1
+        return FakeModel(path)
+
+    def test_loads_each_artifact_once(self):
+        first = self.registry.get('model_a', self.loader)
+        second = self.registry.get('model_a', self.loader)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.load_count, 1)
+
+    def test_concurrent_first_access_loads_once(self):
+        threads = [threading.Thread(target=self.registry.get, args=('model_a', self.loader)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.load_count, 1)
+
+    def test_lru_eviction_by_memory(self):
+        self.registry.get('model_a', self.loader)
+        self.registry.get('model_b', self.loader)
+        self.registry.get('model_a', self.loader)
+        self.registry.get('model_c', self.loader)  # exceeds 2500 bytes, evicts model_b
+
+        stats = self.registry.stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertEqual(stats['evictions'], 1)
+
+        self.registry.get('model_a', self.loader)
+        self.assertEqual(self.load_count, 3)
+        self.registry.get('model_b', self.loader)
+        self.assertEqual(self.load_count, 4)
+
+    def test_activate_swaps_version(self):
+        original = self.registry.get('model_a', self.loader)
+        original_version = self.registry.active_version('model_a')
+        replacement = FakeModel('model_a')
+
+        previous = self.registry.activate('model_a', 'v2', model=replacement)
+
+        self.assertEqual(previous, original_version)
+        self.assertEqual(self.registry.active_version('model_a'), 'v2')
+        self.assertIs(self.registry.get('model_a', self.loader), replacement)
+        self.assertIs(self.registry.get('model_a', self.loader, version=original_version), original)
+
+    def test_load_locks_are_bounded_by_artifacts(self):
+        for version in range(20):
+            self.registry.activate('model_a', f"v{version}", model=FakeModel('model_a'))
+            self.registry.get('model_a', self.loader)
+        self.registry.get('model_b', self.loader)
+
+        self.assertLessEqual(len(self.registry._load_locks), 2)
+
+    def test_estimate_model_size(self):
+        self.assertEqual(estimate_model_size(FakeModel('model_a', num_bytes=123)), 123)
+
+class TestModelRegistryEvictedVersions(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'model.bin')
+        self.registry = ModelRegistry(max_bytes=10 ** 6)
+        self.loaded = []
+        self.write_artifact(b"v1", 1)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_artifact(self, contents, mtime_seconds):
+        with open(self.path, 'wb') as f:
+            f.write(contents)
+        os.utime(self.path, ns=(mtime_seconds * 10 ** 9,) * 2)
+
+    def loader(self, path):
+        with open(path, 'rb') as f:
+            self.loaded.append(f.read())
+        return FakeModel(self.loaded[-1])
+
+    def test_pinned_version_reloads_only_its_own_artifact(self):
+        version, model = self.registry.get_versioned(self.path, self.loader)
+        self.registry.evict(self.path)
+
+        # The artifact is unchanged, so the evicted version can be loaded again
+        self.assertEqual(self.registry.get(self.path, self.loader, version=version).path, b"v1")
+
+        self.registry.evict(self.path)
+        self.write_artifact(b"v2", 2)
+        with self.assertRaises(ModelVersionUnavailable):
+            self.registry.get(self.path, self.loader, version=version)
+        self.assertEqual(self.loaded, [b"v1", b"v1"])
+
+    def test_evicted_active_version_moves_to_the_artifact_on_disk(self):
+        old_version, _ = self.registry.get_versioned(self.path, self.loader)
+        self.registry.evict(self.path)
+        self.write_artifact(b"v2", 2)
+
+        version, model = self.registry.get_versioned(self.path, self.loader)
+
+        self.assertEqual(model.path, b"v2")
+        self.assertEqual(version, artifact_version(self.path))
+        self.assertNotEqual(version, old_version)
+        self.assertEqual(self.registry.active_version(self.path), version)
+        # The new model is never cached under the old version
+        with self.assertRaises(ModelVersionUnavailable):
+            self.registry.get(self.path, self.loader, version=old_version)
+
+class TestArtifactVersion(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'style_matcher')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, path, contents, mtime_seconds):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(contents)
+        os.utime(path, (mtime_seconds, mtime_seconds))
+
+    def test_files_inside_a_model_directory_change_the_version(self):
+        variables = os.path.join(self.path, 'variables', 'variables.data')
+        self.write(variables, b"weights", 1)
+        os.utime(self.path, (1, 1))
+        version = artifact_version(self.path)
+
+        self.write(variables, b"retrained", 2)
+        os.utime(self.path, (1, 1))
+
+        self.assertNotEqual(artifact_version(self.path), version)
+
+    def test_scaler_is_part_of_the_version(self):
+        self.write(self.path, b"weights", 1)
+        version = artifact_version(self.path)
+
+        self.write(f"{self.path}_scaler.pkl", b"scaler", 1)
+
+        self.assertNotEqual(artifact_version(self.path), version)
+        self.assertEqual(artifact_version(os.path.join(self.directory.name, 'missing')), 'unversioned')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.ai.utils.preferenceVectorizer import PreferenceVectorizer, VECTORIZER_FILE_SUFFIX
+
+class TestPreferenceVectorizer(unittest.TestCase):
+    def setUp(self):
+        self.training_data = {
+            'budget': [10.0, 20.0, 30.0, 40.0],
+            'boldness': [1, 1, 1, 1],
+            'color': ['red', 'blue', 'red', 'green'],
+            'is_member': np.array([True, False, True, False])
+        }
+        self.vectorizer = PreferenceVectorizer.fit(self.training_data)
+
+    def test_fit_schema(self):
+        self.assertEqual(
+            self.vectorizer.feature_names,
+            ['budget', 'boldness', 'is_member', 'color_blue', 'color_green', 'color_red']
+        )
+        self.assertEqual(self.vectorizer.num_features, 6)
+        np.testing.assert_allclose(self.vectorizer.mean, [25.0, 1.0, 0.0])
+        # Constant columns keep a unit scale instead of dividing by zero
+        np.testing.assert_allclose(self.vectorizer.scale, [np.std([10, 20, 30, 40]), 1.0, 1.0])
+
+    def test_transform_ignores_key_order(self):
+        row = {'budget': 30.0, 'boldness': 1, 'color': 'green', 'is_member': True}
+        reordered = dict(reversed(list(row.items())))
+
+        vector = self.vectorizer.transform(row)
+        self.assertEqual(vector.shape, (1, 6))
+        self.assertEqual(vector.dtype, np.float32)
+        np.testing.assert_allclose(vector, [[5.0 / np.std([10, 20, 30, 40]), 0.0, 1.0, 0.0, 1.0, 0.0]], rtol=1e-6)
+        np.testing.assert_array_equal(self.vectorizer.transform(reordered), vector)
+
+    def test_missing_and_unseen_values(self):
+        vector = self.vectorizer.transform({'color': 'purple'})
+        # Missing numeric values take the training mean, unseen categories no column
+        np.testing.assert_array_equal(vector, np.zeros((1, 6), dtype=np.float32))
+
+    def test_batch_and_columnar_match_single_rows(self):
+        rows = [
+            {'budget': 15.0, 'boldness': 2, 'color': 'blue', 'is_member': False},
+            {'color': 'red', 'budget': 35.0, 'is_member': True, 'boldness': 0},
+            {'budget': None, 'color': None}
+        ]
+        expected = np.vstack([self.vectorizer.transform(row) for row in rows])
+
+        np.testing.assert_array_equal(self.vectorizer.transform_batch(rows), expected)
+        columns = {name: [row.get(name) for row in rows] for name in ('budget', 'boldness', 'color', 'is_member')}
+        np.testing.assert_array_equal(self.vectorizer.transform_columns(columns), expected)
+        columns['color'] = np.array(['blue', 'red', 'unknown'])
+        np.testing.assert_array_equal(self.vectorizer.transform_columns(columns), expected)
+
+    def test_transform_into_preallocated_buffer(self):
+        out = np.full((2, 6), -1.0, dtype=np.float32)
+        result = self.vectorizer.transform_batch([{'color': 'red'}, {'color': 'blue'}], out=out)
+
+        self.assertIs(result, out)
+        np.testing.assert_array_equal(out[:, 3:], [[0, 0, 1], [1, 0, 0]])
+        with self.assertRaises(ValueError):
+            self.vectorizer.transform_batch([{}], out=np.empty((1, 5), dtype=np.float32))
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f"style_matcher{VECTORIZER_FILE_SUFFIX}")
+            self.vectorizer.save(path)
+            loaded = PreferenceVectorizer.load(path)
+
+        rows = [{'budget': 12.5, 'boldness': 3, 'color': 'green', 'is_member': True}]
+        self.assertEqual(loaded.feature_names, self.vectorizer.feature_names)
+        np.testing.assert_array_equal(loaded.transform_batch(rows), self.vectorizer.transform_batch(rows))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from PIL import Image
+from src.ai.utils.productImageCache import ProductImageCache, placement_path
+
+class TestProductImageCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.product_path = os.path.join(self.directory.name, 'shirt.png')
+        self.write_product((200, 100, 50, 255))
+        self.cache = ProductImageCache(max_bytes=10 * 1024 ** 2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_product(self, color, size=(100, 80)):
+        Image.new('RGBA', size, color).save(self.product_path)
+
+    def test_decodes_each_image_once(self):
+        first = self.cache.get(self.product_path)
+        second = self.cache.get(self.product_path)
+
+        self.assertIs(first, second)
+        stats = self.cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+
+    def test_reloads_when_file_changes(self):
+        first = self.cache.get(self.product_path)
+        self.write_product((0, 0, 0, 255), size=(120, 80))
+        os.utime(self.product_path, ns=(first.signature[0][0] + 10 ** 9,) * 2)
+
+        second = self.cache.get(self.product_path)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.image.size, (120, 80))
+        self.assertEqual(self.cache.stats()['invalidations'], 1)
+
+    def test_placement_file_sets_design_box(self):
+        with open(placement_path(self.product_path), 'w') as f:
+            json.dump({'design_box': [10, 20, 60, 70]}, f)
+
+        entry = self.cache.get(self.product_path)
+
+        self.assertEqual(entry.design_box, (10, 20, 60, 70))
+        self.assertEqual(entry.print_mask.shape, (50, 50))
+
+    def test_print_mask_follows_product_alpha(self):
+        image = Image.new('RGBA', (100, 80), (255, 255, 255, 255))
+        image.paste((0, 0, 0, 0), (0, 0, 50, 80))
+        image.save(self.product_path)
+        with open(placement_path(self.product_path), 'w') as f:
+            json.dump({'design_box': [40, 0, 60, 80]}, f)
+
+        mask = self.cache.get(self.product_path).print_mask
+
+        np.testing.assert_array_equal(mask[:, :10], 0.0)
+        np.testing.assert_array_equal(mask[:, 10:], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import time
+import unittest
+import numpy as np
+from src.ai.utils.recommendationCache import RecommendationCache, recommendation_cache_key, ENTRY_OVERHEAD_BYTES
+
+class TestRecommendationCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = RecommendationCache(max_bytes=1024 ** 2, ttl_seconds=60)
+        self.vector = np.array([[0.5, -1.0, 2.0]], dtype=np.float32)
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        time.sleep(0.01)
+        return np.array([0.2, 0.8], dtype=np.float32)
+
+    def test_hit_skips_compute_and_counts_saved_latency(self):
+        first = self.cache.get_or_compute(self.vector, 'v1', self.compute)
+        second = self.cache.get_or_compute(self.vector.copy(), 'v1', self.compute)
+
+        self.assertEqual(self.calls, 1)
+        np.testing.assert_array_equal(first, second)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_ratio'], 0.5)
+        self.assertGreaterEqual(stats['saved_seconds'], 0.01)
+
+    def test_results_are_read_only(self):
+        result = self.cache.get_or_compute(self.vector, 'v1', self.compute)
+        with self.assertRaises(ValueError):
+            result[0] = 1.0
+
+    def test_key_is_canonical(self):
+        key = recommendation_cache_key(self.vector, 'v1')
+        self.assertEqual(recommendation_cache_key(self.vector.astype(np.float64), 'v1'), key)
+        self.assertEqual(recommendation_cache_key(np.array([[0.0]]), 'v1'), recommendation_cache_key(np.array([[-0.0]]), 'v1'))
+        self.assertNotEqual(recommendation_cache_key(self.vector * 2, 'v1'), key)
+        self.assertNotEqual(recommendation_cache_key(self.vector, 'v2'), key)
+
+    def test_model_versions_are_cached_side_by_side(self):
+        # While a hot swap is in flight, requests alternate between the old and new version
+        for version in ('v1', 'v2', 'v1', 'v2'):
+            self.cache.get_or_compute(self.vector, version, self.compute)
+
+        self.assertEqual(self.calls, 2)
+        stats = self.cache.stats()
+        self.assertEqual((stats['entries'], stats['hits']), (2, 2))
+
+    def test_entries_expire_after_ttl(self):
+        cache = RecommendationCache(max_bytes=1024 ** 2, ttl_seconds=0.05)
+        cache.get_or_compute(self.vector, 'v1', self.compute)
+        time.sleep(0.1)
+        cache.get_or_compute(self.vector, 'v1', self.compute)
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+    def test_memory_is_bounded(self):
+        entry_bytes = 2 * 4 + ENTRY_OVERHEAD_BYTES
+        cache = RecommendationCache(max_bytes=3 * entry_bytes, ttl_seconds=60)
+        for i in range(10):
+            cache.get_or_compute(np.array([[float(i)]]), 'v1', self.compute)
+
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 3)
+        self.assertLessEqual(stats['bytes'], 3 * entry_bytes)
+        self.assertEqual(stats['evictions'], 7)
+
+if __name__ == '__main__':
+    unittest.main()
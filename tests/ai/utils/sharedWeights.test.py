@@ -0,0 +1,39 @@
+import multiprocessing
+import unittest
+import numpy as np
+from src.ai.models.modelArtifact import ARRAY_ALIGNMENT
+from src.ai.utils.sharedWeights import SharedArrays
+
+def _sum_in_child(shared, queue):
+    queue.put(float(shared.arrays['kernel'].sum() + shared.arrays['bias'].sum()))
+
+class TestSharedArrays(unittest.TestCase):
+    def setUp(self):
+        self.kernel = np.random.rand(7, 5).astype(np.float32)
+        self.bias = np.random.rand(5).astype(np.float32)
+        self.shared = SharedArrays({'bias': self.bias, 'kernel': self.kernel})
+
+    def tearDown(self):
+        self.shared.unlink()
+
+    def test_views_match_and_are_aligned(self):
+        np.testing.assert_array_equal(self.shared.arrays['kernel'], self.kernel)
+        np.testing.assert_array_equal(self.shared.arrays['bias'], self.bias)
+        for offset, _, _ in self.shared.layout.values():
+            self.assertEqual(offset % ARRAY_ALIGNMENT, 0)
+
+    def test_views_are_read_only(self):
+        with self.assertRaises(ValueError):
+            self.shared.arrays['kernel'][0, 0] = 1.0
+
+    def test_forked_process_sees_the_same_block(self):
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        child = context.Process(target=_sum_in_child, args=(self.shared, queue))
+        child.start()
+        child.join(10)
+
+        self.assertAlmostEqual(queue.get(timeout=1), float(self.kernel.sum() + self.bias.sum()), places=3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import threading
+import time
+import unittest
+from src.ai.utils.singleFlight import SingleFlight
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.single_flight = SingleFlight('test_single_flight')
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.executions = 0
+
+    def slow_call(self):
+        self.executions += 1
+        self.started.set()
+        self.release.wait(2)
+        return 'result'
+
+    def run_concurrently(self, key, count, timeout=None):
+        results = [None] * count
+
+        def call(i):
+            try:
+                results[i] = self.single_flight.do(key, self.slow_call, timeout=timeout)
+            except Exception as e:
+                results[i] = e
+
+        leader = threading.Thread(target=call, args=(0,))
+        leader.start()
+        self.started.wait(2)
+        followers = [threading.Thread(target=call, args=(i,)) for i in range(1, count)]
+        for thread in followers:
+            thread.start()
+        return leader, followers, results
+
+    def test_concurrent_calls_share_one_execution(self):
+        leader, followers, results = self.run_concurrently('design', 5)
+        while self.single_flight.stats()['deduplicated'] < 4:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in [leader] + followers:
+            thread.join()
+
+        self.assertEqual(results, ['result'] * 5)
+        self.assertEqual(self.executions, 1)
+        stats = self.single_flight.stats()
+        self.assertEqual(stats['executions'], 1)
+        self.assertEqual(stats['deduplicated'], 4)
+        self.assertEqual(stats['in_flight'], 0)
+
+    def test_sequential_calls_execute_again(self):
+        self.release.set()
+        self.single_flight.do('design', self.slow_call)
+        self.single_flight.do('design', self.slow_call)
+
+        self.assertEqual(self.executions, 2)
+
+    def test_followers_time_out(self):
+        leader, followers, results = self.run_concurrently('design', 2, timeout=0.01)
+        followers[0].join()
+        self.release.set()
+        leader.join()
+
+        self.assertEqual(results[0], 'result')
+        self.assertIsInstance(results[1], TimeoutError)
+        self.assertEqual(self.single_flight.stats()['timeouts'], 1)
+
+    def test_errors_are_shared_and_not_kept(self):
+        def failing_call():
+            raise ValueError('boom')
+
+        with self.assertRaises(ValueError):
+            self.single_flight.do('design', failing_call)
+
+        self.release.set()
+        self.assertEqual(self.single_flight.do('design', self.slow_call), 'result')
+        self.assertEqual(self.single_flight.stats()['errors'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
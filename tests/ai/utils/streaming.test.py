@@ -0,0 +1,61 @@
+import json
+import unittest
+from flask import Flask, request
+from src.ai.utils.streaming import negotiate_stream_format, encode_stream, stream_mimetype, NDJSON_MIMETYPE, SSE_MIMETYPE
+
+class TestNegotiateStreamFormat(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+
+    def negotiate(self, **kwargs):
+        with self.app.test_request_context('/', method='POST', **kwargs):
+            return negotiate_stream_format(request)
+
+    def test_stream_field_in_body_or_query(self):
+        self.assertEqual(self.negotiate(json={'stream': 'ndjson'}), 'ndjson')
+        self.assertEqual(self.negotiate(json={'stream': 'sse'}), 'sse')
+        self.assertEqual(self.negotiate(query_string={'stream': 'sse'}), 'sse')
+        # Unknown values fall back to the Accept header
+        self.assertIsNone(self.negotiate(json={'stream': 'xml'}))
+        # A non-object body carries no stream field
+        self.assertIsNone(self.negotiate(json=['ndjson']))
+        self.assertEqual(self.negotiate(json=['ndjson'], query_string={'stream': 'sse'}), 'sse')
+
+    def test_accept_header(self):
+        self.assertEqual(self.negotiate(headers={'Accept': NDJSON_MIMETYPE}), 'ndjson')
+        self.assertEqual(self.negotiate(headers={'Accept': SSE_MIMETYPE}), 'sse')
+        self.assertEqual(self.negotiate(headers={'Accept': f"application/json;q=0.5, {SSE_MIMETYPE}"}), 'sse')
+
+    def test_regular_clients_get_json(self):
+        self.assertIsNone(self.negotiate(json={}))
+        self.assertIsNone(self.negotiate(headers={'Accept': '*/*'}))
+        self.assertIsNone(self.negotiate(headers={'Accept': f"application/json, {NDJSON_MIMETYPE}"}))
+
+class TestEncodeStream(unittest.TestCase):
+    def test_ndjson_lines(self):
+        chunks = list(encode_stream([{'index': 0}, {'index': 1}], 'ndjson'))
+
+        self.assertEqual([json.loads(chunk) for chunk in chunks], [{'index': 0}, {'index': 1}])
+        self.assertTrue(all(chunk.endswith('\n') for chunk in chunks))
+        self.assertEqual(stream_mimetype('ndjson'), NDJSON_MIMETYPE)
+
+    def test_sse_events_end_with_an_end_event(self):
+        chunks = list(encode_stream([{'index': 0}], 'sse', event_name='variation'))
+
+        self.assertEqual(chunks, ['event: variation\ndata: {"index": 0}\n\n', 'event: end\ndata: {}\n\n'])
+        self.assertEqual(stream_mimetype('sse'), SSE_MIMETYPE)
+
+    def test_error_is_sent_as_a_final_event(self):
+        def events():
+            yield {'index': 0}
+            raise RuntimeError("generator failed")
+
+        chunks = list(encode_stream(events(), 'sse', event_name='variation', error_message='failed'))
+
+        self.assertEqual(chunks[-1], 'event: error\ndata: {"error": "failed"}\n\n')
+        self.assertEqual(len(chunks), 2)
+        ndjson_chunks = list(encode_stream(events(), 'ndjson', error_message='failed'))
+        self.assertEqual(json.loads(ndjson_chunks[-1]), {'error': 'failed'})
+
+if __name__ == '__main__':
+    unittest.main()